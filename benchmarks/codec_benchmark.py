@@ -0,0 +1,33 @@
+# coding=utf-8
+"""
+Compares the JSON codecs from fortnox.requests.codec that are installed, decoding a large voucher list body and
+encoding a voucher's to_dict() output, both straight from and to bytes.
+
+    python benchmarks/codec_benchmark.py [vouchers_per_page] [iterations]
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from benchmarks.payloads import voucher_json, voucher_list_body
+from fortnox.objects import Voucher
+from fortnox.requests.codec import CODECS
+
+
+def main(count=500, iterations=20):
+    body = voucher_list_body(count)
+    content = Voucher(voucher_json(1, rows=200)).to_dict()
+    print("payload: %s vouchers, %.1f kB" % (count, len(body) / 1024.0))
+    print("%-8s %12s %12s" % ("codec", "decode ms", "encode us"))
+    for name, codec in CODECS.items():
+        if codec is None:
+            continue
+        decode = min(timeit.repeat(lambda: codec.loads(body), number=iterations, repeat=3)) / iterations
+        encode = min(timeit.repeat(lambda: codec.dumps(content), number=iterations * 10, repeat=3)) / (iterations * 10)
+        print("%-8s %12.2f %12.1f" % (name, decode * 1000, encode * 1000000))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,49 @@
+# coding=utf-8
+"""
+Compares date handling when building and serialising 100k vouchers: strptime/strftime as the models used to do,
+the shared parse_date/format_date path, and lazy_dates where dates are only parsed when read.
+
+    python benchmarks/date_benchmark.py [number_of_vouchers]
+"""
+import datetime
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from benchmarks.payloads import voucher_json
+from fortnox.objects import Voucher
+from fortnox.objects.dates import format_date, parse_date
+from fortnox.objects.default_object import DefaultObject
+
+
+def timed(label, function):
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    print("%-34s %8.1f ms" % (label, elapsed * 1000))
+    return elapsed
+
+
+def main(count=100000):
+    items = [voucher_json(number, rows=0) for number in range(count)]
+    dates = [item["TransactionDate"] for item in items]
+
+    timed("strptime", lambda: [datetime.datetime.strptime(date, "%Y-%m-%d") for date in dates])
+    timed("parse_date", lambda: [parse_date(date) for date in dates])
+
+    parsed = [parse_date(date) for date in dates]
+    timed("strftime", lambda: [date.strftime("%Y-%m-%d") for date in parsed])
+    timed("format_date", lambda: [format_date(date) for date in parsed])
+
+    timed("Voucher() eager dates", lambda: [Voucher(item) for item in items])
+    DefaultObject.lazy_dates = True
+    vouchers = []
+    timed("Voucher() lazy dates", lambda: vouchers.extend(Voucher(item) for item in items))
+    timed("to_dict() lazy dates, never read", lambda: [voucher.to_dict() for voucher in vouchers])
+    DefaultObject.lazy_dates = False
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
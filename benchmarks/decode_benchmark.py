@@ -0,0 +1,46 @@
+# coding=utf-8
+"""
+Measures the CPU spent turning a large voucher list body into parsed content. The old path decoded the body once in
+Request (for logging) and again in the caller; Response decodes it once and hands the same content to both.
+
+    python benchmarks/decode_benchmark.py [vouchers_per_page] [iterations]
+"""
+import os
+import sys
+import timeit
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from benchmarks.payloads import voucher_list_body
+from fortnox.requests import Response
+
+
+def old_path(body):
+    response = requests.models.Response()
+    response._content = body
+    response.status_code = 200
+    response.encoding = 'utf-8'
+    response.json()
+    return response.json()
+
+
+def new_path(body):
+    response = Response(200, {}, body)
+    response.json()
+    return response.json()
+
+
+def main(count=500, iterations=20):
+    body = voucher_list_body(count)
+    print("payload: %s vouchers, %.1f kB" % (count, len(body) / 1024.0))
+    before = min(timeit.repeat(lambda: old_path(body), number=iterations, repeat=3)) / iterations
+    after = min(timeit.repeat(lambda: new_path(body), number=iterations, repeat=3)) / iterations
+    print("decode twice:  %8.2f ms/response" % (before * 1000))
+    print("decode once:   %8.2f ms/response" % (after * 1000))
+    print("CPU saved:     %7.0f%%" % (100 * (1 - after / before)))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
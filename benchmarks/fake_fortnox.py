@@ -0,0 +1,217 @@
+# coding=utf-8
+"""
+A local fake of the parts of the Fortnox API this package uses, for benchmarks that go over real HTTP. It serves
+paginated /vouchers, /vouchers/sublist/{series} and /financialyears, /voucherseries, single vouchers, financial
+years and voucher series, and accepts voucher creation. Latency, page size and 429 responses can be configured.
+
+    server = FakeFortnox(vouchers=5000, latency=0.005, throttle_every=50).start()
+    client = Client('token', 'secret', server_url=server.url)
+    ...
+    server.stop()
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.payloads import voucher_json
+
+LAST_MODIFIED = "2016-01-01 00:00"
+
+
+class FakeFortnoxHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def _handle(self, method):
+        fortnox = self.server.fortnox
+        url = urlsplit(self.path)
+        params = dict((key, values[-1]) for key, values in parse_qs(url.query).items())
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+
+        if fortnox.latency:
+            time.sleep(fortnox.latency)
+        if fortnox.throttle():
+            self._send(429, {"message": "Too many requests"}, {"Retry-After": "0"})
+            return
+
+        path = url.path[len(fortnox.prefix):] if url.path.startswith(fortnox.prefix) else url.path
+        segments = [segment for segment in path.split('/') if segment]
+        status, content = fortnox.route(method, segments, params, body)
+        self._send(status, content)
+
+    def _send(self, status, content, headers=None):
+        body = content if isinstance(content, bytes) else json.dumps(content).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeFortnoxServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class FakeFortnox:
+    """
+    Holds the fake company: `years` financial years with `vouchers` vouchers of `rows` rows each, spread over the
+    voucher series. List endpoints return `page_size` items per page unless the request sets limit. With
+    throttle_every=n every n:th request is answered with 429 and Retry-After: 0.
+
+    `requests` and `throttled` count what the server has handled.
+    """
+    prefix = "/3"
+
+    def __init__(self, vouchers=1000, years=1, rows=10, series=('A', 'B'), page_size=100, latency=0.0,
+                 throttle_every=0, host="127.0.0.1", port=0):
+        self.page_size = page_size
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.requests = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+
+        self.financial_years = [{
+            "@url": "https://api.fortnox.se/3/financialyears/%s" % year,
+            "Id": year,
+            "FromDate": "%s-01-01" % (2015 + year),
+            "ToDate": "%s-12-31" % (2015 + year),
+            "AccountChartType": "Bas 2016",
+            "AccountingMethod": "ACCRUAL"
+        } for year in range(1, years + 1)]
+        self.voucher_series = [{
+            "@url": "https://api.fortnox.se/3/voucherseries/%s" % code,
+            "Code": code,
+            "Description": "Series %s" % code,
+            "Manual": False,
+            "NextVoucherNumber": vouchers // len(series) + 2,
+            "Year": 1
+        } for code in series]
+
+        # Vouchers by (year, series, number), with their encoded JSON and modification time. Lists are served from
+        # the encoded vouchers so that the server spends as little time as possible per page.
+        self.vouchers = {}
+        self.encoded = {}
+        self.modified = {}
+        self._sorted = None
+        for year in range(1, years + 1):
+            for index in range(vouchers):
+                code = series[index % len(series)]
+                self._store(voucher_json(index // len(series) + 1, rows, series=code, year=year), LAST_MODIFIED)
+
+        self.server = FakeFortnoxServer((host, port), FakeFortnoxHandler)
+        self.server.fortnox = self
+        self._thread = None
+
+    @property
+    def url(self):
+        return "http://%s:%s%s" % (self.server.server_address[:2] + (self.prefix,))
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def throttle(self):
+        with self._lock:
+            self.requests += 1
+            if self.throttle_every and self.requests % self.throttle_every == 0:
+                self.throttled += 1
+                return True
+        return False
+
+    def _store(self, voucher, modified):
+        key = (voucher["Year"], voucher["VoucherSeries"], voucher["VoucherNumber"])
+        self.vouchers[key] = voucher
+        self.encoded[key] = json.dumps(voucher).encode('utf-8')
+        self.modified[key] = modified
+        self._sorted = None
+
+    def _page(self, key, items, params):
+        limit = int(params.get('limit') or self.page_size)
+        page = int(params.get('page') or 1)
+        meta = {"@TotalResources": len(items), "@TotalPages": max(1, (len(items) + limit - 1) // limit),
+                "@CurrentPage": page}
+        items = items[(page - 1) * limit:page * limit]
+        if items and isinstance(items[0], bytes):
+            return 200, b'{"MetaInformation": %s, "%s": [%s]}' % (json.dumps(meta).encode('utf-8'),
+                                                                  key.encode('utf-8'), b", ".join(items))
+        return 200, {"MetaInformation": meta, key: items}
+
+    def _vouchers(self, params, series=None):
+        year = int(params.get('financialyear') or 1)
+        last_modified = params.get('lastmodified')
+        with self._lock:
+            if self._sorted is None:
+                self._sorted = sorted(self.vouchers)
+            return [self.encoded[key] for key in self._sorted
+                    if key[0] == year and (series is None or key[1] == series) and
+                    (last_modified is None or self.modified[key] >= last_modified)]
+
+    def _create(self, content, params):
+        year = int(params.get('financialyear') or 1)
+        code = content.get("VoucherSeries") or "A"
+        with self._lock:
+            number = max([key[2] for key in self.vouchers if key[:2] == (year, code)] or [0]) + 1
+            voucher = dict(content, VoucherNumber=number, VoucherSeries=code, Year=year,
+                           **{"@url": "https://api.fortnox.se/3/vouchers/%s/%s?financialyear=%s" % (code, number,
+                                                                                                     year)})
+            self._store(voucher, time.strftime("%Y-%m-%d %H:%M"))
+        return 201, {"Voucher": voucher}
+
+    def route(self, method, segments, params, body):
+        resource = segments[0] if segments else None
+        if method == 'POST':
+            if segments == ['vouchers']:
+                return self._create(body["Voucher"], params)
+            return 404, {"message": "Not found"}
+
+        if resource == 'financialyears':
+            if len(segments) == 1:
+                return self._page("FinancialYears", self.financial_years, params)
+            for financial_year in self.financial_years:
+                if str(financial_year["Id"]) == segments[1]:
+                    return 200, {"FinancialYear": financial_year}
+        elif resource == 'voucherseries':
+            if len(segments) == 1:
+                return 200, {"VoucherSeriesCollection": self.voucher_series}
+            for voucher_series in self.voucher_series:
+                if voucher_series["Code"] == segments[1]:
+                    return 200, {"VoucherSeries": voucher_series}
+        elif resource == 'vouchers':
+            if len(segments) == 1:
+                return self._page("Vouchers", self._vouchers(params), params)
+            if len(segments) == 3 and segments[1] == 'sublist':
+                return self._page("Vouchers", self._vouchers(params, segments[2]), params)
+            if len(segments) == 3 and segments[2].isdigit():
+                key = (int(params.get('financialyear') or 1), segments[1], int(segments[2]))
+                if key in self.vouchers:
+                    return 200, {"Voucher": self.vouchers[key]}
+        return 404, {"message": "Not found"}
@@ -0,0 +1,60 @@
+# coding=utf-8
+"""
+Measures a list-and-filter pass over parsed voucher list pages that only reads voucher_number, voucher_series and
+transaction_date, comparing rows built eagerly in Voucher() (how the model worked before) with rows left unparsed
+until voucher_rows is read. Reports CPU time and the memory allocated by the pass.
+
+    python benchmarks/hydration_benchmark.py [number_of_vouchers] [rows_per_voucher]
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from benchmarks.payloads import voucher_json
+from fortnox.objects import Voucher
+
+
+class EagerVoucher(Voucher):
+    __slots__ = ()
+
+    def __init__(self, json_data = {}):
+        Voucher.__init__(self, json_data)
+        self.voucher_rows
+
+
+def list_and_filter(voucher_class, items):
+    return [voucher.voucher_number for voucher in (voucher_class(item) for item in items)
+            if voucher.voucher_series == "A" and voucher.transaction_date.month == 1]
+
+
+def run(label, voucher_class, items):
+    gc.collect()
+    start = time.process_time()
+    list_and_filter(voucher_class, items)
+    elapsed = time.process_time() - start
+
+    gc.collect()
+    tracemalloc.start()
+    kept = [voucher_class(item) for item in items]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+
+    print("%-14s %8.1f ms %8.1f bytes/voucher" % (label, elapsed * 1000, float(size) / len(items)))
+    return elapsed, size
+
+
+def main(count=100000, rows=10):
+    items = [voucher_json(number, rows) for number in range(1, count + 1)]
+    before = run("eager rows", EagerVoucher, items)
+    after = run("lazy rows", Voucher, items)
+    print("cpu:    %.0f%% of eager" % (100 * after[0] / before[0]))
+    print("memory: %.0f%% of eager" % (100 * float(after[1]) / before[1]))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,52 @@
+# coding=utf-8
+"""
+Measures the memory held per VoucherRow for a synthetic dataset, comparing the slotted model with an equivalent
+class that keeps a per-instance __dict__ (how the models were defined before).
+
+    python benchmarks/memory_benchmark.py [number_of_rows]
+"""
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from benchmarks.payloads import voucher_json
+from fortnox.objects import VoucherRow
+
+
+class DictVoucherRow():
+    def __init__(self, json_data = {}):
+        self.account = json_data.get("Account", 0)
+        self.cost_center = json_data.get("CostCenter", "")
+        self.credit = json_data.get("Credit", 0)
+        self.description = json_data.get("Description", "")
+        self.debit = json_data.get("Debit", 0)
+        self.project = json_data.get("Project", "")
+        self.removed = json_data.get("Removed")
+        self.transaction_information = json_data.get("TransactionInformation")
+
+
+def bytes_per_row(row_class, rows):
+    gc.collect()
+    tracemalloc.start()
+    objects = [row_class(row) for row in rows]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return float(size) / len(rows)
+
+
+def main(count=1000000):
+    rows = voucher_json(1, rows=count)["VoucherRows"]
+    before = bytes_per_row(DictVoucherRow, rows)
+    after = bytes_per_row(VoucherRow, rows)
+    print("rows:               %s" % count)
+    print("__dict__ VoucherRow: %6.1f bytes/row" % before)
+    print("slotted VoucherRow:  %6.1f bytes/row" % after)
+    print("saved:               %5.0f%%" % (100 * (1 - after / before)))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,48 @@
+# coding=utf-8
+"""
+Synthetic Fortnox payloads shared by the benchmarks.
+"""
+import json
+
+
+def voucher_json(number, rows=10, series="A", year=1):
+    return {
+        "@url": "https://api.fortnox.se/3/vouchers/%s/%s?financialyear=%s" % (series, number, year),
+        "Comments": "",
+        "CostCenter": "",
+        "Description": "Voucher %s" % number,
+        "Project": "",
+        "ReferenceNumber": "%s" % (10000 + number),
+        "ReferenceType": "INVOICE",
+        "TransactionDate": "2016-%02d-%02d" % (number % 12 + 1, number % 28 + 1),
+        "VoucherNumber": number,
+        "VoucherRows": [
+            {
+                "Account": 1930 + row,
+                "CostCenter": "",
+                "Credit": 0 if row % 2 else 125.5,
+                "Description": "Row %s" % row,
+                "Debit": 125.5 if row % 2 else 0,
+                "Project": "",
+                "Removed": False,
+                "TransactionInformation": ""
+            } for row in range(rows)
+        ],
+        "VoucherSeries": series,
+        "Year": year
+    }
+
+
+def voucher_list(count, rows=10, page=1, total_pages=1, start=1):
+    return {
+        "MetaInformation": {
+            "@TotalResources": count * total_pages,
+            "@TotalPages": total_pages,
+            "@CurrentPage": page
+        },
+        "Vouchers": [voucher_json(number, rows) for number in range(start, start + count)]
+    }
+
+
+def voucher_list_body(count, rows=10):
+    return json.dumps(voucher_list(count, rows)).encode('utf-8')
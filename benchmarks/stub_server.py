@@ -0,0 +1,47 @@
+# coding=utf-8
+"""
+A minimal local stand-in for the Fortnox API, used by the benchmarks. It answers every GET with a small JSON body and
+speaks HTTP/1.1 so that clients can keep connections alive.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    body = json.dumps({"FinancialYear": {"Id": 1, "FromDate": "2016-01-01", "ToDate": "2016-12-31"}}).encode('utf-8')
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, handler=StubHandler):
+        HTTPServer.__init__(self, (host, port), handler)
+        self._thread = None
+
+    @property
+    def url(self):
+        return "http://%s:%s" % self.server_address[:2]
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,272 @@
+# coding=utf-8
+"""
+Benchmark suite running list, get, create, memory and sync scenarios against a local FakeFortnox server. Results are
+written as JSON together with the settings and environment they were measured with, and can be compared with the
+results of an earlier run to spot regressions.
+
+    python benchmarks/suite.py --vouchers 5000 --latency 0.002 --output results.json
+    python benchmarks/suite.py --compare baseline.json
+"""
+import argparse
+import datetime
+import gc
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from benchmarks.fake_fortnox import FakeFortnox
+from fortnox import Client
+from fortnox.export import export_vouchers
+from fortnox.requests import Profiler
+from fortnox.sync import VoucherSync
+
+SCENARIOS = []
+
+
+def scenario(function):
+    SCENARIOS.append(function)
+    return function
+
+
+def client_for(server):
+    client = Client('access-token', 'client-secret', server_url=server.url)
+    client.request.configure_rate_limit(enabled=False)
+    client.request.configure_single_flight(enabled=False)
+    client.request.configure_profiler(Profiler())
+    return client
+
+
+def measure(server, client, function):
+    requests, throttled = server.requests, server.throttled
+    started = time.perf_counter()
+    result = function()
+    seconds = time.perf_counter() - started
+    profile = client.request.profiler.stats()
+    return result, {
+        'seconds': seconds,
+        'requests': server.requests - requests,
+        'throttled': server.throttled - throttled,
+        'overhead_per_call': profile['overhead_per_call']
+    }
+
+
+@scenario
+def list_vouchers(server, options):
+    client = client_for(server)
+    vouchers, result = measure(server, client, lambda: client.Voucher.list(financial_year=1))
+    result['objects'] = len(vouchers)
+    result['objects_per_second'] = len(vouchers) / result['seconds']
+    return result
+
+
+@scenario
+def iter_vouchers(server, options):
+    client = client_for(server)
+    count, result = measure(server, client, lambda: sum(1 for _ in client.Voucher.iter(financial_year=1)))
+    result['objects'] = count
+    result['objects_per_second'] = count / result['seconds']
+    return result
+
+
+@scenario
+def filter_vouchers(server, options):
+    client = client_for(server)
+    numbers, result = measure(server, client, lambda: [
+        voucher.voucher_number for voucher in client.Voucher.iter(financial_year=1)
+        if voucher.voucher_series == "A" and voucher.transaction_date.month == 1])
+    result['objects'] = options.vouchers
+    result['objects_per_second'] = options.vouchers / result['seconds']
+    return result
+
+
+@scenario
+def get_financial_year(server, options):
+    client = client_for(server)
+    _, result = measure(server, client, lambda: [client.FinancialYear.get(1) for _ in range(options.gets)])
+    result['calls_per_second'] = options.gets / result['seconds']
+    return result
+
+
+@scenario
+def get_voucher(server, options):
+    client = client_for(server)
+    numbers = [number % (options.vouchers // 2) + 1 for number in range(options.gets)]
+    urls = ["/vouchers/A/%s?financialyear=1" % number for number in numbers]
+    _, result = measure(server, client, lambda: [client.Voucher.get(url) for url in urls])
+    result['calls_per_second'] = options.gets / result['seconds']
+    return result
+
+
+@scenario
+def create_vouchers(server, options):
+    client = client_for(server)
+    voucher = client.Voucher.list(params={'limit': 1, 'page': 1}, financial_year=1)[0]
+    vouchers = [client.Voucher(voucher.to_dict()["Voucher"]) for _ in range(options.creates)]
+    results, result = measure(server, client, lambda: list(client.Voucher.bulk_create(
+        vouchers, concurrency=options.concurrency)))
+    result['failed'] = len([bulk_result for bulk_result in results if not bulk_result.ok])
+    result['calls_per_second'] = options.creates / result['seconds']
+    return result
+
+
+@scenario
+def memory_per_voucher(server, options):
+    client = client_for(server)
+    gc.collect()
+    tracemalloc.start()
+    vouchers = client.Voucher.list(financial_year=1)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return {
+        'objects': len(vouchers),
+        'rows': sum(len(voucher.voucher_rows) for voucher in vouchers),
+        'bytes_per_object': float(size) / len(vouchers)
+    }
+
+
+@scenario
+def sync_vouchers(server, options):
+    client = client_for(server)
+    directory = tempfile.mkdtemp()
+    cursor = os.path.join(directory, 'cursor.json')
+    try:
+        full, result = measure(server, client, lambda: VoucherSync(cursor, 1, voucher_class=client.Voucher).run())
+        incremental, incremental_result = measure(
+            server, client, lambda: VoucherSync(cursor, 1, voucher_class=client.Voucher).run())
+    finally:
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+    result['objects'] = len(full)
+    result['incremental_seconds'] = incremental_result['seconds']
+    result['incremental_objects'] = len(incremental)
+    return result
+
+
+@scenario
+def list_all_years(server, options):
+    client = client_for(server)
+    vouchers, result = measure(server, client, lambda: [
+        voucher for financial_year in client.FinancialYear.list()
+        for voucher in client.Voucher.list(financial_year=financial_year.id)])
+    result['objects'] = len(vouchers)
+    result['objects_per_second'] = len(vouchers) / result['seconds']
+    return result
+
+
+@scenario
+def export_all_years(server, options):
+    directory = tempfile.mkdtemp()
+    requests = server.requests
+    started = time.perf_counter()
+    try:
+        results = export_vouchers(directory, access_token='access-token', client_secret='client-secret',
+                                  server_url=server.url, processes=options.processes, rate=1000000.0,
+                                  burst=1000000)
+    finally:
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+    seconds = time.perf_counter() - started
+    count = sum(result.count for result in results)
+    return {
+        'seconds': seconds,
+        'requests': server.requests - requests,
+        'partitions': len(results),
+        'failed': len([result for result in results if not result.ok]),
+        'objects': count,
+        'objects_per_second': count / seconds
+    }
+
+
+def environment():
+    try:
+        revision = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL,
+                                           cwd=os.path.dirname(os.path.abspath(__file__))).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {
+        'revision': revision,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'timestamp': datetime.datetime.now().isoformat()
+    }
+
+
+def compare(results, baseline):
+    """
+    Prints the change of every timing, throughput and memory figure against a baseline run. Positive means better.
+    """
+    print("%-22s %-22s %12s %12s %8s" % ("scenario", "metric", "baseline", "current", "change"))
+    for name, result in sorted(results['results'].items()):
+        before = baseline['results'].get(name, {})
+        for metric, value in sorted(result.items()):
+            if metric not in before or not before[metric]:
+                continue
+            if metric.endswith('_per_second'):
+                change = value / before[metric] - 1
+            elif metric.endswith('seconds') or metric in ('bytes_per_object', 'overhead_per_call'):
+                change = before[metric] / value - 1 if value else 0.0
+            else:
+                continue
+            print("%-22s %-22s %12.4g %12.4g %+7.1f%%" % (name, metric, before[metric], value, change * 100))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--vouchers', type=int, default=2000, help="vouchers per fake financial year")
+    parser.add_argument('--years', type=int, default=1, help="financial years of the fake company")
+    parser.add_argument('--rows', type=int, default=10, help="rows per voucher")
+    parser.add_argument('--page-size', type=int, default=100, help="items per page of list endpoints")
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds the server waits before answering")
+    parser.add_argument('--throttle-every', type=int, default=0, help="answer every n:th request with 429")
+    parser.add_argument('--gets', type=int, default=500, help="calls made by the get scenarios")
+    parser.add_argument('--creates', type=int, default=200, help="vouchers created by the create scenario")
+    parser.add_argument('--concurrency', type=int, default=4, help="workers used by the create scenario")
+    parser.add_argument('--processes', type=int, help="worker processes of the export scenario")
+    parser.add_argument('--scenario', action='append', help="run only the named scenario, may be repeated")
+    parser.add_argument('--output', help="file to write the results to, defaults to stdout")
+    parser.add_argument('--compare', help="results of an earlier run to compare with")
+    options = parser.parse_args(argv)
+    # Retries of injected 429s are expected, keep them out of the output.
+    logging.getLogger('fortnox').setLevel(logging.ERROR)
+
+    results = {
+        'environment': environment(),
+        'settings': dict((key, value) for key, value in vars(options).items() if key not in ('output', 'compare')),
+        'results': {}
+    }
+    for function in SCENARIOS:
+        if options.scenario and function.__name__ not in options.scenario:
+            continue
+        # A fresh server per scenario, so creates and throttling counters do not leak between scenarios.
+        with FakeFortnox(vouchers=options.vouchers, years=options.years, rows=options.rows, page_size=options.page_size,
+                         latency=options.latency, throttle_every=options.throttle_every) as server:
+            results['results'][function.__name__] = function(server, options)
+        print("%-22s done" % function.__name__, file=sys.stderr)
+
+    if options.output:
+        with open(options.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    else:
+        json.dump(results, sys.stdout, indent=2, sort_keys=True)
+        print()
+
+    if options.compare:
+        with open(options.compare) as f:
+            compare(results, json.load(f))
+    return results
+
+
+if __name__ == '__main__':
+    main()
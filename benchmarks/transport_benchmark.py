@@ -0,0 +1,43 @@
+# coding=utf-8
+"""
+Compares requests per second against a local stub server when every call opens a new connection (the module level
+requests.get used before) and when calls go through the pooled keep-alive Transport.
+
+    python benchmarks/transport_benchmark.py [number_of_requests]
+"""
+import os
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from benchmarks.stub_server import StubServer
+from fortnox.requests import Transport
+
+
+def run(label, get, url, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        get(url).json()
+    elapsed = time.perf_counter() - start
+    print("%-22s %8.0f requests/s" % (label, count / elapsed))
+    return count / elapsed
+
+
+def main(count=2000):
+    server = StubServer().start()
+    url = "%s/financialyears/1" % server.url
+    try:
+        before = run("requests.get", requests.get, url, count)
+        transport = Transport()
+        after = run("Transport (pooled)", lambda u: transport.request('GET', u), url, count)
+        transport.close()
+        print("speedup: %.2fx" % (after / before))
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -1 +1,2 @@
 from .config import fortnox_config
+from .client import Client
@@ -0,0 +1,153 @@
+# coding=utf-8
+import collections
+import functools
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+from urllib.parse import urlencode
+
+# Time to live for resources that never change once created, such as booked vouchers.
+FOREVER = float('inf')
+
+
+def cache_key(url, params=None):
+    if not params:
+        return url
+    return "%s?%s" % (url, urlencode(sorted(params.items())))
+
+
+@functools.lru_cache(maxsize=256)
+def token_digest(access_token):
+    """
+    Stands in for an access token wherever one is needed as a key, so the token itself never ends up in a cache,
+    metrics or another process.
+    """
+    return hashlib.sha256((access_token or '').encode('utf-8')).hexdigest()[:32]
+
+
+def scoped_cache_key(access_token, url, params=None):
+    """
+    Cache key of url and params for one company. url should be absolute so the server is part of the key as well.
+    The access token is hashed, so the token itself is never written to a cache shared with other processes.
+    """
+    return "%s %s" % (token_digest(access_token), cache_key(url, params))
+
+
+def _under(prefix):
+    # Keys belonging to a resource url: the url itself, its query variants and its sub resources.
+    return prefix + "/", prefix + "?"
+
+
+class MemoryCache:
+    """
+    In-process LRU cache holding decoded response content. Entries expire `ttl` seconds after they were set and the
+    least recently used entry is evicted once `maxsize` entries are stored.
+    """
+    # Whether calls may block on I/O. AsyncRequest runs the calls of blocking caches in an executor so they never
+    # stall the event loop; caches without the attribute are treated as blocking.
+    blocking = False
+
+    def __init__(self, maxsize=1024, clock=time.monotonic):
+        self.maxsize = maxsize
+        self._clock = clock
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=FOREVER):
+        with self._lock:
+            self._entries[key] = (value, self._clock() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate(self, prefix):
+        children = _under(prefix)
+        with self._lock:
+            for key in [key for key in self._entries if key == prefix or key.startswith(children)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SqliteCache:
+    """
+    On-disk cache with the same interface as MemoryCache, stored in a sqlite database so cached content survives
+    restarts and can be shared by processes on the same host.
+    """
+    blocking = True
+
+    def __init__(self, path, maxsize=100000, clock=time.time):
+        self.path = path
+        self.maxsize = maxsize
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, expires REAL, accessed REAL)")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)")
+
+    def get(self, key):
+        now = self._clock()
+        with self._lock:
+            row = self._connection.execute("SELECT value, expires FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] is not None and row[1] <= now:
+                self._connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+                return None
+            self._connection.execute("UPDATE cache SET accessed = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def set(self, key, value, ttl=FOREVER):
+        now = self._clock()
+        expires = None if ttl == FOREVER else now + ttl
+        with self._lock:
+            self._connection.execute("INSERT OR REPLACE INTO cache (key, value, expires, accessed) VALUES (?, ?, ?, ?)",
+                                     (key, json.dumps(value), expires, now))
+            self._connection.execute("DELETE FROM cache WHERE key IN "
+                                     "(SELECT key FROM cache ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                                     (self.maxsize,))
+
+    def delete(self, key):
+        with self._lock:
+            self._connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def invalidate(self, prefix):
+        with self._lock:
+            self._connection.execute("DELETE FROM cache WHERE key = ? OR substr(key, 1, ?) IN (?, ?)",
+                                     (prefix, len(prefix) + 1) + _under(prefix))
+
+    def clear(self):
+        with self._lock:
+            self._connection.execute("DELETE FROM cache")
+
+    def close(self):
+        self._connection.close()
+
+    def __len__(self):
+        return self._connection.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
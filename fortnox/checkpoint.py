@@ -0,0 +1,130 @@
+# coding=utf-8
+import json
+import os
+import threading
+
+from fortnox.files import atomic_write_json
+
+
+class Checkpoint:
+    """
+    Progress of a long running job persisted as JSON at `path`, so that an interrupted job can be resumed where it
+    stopped. Values are grouped per job key, e.g. "export vouchers".
+
+    Two kinds of progress are kept besides plain values:
+
+    - paged reads record the last page that was completely handled, see Pager.iter_pages(checkpoint=...).
+    - bulk writes record the idempotency keys of the items that were committed, see bulk_create(checkpoint=...).
+      Commits are appended to a journal at "<path>.log" instead of rewriting the checkpoint every time, and folded
+      into it on the next save.
+
+    A Checkpoint may be shared by threads.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.journal = "%s.log" % path
+        self.state = {}
+        self._committed = {}
+        self._journal = None
+        self._lock = threading.RLock()
+        if os.path.exists(path):
+            with open(path) as f:
+                self.state = json.load(f)
+        for key, value in self.state.items():
+            if isinstance(value, dict) and 'committed' in value:
+                self._committed[key] = set(value['committed'])
+        if os.path.exists(self.journal):
+            self._replay_journal()
+
+    def _replay_journal(self):
+        with open(self.journal, 'rb+') as f:
+            complete = 0
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                key, idempotency_key = json.loads(line)
+                self._committed.setdefault(key, set()).add(idempotency_key)
+                complete += len(line)
+            # A last line without a newline was cut short when the process died while writing it, and that commit
+            # is lost. It is cut off, so that the next commit does not get appended to it.
+            f.truncate(complete)
+
+    def get(self, key, default=None):
+        return self.state.get(key, default)
+
+    def set(self, key, value):
+        with self._lock:
+            self.state[key] = value
+
+    def last_page(self, key):
+        """
+        The last page of the paged read `key` that was completely handled, or None. None is also returned once every
+        page has been handled, so a finished read starts over.
+        """
+        progress = self.state.get(key) or {}
+        if not progress.get('page') or progress['page'] >= progress.get('pages', 0):
+            return None
+        return progress['page']
+
+    def complete_page(self, key, page, pages):
+        """
+        Records that page `page` of `pages` of the paged read `key` has been handled and saves the checkpoint.
+        """
+        with self._lock:
+            self.state[key] = {'page': page, 'pages': pages}
+            self.save()
+
+    def is_committed(self, key, idempotency_key):
+        return idempotency_key in self._committed.get(key, ())
+
+    def commit(self, key, idempotency_key):
+        """
+        Records that the item with idempotency_key was written by the bulk write `key`. The commit is on disk when
+        this returns.
+        """
+        with self._lock:
+            self._committed.setdefault(key, set()).add(idempotency_key)
+            if self._journal is None:
+                self._journal = open(self.journal, 'a')
+            self._journal.write(json.dumps([key, idempotency_key]) + "\n")
+            self._journal.flush()
+
+    def committed(self, key):
+        return frozenset(self._committed.get(key, ()))
+
+    def save(self):
+        with self._lock:
+            state = dict(self.state)
+            for key, committed in self._committed.items():
+                state[key] = {'committed': sorted(committed)}
+            atomic_write_json(self.path, state)
+            self._close_journal()
+            if os.path.exists(self.journal):
+                os.remove(self.journal)
+
+    def discard(self, key):
+        """
+        Forgets the progress of job `key`, e.g. once it has finished, and saves the checkpoint.
+        """
+        with self._lock:
+            self.state.pop(key, None)
+            self._committed.pop(key, None)
+            self.save()
+
+    def clear(self):
+        with self._lock:
+            self.state = {}
+            self._committed = {}
+            self._close_journal()
+            for path in (self.path, self.journal):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def close(self):
+        with self._lock:
+            self._close_journal()
+
+    def _close_journal(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
@@ -0,0 +1,280 @@
+# coding=utf-8
+"""
+The fortnox command line tool, for bulk jobs against the Fortnox API:
+
+    fortnox export vouchers --financial-year 3 --format csv --output vouchers.csv --checkpoint export.json
+    fortnox export financial-years
+    fortnox import vouchers --input vouchers.ndjson --concurrency 4 --checkpoint import.json
+
+Credentials are taken from --access-token/--client-secret or the FORTNOX_ACCESS_TOKEN and FORTNOX_CLIENT_SECRET
+environment variables. Output goes to stdout unless --output is given, input is read from stdin unless --input is
+given. Items are streamed, so memory use does not grow with the size of the job.
+"""
+import argparse
+import collections
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+
+from fortnox.checkpoint import Checkpoint
+from fortnox.client import Client
+from fortnox.formats import (FINANCIAL_YEAR_COLUMNS, FORMATS, VOUCHER_COLUMNS, CsvWriter, NdjsonWriter, read_csv,
+                             read_ndjson, voucher_lines, vouchers_from_lines)
+from fortnox.requests import Pager, Request
+
+logger = logging.getLogger(__name__)
+
+
+class Summary:
+    """
+    Counts what a command did and reports it, with the throughput, on stderr when it ends.
+    """
+    def __init__(self, action, unit):
+        self.action = action
+        self.unit = unit
+        self.count = 0
+        self.failed = 0
+        self.skipped = 0
+        self.skipped_years = 0
+        self.pages = 0
+        self.started = time.perf_counter()
+
+    def report(self, stream=None):
+        seconds = time.perf_counter() - self.started
+        parts = ["%s %s %s" % (self.action, self.count, self.unit)]
+        if self.pages:
+            parts.append("%s pages" % self.pages)
+        if self.failed:
+            parts.append("%s failed" % self.failed)
+        if self.skipped:
+            parts.append("%s skipped from checkpoint" % self.skipped)
+        if self.skipped_years:
+            parts.append("%s financial years skipped from checkpoint" % self.skipped_years)
+        print("%s in %.1fs, %.1f %s/s" % (", ".join(parts), seconds, self.count / seconds if seconds else 0.0,
+                                          self.unit), file=stream or sys.stderr)
+
+
+def positive_int(value):
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError("expected a whole number of at least 1, got %r" % value)
+    return number
+
+
+def _open_output(path, offset=None):
+    if path in (None, '-'):
+        return sys.stdout.buffer
+    if offset is None or not os.path.exists(path):
+        return open(path, 'wb')
+    # Resuming: drop anything written after the last checkpoint, it is written again.
+    f = open(path, 'r+b')
+    f.truncate(offset)
+    f.seek(offset)
+    return f
+
+
+def _open_input(path, text):
+    if path in (None, '-'):
+        return sys.stdin if text else sys.stdin.buffer
+    return open(path, 'r', encoding='utf-8', newline='') if text else open(path, 'rb')
+
+
+def _close(f):
+    if f is sys.stdout.buffer:
+        f.flush()
+    elif f not in (sys.stdin, sys.stdin.buffer):
+        f.close()
+
+
+def _writer(f, options, client, columns, lines):
+    if options.format == 'csv':
+        return CsvWriter(f, columns, lines)
+    return NdjsonWriter(f, client.request.codec.dumps)
+
+
+def export_vouchers(client, options, summary):
+    """
+    Streams the vouchers of the chosen financial years, all of them by default, page by page to the output. With
+    a checkpoint the last page written per financial year is recorded, and a later run continues after it.
+    """
+    checkpoint = Checkpoint(options.checkpoint) if options.checkpoint else None
+    if checkpoint is not None and options.output in (None, '-'):
+        raise SystemExit("fortnox: --checkpoint needs --output, a stream cannot be resumed")
+    state = checkpoint.get('export vouchers', {}) if checkpoint is not None else {}
+    pages = state.setdefault('pages', {})
+
+    financial_years = options.financial_year or [financial_year.id for financial_year in
+                                                 client.FinancialYear.list()]
+    f = _open_output(options.output, state.get('offset'))
+    writer = _writer(f, options, client, VOUCHER_COLUMNS, voucher_lines)
+    try:
+        for financial_year in financial_years:
+            done = pages.get(str(financial_year))
+            if done == 'complete':
+                summary.skipped_years += 1
+                continue
+            pager = client.Voucher.pager(financial_year=financial_year, voucher_series=options.series)
+            for page in pager.iter_pages(prefetch=options.concurrency, start=done + 1 if done else None):
+                for item in page.get('Vouchers') or []:
+                    writer.write(item)
+                    summary.count += 1
+                summary.pages += 1
+                if checkpoint is not None:
+                    f.flush()
+                    pages[str(financial_year)] = int((page.get('MetaInformation') or {}).get('@CurrentPage', 1))
+                    state['offset'] = f.tell()
+                    checkpoint.set('export vouchers', state)
+                    checkpoint.save()
+            if checkpoint is not None:
+                pages[str(financial_year)] = 'complete'
+                checkpoint.set('export vouchers', state)
+                checkpoint.save()
+    finally:
+        _close(f)
+    if checkpoint is not None:
+        checkpoint.clear()
+
+
+def export_financial_years(client, options, summary):
+    f = _open_output(options.output)
+    writer = _writer(f, options, client, FINANCIAL_YEAR_COLUMNS,
+                     lambda item: [tuple(item.get(column) for column in FINANCIAL_YEAR_COLUMNS)])
+    try:
+        pager = Pager(client.FinancialYear.absolute_item_url, 'FinancialYears', request=client.request)
+        for page in pager.iter_pages():
+            for item in page.get('FinancialYears') or []:
+                writer.write(item)
+                summary.count += 1
+            summary.pages += 1
+    finally:
+        _close(f)
+
+
+def content_keys():
+    """
+    Returns an idempotency key function for vouchers read from a file: a digest of the voucher's content, numbered
+    by occurrence so identical vouchers in the input each get their own key. The keys only depend on the input, so
+    a rerun over the same file recognises the vouchers created by an earlier run.
+    """
+    occurrences = collections.Counter()
+
+    def key(voucher):
+        digest = hashlib.sha1(json.dumps(voucher.to_dict(), sort_keys=True).encode('utf-8')).hexdigest()
+        occurrences[digest] += 1
+        return "%s-%s" % (digest, occurrences[digest])
+    return key
+
+
+def import_vouchers(client, options, summary):
+    """
+    Creates the vouchers read from the input with bounded concurrency. Vouchers that fail are written to --rejects
+    with the error, so they can be corrected and imported again. With a checkpoint every created voucher is
+    recorded, and a later run over the same input only posts the vouchers that were not created yet. The checkpoint
+    is removed once every voucher has been created.
+    """
+    checkpoint = Checkpoint(options.checkpoint) if options.checkpoint else None
+    f = _open_input(options.input, options.format == 'csv')
+    rejects = open(options.rejects, 'ab') if options.rejects else None
+    try:
+        items = vouchers_from_lines(read_csv(f)) if options.format == 'csv' else read_ndjson(f)
+        vouchers = (client.Voucher(item) for item in items)
+        for result in client.Voucher.bulk_create(vouchers, concurrency=options.concurrency, checkpoint=checkpoint,
+                                                 idempotency_key=content_keys()):
+            if result.skipped:
+                summary.skipped += 1
+            elif result.ok:
+                summary.count += 1
+            else:
+                summary.failed += 1
+                if rejects is not None:
+                    reject = dict(result.item.to_dict()['Voucher'], Error=str(result.error))
+                    rejects.write(json.dumps(reject).encode('utf-8') + b"\n")
+                    rejects.flush()
+    finally:
+        _close(f)
+        if rejects is not None:
+            rejects.close()
+        if checkpoint is not None:
+            checkpoint.close()
+    if checkpoint is not None:
+        if summary.failed:
+            checkpoint.save()
+        else:
+            checkpoint.clear()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='fortnox', description="Bulk export and import for the Fortnox API.")
+    parser.add_argument('--access-token', default=os.environ.get('FORTNOX_ACCESS_TOKEN'))
+    parser.add_argument('--client-secret', default=os.environ.get('FORTNOX_CLIENT_SECRET'))
+    parser.add_argument('--server-url', default=Request.server_url)
+    parser.add_argument('--rate', type=float, default=5.0, help="requests per second, default %(default)s")
+    parser.add_argument('--burst', type=int, default=25, help="requests allowed in a burst, default %(default)s")
+    parser.add_argument('-v', '--verbose', action='count', default=0, help="log more, may be repeated")
+    commands = parser.add_subparsers(dest='command', metavar='command')
+    commands.required = True
+
+    export = commands.add_parser('export', help="write objects to NDJSON or CSV")
+    exports = export.add_subparsers(dest='resource', metavar='resource')
+    exports.required = True
+
+    vouchers = exports.add_parser('vouchers', help="export vouchers, one CSV line per voucher row")
+    vouchers.add_argument('--financial-year', type=int, action='append',
+                          help="financial year id, may be repeated; all financial years by default")
+    vouchers.add_argument('--series', help="only export this voucher series")
+    vouchers.add_argument('--concurrency', type=positive_int, default=2,
+                          help="pages fetched ahead, default %(default)s")
+    vouchers.add_argument('--checkpoint', help="file recording progress, to resume an interrupted export")
+    vouchers.set_defaults(handler=export_vouchers, action='exported', unit='vouchers')
+
+    financial_years = exports.add_parser('financial-years', help="export financial years")
+    financial_years.set_defaults(handler=export_financial_years, action='exported', unit='financial years')
+
+    for subparser in (vouchers, financial_years):
+        subparser.add_argument('--format', choices=FORMATS, default='ndjson')
+        subparser.add_argument('--output', help="file to write to, stdout by default")
+
+    import_ = commands.add_parser('import', help="create objects from NDJSON or CSV")
+    imports = import_.add_subparsers(dest='resource', metavar='resource')
+    imports.required = True
+
+    vouchers = imports.add_parser('vouchers', help="create vouchers")
+    vouchers.add_argument('--format', choices=FORMATS, default='ndjson')
+    vouchers.add_argument('--input', help="file to read from, stdin by default")
+    vouchers.add_argument('--concurrency', type=positive_int, default=4,
+                          help="vouchers created at once, default %(default)s")
+    vouchers.add_argument('--checkpoint', help="file recording progress, to resume an interrupted import")
+    vouchers.add_argument('--rejects', help="NDJSON file to append vouchers that failed to")
+    vouchers.set_defaults(handler=import_vouchers, action='imported', unit='vouchers')
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    options = parser.parse_args(argv)
+    if not options.access_token or not options.client_secret:
+        parser.error("credentials are required, use --access-token and --client-secret or set "
+                     "FORTNOX_ACCESS_TOKEN and FORTNOX_CLIENT_SECRET")
+    logging.basicConfig(level=max(logging.DEBUG, logging.WARNING - 10 * options.verbose), stream=sys.stderr,
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    summary = Summary(options.action, options.unit)
+    with Client(options.access_token, options.client_secret, server_url=options.server_url, rate=options.rate,
+                burst=options.burst) as client:
+        try:
+            options.handler(client, options, summary)
+        except KeyboardInterrupt:
+            summary.report()
+            return 130
+    summary.report()
+    return 1 if summary.failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,69 @@
+# coding=utf-8
+from fortnox.config import Config
+from fortnox.objects import FinancialYear, Voucher, VoucherSeries
+from fortnox.requests import AsyncRequest, RateLimiter, Request, SingleFlight, Transport
+
+
+class Client:
+    """
+    API client for one Fortnox company. Each client holds its own credentials, connection pool, rate limiter and
+    cache, so one process can serve many companies concurrently without touching the global fortnox_config.
+
+    Objects are used through the client:
+
+        client = Client(access_token, client_secret)
+        vouchers = client.Voucher.list(financial_year=1)
+        client.VoucherSeries.get('A')
+
+    The classes on a client are subclasses of the ones in fortnox.objects bound to the client's Request, so they
+    behave exactly like the module level classes which keep using fortnox_config.
+    """
+    object_classes = (FinancialYear, Voucher, VoucherSeries)
+
+    def __init__(self, access_token, client_secret, server_url=Request.server_url, rate=5.0, burst=25, cache=None,
+                 **transport_options):
+        self.config = Config()
+        self.config.access_token = access_token
+        self.config.client_secret = client_secret
+
+        # Every attribute holding state is set on the subclass, nothing is shared with Request or other clients.
+        self.request = type('Request', (Request,), {
+            'config': self.config,
+            'server_url': server_url,
+            'transport': Transport(**transport_options),
+            'rate_limiter': RateLimiter(rate=rate, burst=burst),
+            'retry_policies': dict(Request.retry_policies),
+            'cache': cache,
+            'validators': None,
+            'single_flight': SingleFlight(),
+            'profiler': None,
+            'hooks': ()
+        })
+        self.async_request = type('AsyncRequest', (AsyncRequest,), {'request': self.request, '_transport': None})
+
+        for object_class in self.object_classes:
+            setattr(self, object_class.__name__, self._bind(object_class))
+
+    def _bind(self, object_class):
+        return type(object_class.__name__, (object_class,), {
+            '__slots__': (),
+            '__module__': object_class.__module__,
+            'request': self.request,
+            'async_request': self.async_request
+        })
+
+    def close(self):
+        self.request.transport.close()
+
+    async def aclose(self):
+        if self.async_request._transport is not None:
+            await self.async_request._transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self):
+        return "<Client: %s>" % self.request.server_url
@@ -8,6 +8,11 @@ class Config:
         self.content_type = 'application/json'
         self.accept = 'application/json'
 
+    def __setattr__(self, name, value):
+        # Any change drops the cached headers, they are rebuilt on the next request.
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, '_headers', None)
+
     def to_dict(self):
         return {
             "Access-Token": self.access_token,
@@ -16,4 +21,15 @@ class Config:
             "Accept": self.accept
         }
 
+    def headers(self):
+        """
+        Same as to_dict, but built once and reused until an attribute changes. The returned dict is shared and must
+        not be modified.
+        """
+        headers = self._headers
+        if headers is None:
+            headers = self.to_dict()
+            object.__setattr__(self, '_headers', headers)
+        return headers
+
 fortnox_config = Config()
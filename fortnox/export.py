@@ -0,0 +1,181 @@
+# coding=utf-8
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.managers import BaseManager
+
+from fortnox.client import Client
+from fortnox.config import fortnox_config
+from fortnox.requests import RateLimiter, Request
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitManager(BaseManager):
+    """
+    Serves one RateLimiter to every process of an export, so they all draw from the same per token budget.
+    """
+
+
+RateLimitManager.register('RateLimiter', RateLimiter)
+
+
+class SharedRateLimiter:
+    """
+    RateLimiter interface over a RateLimiter proxy from RateLimitManager. The time to wait is reserved in the
+    coordinating process and slept locally, so a waiting worker never holds up the coordinator.
+    """
+    def __init__(self, proxy):
+        self.proxy = proxy
+
+    def reserve(self, key):
+        return self.proxy.reserve(key)
+
+    def acquire(self, key):
+        wait = self.proxy.reserve(key)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def metrics(self):
+        return self.proxy.metrics()
+
+
+class Partition:
+    """
+    The vouchers of one financial year, limited to one voucher series unless voucher_series is None.
+    """
+    __slots__ = ('financial_year', 'voucher_series')
+
+    def __init__(self, financial_year, voucher_series=None):
+        self.financial_year = financial_year
+        self.voucher_series = voucher_series
+
+    @property
+    def name(self):
+        if self.voucher_series is None:
+            return "vouchers-%s" % self.financial_year
+        return "vouchers-%s-%s" % (self.financial_year, self.voucher_series)
+
+    def __reduce__(self):
+        return Partition, (self.financial_year, self.voucher_series)
+
+    def __repr__(self):
+        return "<Partition: %s>" % self.name
+
+
+class ExportResult:
+    """
+    Outcome of exporting one partition: the file written, how many vouchers it holds and the seconds it took, or the
+    exception that stopped it.
+    """
+    def __init__(self, partition, path=None, count=0, seconds=0.0, error=None):
+        self.partition = partition
+        self.path = path
+        self.count = count
+        self.seconds = seconds
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        return "<ExportResult: %s %s>" % (self.partition.name, self.count if self.ok else repr(self.error))
+
+
+def partitions(client, financial_years=None, by_series=True):
+    """
+    Splits the vouchers of the given financial year ids, or of every financial year, into partitions per year and
+    voucher series. The series are listed per financial year, as a series may only exist in some years.
+    """
+    if financial_years is None:
+        financial_years = [financial_year.id for financial_year in client.FinancialYear.list()]
+    if not by_series:
+        return [Partition(financial_year) for financial_year in financial_years]
+    return [Partition(financial_year, voucher_series.code) for financial_year in financial_years
+            for voucher_series in client.VoucherSeries.list(financial_year=financial_year)]
+
+
+def export_partition(client, partition, directory):
+    """
+    Writes the vouchers of partition to <directory>/<partition name>.ndjson, one voucher as returned by the API per
+    line. The file is written under a temporary name and renamed once complete.
+    """
+    started = time.perf_counter()
+    path = os.path.join(directory, "%s.ndjson" % partition.name)
+    temporary = "%s.tmp" % path
+    dumps = client.request.codec.dumps
+    count = 0
+    pager = client.Voucher.pager(financial_year=partition.financial_year, voucher_series=partition.voucher_series)
+    try:
+        with open(temporary, 'wb') as f:
+            for page in pager.iter_pages():
+                for item in page.get('Vouchers') or []:
+                    f.write(dumps(item))
+                    f.write(b"\n")
+                    count += 1
+    except BaseException:
+        os.remove(temporary)
+        raise
+    os.replace(temporary, path)
+    return ExportResult(partition, path, count, time.perf_counter() - started)
+
+
+_worker_client = None
+
+
+def _init_worker(access_token, client_secret, server_url, rate_limiter):
+    global _worker_client
+    _worker_client = Client(access_token, client_secret, server_url=server_url)
+    _worker_client.request.rate_limiter = SharedRateLimiter(rate_limiter)
+
+
+def _export_in_worker(partition, directory):
+    return export_partition(_worker_client, partition, directory)
+
+
+def export_vouchers(directory, financial_years=None, access_token=None, client_secret=None,
+                    server_url=Request.server_url, processes=None, rate=5.0, burst=25, by_series=True):
+    """
+    Exports every voucher of the given financial year ids, or of all financial years, to per partition NDJSON files
+    in directory and returns an ExportResult per partition.
+
+    Partitions are a financial year and voucher series each (one per year with by_series=False) and are fetched
+    and decoded in a pool of `processes` worker processes, os.cpu_count() by default. All processes share one rate
+    limit of `rate` requests per second through a coordinating manager process. processes=0 runs everything in the
+    calling process. Credentials default to those in fortnox_config.
+    """
+    access_token = access_token or fortnox_config.access_token
+    client_secret = client_secret or fortnox_config.client_secret
+    os.makedirs(directory, exist_ok=True)
+
+    with RateLimitManager() as manager:
+        rate_limiter = manager.RateLimiter(rate=rate, burst=burst)
+        with Client(access_token, client_secret, server_url=server_url) as client:
+            client.request.rate_limiter = SharedRateLimiter(rate_limiter)
+            work = partitions(client, financial_years, by_series)
+
+            if processes == 0:
+                return [_result(partition, export_partition, client, partition, directory) for partition in work]
+
+        results = []
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                 initargs=(access_token, client_secret, server_url, rate_limiter)) as executor:
+            futures = dict((executor.submit(_export_in_worker, partition, directory), partition)
+                           for partition in work)
+            for future in as_completed(futures):
+                results.append(_result(futures[future], future.result))
+        return sorted(results, key=lambda result: (result.partition.financial_year,
+                                                   result.partition.voucher_series or ''))
+
+
+def _result(partition, function, *args):
+    try:
+        result = function(*args)
+    except Exception as e:
+        logger.warning("Export of %s failed: %r", partition.name, e)
+        return ExportResult(partition, error=e)
+    logger.info("Exported %s vouchers to %s in %.2fs", result.count, result.path, result.seconds)
+    return result
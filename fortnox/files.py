@@ -0,0 +1,16 @@
+# coding=utf-8
+import json
+import os
+
+
+def atomic_write_json(path, state):
+    """
+    Writes state as JSON to path. The JSON is written to "<path>.tmp", synced to disk and then moved over path, so
+    a crash leaves either the old or the new file behind, never a truncated one.
+    """
+    temporary = "%s.tmp" % path
+    with open(temporary, 'w') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
@@ -0,0 +1,118 @@
+# coding=utf-8
+import csv
+import io
+import json
+
+# Columns of voucher CSV files, one line per voucher row. Lines with the same year, series and number make up one
+# voucher.
+VOUCHER_COLUMNS = ('Year', 'VoucherSeries', 'VoucherNumber', 'TransactionDate', 'Description', 'ReferenceNumber',
+                   'ReferenceType', 'Account', 'Debit', 'Credit', 'RowDescription', 'CostCenter', 'Project')
+FINANCIAL_YEAR_COLUMNS = ('Id', 'FromDate', 'ToDate', 'AccountingMethod', 'AccountChartType')
+FORMATS = ('ndjson', 'csv')
+
+
+def voucher_lines(voucher):
+    """
+    Flattens a voucher as returned by the API into CSV lines, one per row.
+    """
+    head = (voucher.get('Year'), voucher.get('VoucherSeries'), voucher.get('VoucherNumber'),
+            voucher.get('TransactionDate'), voucher.get('Description'), voucher.get('ReferenceNumber'),
+            voucher.get('ReferenceType'))
+    return [head + (row.get('Account'), row.get('Debit'), row.get('Credit'), row.get('Description'),
+                    row.get('CostCenter'), row.get('Project'))
+            for row in voucher.get('VoucherRows') or [{}]]
+
+
+def _number(value):
+    if value in (None, ''):
+        return 0
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+
+def vouchers_from_lines(lines):
+    """
+    Groups CSV lines (dicts keyed by VOUCHER_COLUMNS) into vouchers in the API format. Consecutive lines with the
+    same financial year, voucher series and number belong to the same voucher.
+    """
+    voucher = None
+    key = None
+    for line in lines:
+        line_key = (line.get('Year'), line.get('VoucherSeries'), line.get('VoucherNumber'), line.get('TransactionDate'))
+        if voucher is None or line_key != key:
+            if voucher is not None:
+                yield voucher
+            key = line_key
+            voucher = {
+                'VoucherSeries': line.get('VoucherSeries'),
+                'TransactionDate': line.get('TransactionDate'),
+                'Description': line.get('Description'),
+                'VoucherRows': []
+            }
+        if line.get('Account'):
+            voucher['VoucherRows'].append({
+                'Account': int(line['Account']),
+                'Debit': _number(line.get('Debit')),
+                'Credit': _number(line.get('Credit')),
+                'Description': line.get('RowDescription') or ''
+            })
+    if voucher is not None:
+        yield voucher
+
+
+def _empty(f):
+    try:
+        return f.tell() == 0
+    except (OSError, ValueError):
+        # Pipes and terminals are not seekable, treat them as a fresh output.
+        return True
+
+
+class NdjsonWriter:
+    """
+    Writes one JSON document per line to a binary file, encoded with `dumps` (a codec's dumps returning bytes).
+    """
+    def __init__(self, f, dumps=None):
+        self.f = f
+        self.dumps = dumps or (lambda content: json.dumps(content).encode('utf-8'))
+
+    def write(self, item):
+        self.f.write(self.dumps(item))
+        self.f.write(b"\n")
+
+
+class CsvWriter:
+    """
+    Writes CSV lines to a binary file. `lines` turns an item into the lines to write; the header is written when
+    the file is empty.
+    """
+    def __init__(self, f, columns, lines):
+        self.f = f
+        self.lines = lines
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+        if _empty(f):
+            self._write([columns])
+
+    def _write(self, lines):
+        self._writer.writerows(lines)
+        self.f.write(self._buffer.getvalue().encode('utf-8'))
+        self._buffer.seek(0)
+        self._buffer.truncate()
+
+    def write(self, item):
+        self._write(self.lines(item))
+
+
+def read_ndjson(f):
+    for line in f:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def read_csv(f):
+    """
+    Reads CSV lines as dicts from a file opened in text mode with newline=''.
+    """
+    return csv.DictReader(f)
@@ -0,0 +1,166 @@
+# coding=utf-8
+import json
+import sqlite3
+import threading
+
+from fortnox.objects import Voucher
+from fortnox.objects.dates import format_date
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS vouchers (
+    year INTEGER NOT NULL,
+    series TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    transaction_date TEXT,
+    reference_number TEXT,
+    reference_type TEXT,
+    cost_center TEXT,
+    content TEXT NOT NULL,
+    PRIMARY KEY (year, series, number)
+);
+CREATE TABLE IF NOT EXISTS voucher_rows (
+    year INTEGER NOT NULL,
+    series TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    account INTEGER,
+    cost_center TEXT,
+    transaction_date TEXT
+);
+CREATE INDEX IF NOT EXISTS vouchers_transaction_date ON vouchers (transaction_date);
+CREATE INDEX IF NOT EXISTS vouchers_reference_number ON vouchers (reference_number);
+CREATE INDEX IF NOT EXISTS vouchers_cost_center ON vouchers (cost_center);
+CREATE INDEX IF NOT EXISTS vouchers_series ON vouchers (series, year);
+CREATE INDEX IF NOT EXISTS voucher_rows_voucher ON voucher_rows (year, series, number);
+CREATE INDEX IF NOT EXISTS voucher_rows_account ON voucher_rows (account, transaction_date);
+CREATE INDEX IF NOT EXISTS voucher_rows_cost_center ON voucher_rows (cost_center, transaction_date);
+"""
+
+
+def _voucher_json(voucher):
+    return {
+        "@url": voucher.url,
+        "Comments": voucher.comments,
+        "CostCenter": voucher.cost_center,
+        "Description": voucher.description,
+        "Project": voucher.project,
+        "ReferenceNumber": voucher.reference_number,
+        "ReferenceType": voucher.reference_type,
+        "TransactionDate": format_date(voucher._transaction_date),
+        "VoucherNumber": voucher.voucher_number,
+        "VoucherRows": [
+            {
+                "Account": row.account,
+                "CostCenter": row.cost_center,
+                "Credit": row.credit,
+                "Description": row.description,
+                "Debit": row.debit,
+                "Project": row.project,
+                "Removed": row.removed,
+                "TransactionInformation": row.transaction_information
+            } for row in voucher.voucher_rows
+        ],
+        "VoucherSeries": voucher.voucher_series,
+        "Year": voucher.year
+    }
+
+
+class VoucherMirror:
+    """
+    Local copy of vouchers in a sqlite database, indexed on account, transaction date, voucher series, reference
+    number and cost center so that common questions are answered without calling the API. Feed it from
+    Voucher.list/iter or from the new and changed vouchers of a VoucherSync run; ingesting a voucher again replaces
+    the stored copy.
+
+    Date arguments accept dates, datetimes or "YYYY-MM-DD" strings and are inclusive.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(SCHEMA)
+
+    def close(self):
+        self._connection.close()
+
+    def ingest(self, vouchers):
+        """
+        Stores the given vouchers and returns how many were written.
+        """
+        count = 0
+        with self._lock, self._connection:
+            for voucher in vouchers:
+                key = (voucher.year, voucher.voucher_series, voucher.voucher_number)
+                transaction_date = format_date(voucher._transaction_date)
+                self._connection.execute("DELETE FROM voucher_rows WHERE year = ? AND series = ? AND number = ?", key)
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO vouchers (year, series, number, transaction_date, reference_number, "
+                    "reference_type, cost_center, content) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    key + (transaction_date, voucher.reference_number, voucher.reference_type, voucher.cost_center,
+                           json.dumps(_voucher_json(voucher))))
+                self._connection.executemany(
+                    "INSERT INTO voucher_rows (year, series, number, account, cost_center, transaction_date) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [key + (row.account, row.cost_center, transaction_date) for row in voucher.voucher_rows])
+                count += 1
+        return count
+
+    def ingest_sync(self, result):
+        return self.ingest(result.new + result.changed)
+
+    def _vouchers(self, where, params):
+        query = "SELECT content FROM vouchers WHERE %s ORDER BY transaction_date, year, series, number" % where
+        with self._lock:
+            contents = [row[0] for row in self._connection.execute(query, params)]
+        return [Voucher(json.loads(content)) for content in contents]
+
+    @staticmethod
+    def _date_range(from_date, to_date):
+        clauses = []
+        params = []
+        if from_date is not None:
+            clauses.append("transaction_date >= ?")
+            params.append(format_date(from_date))
+        if to_date is not None:
+            clauses.append("transaction_date <= ?")
+            params.append(format_date(to_date))
+        return clauses, params
+
+    def _by_row(self, column, value, from_date, to_date, voucher_column=None):
+        clauses, params = self._date_range(from_date, to_date)
+        rows = "(year, series, number) IN (SELECT year, series, number FROM voucher_rows WHERE %s)" % \
+               " AND ".join(["%s = ?" % column] + clauses)
+        if voucher_column is None:
+            return self._vouchers(rows, [value] + params)
+        where = " AND ".join(["%s = ?" % voucher_column] + clauses)
+        return self._vouchers("(%s) OR %s" % (where, rows), [value] + params + [value] + params)
+
+    def get(self, voucher_series, voucher_number, year):
+        vouchers = self._vouchers("year = ? AND series = ? AND number = ?", (year, voucher_series, voucher_number))
+        return vouchers[0] if vouchers else None
+
+    def by_account(self, account, from_date=None, to_date=None):
+        return self._by_row("account", account, from_date, to_date)
+
+    def by_cost_center(self, cost_center, from_date=None, to_date=None):
+        """
+        Vouchers with the cost center on the voucher itself or on any of its rows.
+        """
+        return self._by_row("cost_center", cost_center, from_date, to_date, voucher_column="cost_center")
+
+    def by_reference(self, reference_number, reference_type=None):
+        if reference_type is None:
+            return self._vouchers("reference_number = ?", (reference_number,))
+        return self._vouchers("reference_number = ? AND reference_type = ?", (reference_number, reference_type))
+
+    def by_series(self, voucher_series, year=None):
+        if year is None:
+            return self._vouchers("series = ?", (voucher_series,))
+        return self._vouchers("series = ? AND year = ?", (voucher_series, year))
+
+    def by_date(self, from_date=None, to_date=None):
+        clauses, params = self._date_range(from_date, to_date)
+        return self._vouchers(" AND ".join(clauses) or "1", params)
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM vouchers").fetchone()[0]
@@ -1,3 +1,5 @@
+from .bulk import BulkResult
+from .columnar import VoucherRowColumns
 from .financial_year import FinancialYear
 from .voucher import Voucher
 from .voucher_row import VoucherRow
@@ -0,0 +1,109 @@
+# coding=utf-8
+import collections
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+logger = logging.getLogger(__name__)
+
+
+class BulkResult:
+    """
+    Outcome of creating one item in a bulk run. `index` is the position of the item in the input, `item` is the
+    object that was posted and `error` the exception raised while creating it, if any. `skipped` is set when the
+    item was not posted because a checkpoint records it as created by an earlier run.
+    """
+    def __init__(self, index, item, error=None, skipped=False):
+        self.index = index
+        self.item = item
+        self.error = error
+        self.skipped = skipped
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        if self.skipped:
+            return "<BulkResult: %s skipped>" % self.index
+        return "<BulkResult: %s %s>" % (self.index, "ok" if self.ok else repr(self.error))
+
+
+def _create(item):
+    return item.create()
+
+
+def _create_and_commit(item, checkpoint, job, key):
+    # The commit is recorded by the worker as soon as the item is created, so results the caller never got to
+    # consume are not posted again by the next run.
+    created = item.create()
+    checkpoint.commit(job, key)
+    return created
+
+
+def _submit(executor, item, checkpoint, job, idempotency_key):
+    # Returns None for an item the checkpoint records as created. The key is taken before create() updates the item.
+    if checkpoint is None:
+        return executor.submit(_create, item)
+    key = idempotency_key(item)
+    if checkpoint.is_committed(job, key):
+        return None
+    return executor.submit(_create_and_commit, item, checkpoint, job, key)
+
+
+def _result(index, item, future):
+    if future is None:
+        return BulkResult(index, item, skipped=True)
+    try:
+        future.result()
+        return BulkResult(index, item)
+    except Exception as e:
+        logger.warning("Bulk create of item %s failed: %r", index, e)
+        return BulkResult(index, item, e)
+
+
+def bulk_create(items, concurrency=4, ordered=True, checkpoint=None, idempotency_key=None, job="bulk create"):
+    """
+    Calls create() on every object in `items` using `concurrency` worker threads and yields a BulkResult per item.
+    Items are pulled from the iterable as workers become free, so a generator of any length can be streamed through.
+    Failures are reported in the results and never abort the run. With ordered=False results are yielded as they
+    complete instead of in input order.
+
+    With a fortnox.checkpoint.Checkpoint every created item is recorded under `job` by idempotency_key(item), a key
+    supplied by the caller that identifies the item across runs. Items already recorded are not posted again, their
+    results have skipped set. Failed items are not recorded, so a rerun tries them again.
+    """
+    # Arguments are checked here rather than in the generator, so errors are raised by the call itself.
+    if checkpoint is not None and idempotency_key is None:
+        raise ValueError("bulk_create needs an idempotency_key to use a checkpoint")
+    if concurrency < 1:
+        raise ValueError("bulk_create needs a concurrency of at least 1, got %s" % concurrency)
+    return _bulk_create(items, concurrency, ordered, checkpoint, idempotency_key, job)
+
+
+def _bulk_create(items, concurrency, ordered, checkpoint, idempotency_key, job):
+    window = concurrency * 2
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        if ordered:
+            pending = collections.deque()
+            for index, item in enumerate(items):
+                pending.append((index, item, _submit(executor, item, checkpoint, job, idempotency_key)))
+                if len(pending) >= window:
+                    yield _result(*pending.popleft())
+            while pending:
+                yield _result(*pending.popleft())
+        else:
+            pending = {}
+            for index, item in enumerate(items):
+                future = _submit(executor, item, checkpoint, job, idempotency_key)
+                if future is None:
+                    yield BulkResult(index, item, skipped=True)
+                    continue
+                pending[future] = (index, item)
+                if len(pending) >= window:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield _result(*(pending.pop(future) + (future,)))
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield _result(*(pending.pop(future) + (future,)))
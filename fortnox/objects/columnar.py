@@ -0,0 +1,116 @@
+# coding=utf-8
+import datetime
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class VoucherRowColumns:
+    """
+    Voucher rows stored column by column in typed arrays instead of as VoucherRow objects. Every row also carries the
+    keys of its voucher (series, number, year and transaction date) so the columns can be grouped without going back
+    to the vouchers.
+
+    Numeric columns are array.array instances, transaction dates are stored as proleptic Gregorian ordinals and
+    repeated strings are shared between rows. to_numpy() exposes the numeric columns as NumPy arrays without
+    copying when NumPy is installed.
+    """
+    numeric_columns = (
+        ('voucher_number', 'q'),
+        ('year', 'q'),
+        ('transaction_date', 'l'),
+        ('account', 'q'),
+        ('debit', 'd'),
+        ('credit', 'd'),
+        ('removed', 'b'),
+    )
+    string_columns = ('voucher_series', 'cost_center', 'project', 'description', 'transaction_information')
+
+    def __init__(self):
+        for name, typecode in self.numeric_columns:
+            setattr(self, name, array(typecode))
+        for name in self.string_columns:
+            setattr(self, name, [])
+        self._strings = {}
+        self._ordinals = {}
+
+    def __len__(self):
+        return len(self.account)
+
+    def _string(self, value):
+        if value is None:
+            return None
+        return self._strings.setdefault(value, value)
+
+    def _ordinal(self, value):
+        if not value:
+            return 0
+        ordinal = self._ordinals.get(value)
+        if ordinal is None:
+            ordinal = self._ordinals[value] = datetime.date.fromisoformat(value).toordinal()
+        return ordinal
+
+    def append_voucher(self, voucher):
+        """
+        Appends the rows of one voucher, given as the JSON dict returned by the API.
+        """
+        rows = voucher.get("VoucherRows") or ()
+        count = len(rows)
+        if not count:
+            return
+
+        string = self._string
+        self.voucher_number.extend([voucher.get("VoucherNumber") or 0] * count)
+        self.year.extend([voucher.get("Year") or 0] * count)
+        self.transaction_date.extend([self._ordinal(voucher.get("TransactionDate"))] * count)
+        self.voucher_series.extend([string(voucher.get("VoucherSeries"))] * count)
+
+        for row in rows:
+            self.account.append(row.get("Account") or 0)
+            self.debit.append(row.get("Debit") or 0)
+            self.credit.append(row.get("Credit") or 0)
+            self.removed.append(1 if row.get("Removed") else 0)
+            self.cost_center.append(string(row.get("CostCenter", "")))
+            self.project.append(string(row.get("Project", "")))
+            self.description.append(row.get("Description", ""))
+            self.transaction_information.append(row.get("TransactionInformation"))
+
+    def extend(self, vouchers):
+        for voucher in vouchers:
+            self.append_voucher(voucher)
+        return self
+
+    def date(self, index):
+        ordinal = self.transaction_date[index]
+        return datetime.datetime.fromordinal(ordinal) if ordinal else None
+
+    def to_numpy(self):
+        """
+        Returns the numeric columns as a dict of NumPy arrays sharing memory with the underlying arrays.
+        """
+        if numpy is None:
+            raise ImportError("numpy is required for to_numpy()")
+        return dict((name, numpy.frombuffer(getattr(self, name), dtype=getattr(self, name).typecode))
+                    for name, _ in self.numeric_columns)
+
+    def balances_by_account(self, include_removed=False):
+        """
+        Returns a dict of account number to debit minus credit over all rows.
+        """
+        if numpy is not None:
+            columns = self.to_numpy()
+            keep = numpy.ones(len(self), dtype=bool) if include_removed else columns['removed'] == 0
+            accounts, positions = numpy.unique(columns['account'][keep], return_inverse=True)
+            sums = numpy.bincount(positions, weights=columns['debit'][keep] - columns['credit'][keep],
+                                  minlength=len(accounts))
+            return dict(zip(accounts.tolist(), sums.tolist()))
+
+        balances = {}
+        for account, debit, credit, removed in zip(self.account, self.debit, self.credit, self.removed):
+            if removed and not include_removed:
+                continue
+            balances[account] = balances.get(account, 0.0) + debit - credit
+        return balances
@@ -1,9 +1,65 @@
 # coding=utf-8
+from fortnox.requests import AsyncRequest, Request
+from .bulk import bulk_create
+from .dates import parse_date
 
 
 class DefaultObject():
+    __slots__ = ()
     item_url = None
     valid_search_params = ['page', 'limit', 'offset']
+    # When set, date attributes keep the raw string from the API and are parsed the first time they are read.
+    lazy_dates = False
+    # Seconds that get and list results may be served from Request.cache, None disables caching for the class.
+    cache_ttl = None
+    # Request classes used for API calls. fortnox.client.Client binds subclasses to its own credentials.
+    request = Request
+    async_request = AsyncRequest
+    # Template for the url of a single object, "<item_url>/%s", prepared once per class.
+    resource_url = None
+    # The same urls made absolute with request.server_url, e.g. "https://api.fortnox.se/3/vouchers/%s". API calls
+    # are made with these, so no url has to be resolved per call. Rebuilt when the server_url is changed.
+    absolute_item_url = None
+    absolute_resource_url = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.item_url is not None:
+            cls.resource_url = cls.item_url + "/%s"
+            cls.prepare_urls()
+            cls.request.object_classes.add(cls)
+
+    @classmethod
+    def prepare_urls(cls):
+        cls.absolute_item_url = cls.request.server_url + cls.item_url
+        cls.absolute_resource_url = cls.absolute_item_url + "/%s"
+
+    @classmethod
+    def _search_params(cls, params):
+        search_params = {}
+
+        if params:
+            for key in params.keys():
+                if key in cls.valid_search_params:
+                    search_params[key] = params[key]
+
+        return search_params
+
+    def _date(self, value):
+        if not value:
+            return None
+        return value if self.lazy_dates else parse_date(value)
+
+    @classmethod
+    def bulk_create(cls, items, concurrency=4, ordered=True, checkpoint=None, idempotency_key=None):
+        """
+        Creates every object in items with bounded concurrency, see fortnox.objects.bulk.bulk_create. Returns a
+        generator of BulkResult; collect the failed ones with [result.item for result in results if not result.ok]
+        to replay them later. With a checkpoint, objects created by an earlier run are recorded under
+        "POST <item_url>" by idempotency_key(item) and skipped.
+        """
+        return bulk_create(items, concurrency=concurrency, ordered=ordered, checkpoint=checkpoint,
+                           idempotency_key=idempotency_key, job="POST %s" % cls.item_url)
 
     def __str__(self):
         if self.id:
@@ -1,102 +1,103 @@
 # coding=utf-8
-import datetime
-import logging
-
 from fortnox.exceptions import ObjectNotFound
+from fortnox.objects.dates import DateField, format_date
 from fortnox.objects.default_object import DefaultObject
-from fortnox.requests import Request
-
-logger = logging.getLogger(__name__)
+from fortnox.requests import AsyncPager, Pager
 
 
 class FinancialYear(DefaultObject):
     item_url = '/financialyears'
 
     valid_search_params = DefaultObject.valid_search_params + ['date', 'fromDate', 'toDate']
+    __slots__ = ('id', 'url', '_from_date', '_to_date', 'accounting_method', 'account_chart_type')
+
+    cache_ttl = 3600
+
+    from_date = DateField('_from_date')
+    to_date = DateField('_to_date')
 
     def __init__(self, json_data = {}):
         self.id = json_data.get("Id")
         self.url = json_data.get("@url")
-        if json_data.get("FromDate"):
-            self.from_date = datetime.datetime.strptime(json_data.get("FromDate"), "%Y-%m-%d")
-        else:
-            self.from_date = None
-        if json_data.get("ToDate"):
-            self.to_date = datetime.datetime.strptime(json_data.get("ToDate"), "%Y-%m-%d")
-        else:
-            self.to_date = None
+        self.from_date = self._date(json_data.get("FromDate"))
+        self.to_date = self._date(json_data.get("ToDate"))
         self.accounting_method = json_data.get("AccountingMethod")
         self.account_chart_type = json_data.get("AccountChartType")
 
     def _update(self, financial_year):
         self.id = financial_year.id
         self.url = financial_year.url
-        self.from_date = financial_year.from_date
-        self.to_date = financial_year.to_date
+        self._from_date = financial_year._from_date
+        self._to_date = financial_year._to_date
         self.accounting_method = financial_year.accounting_method
         self.account_chart_type = financial_year.account_chart_type
 
     def to_dict(self):
         return {
             'FinancialYear': {
-                'FromDate': self.from_date.strftime("%Y-%m-%d"),
-                'ToDate': self.to_date.strftime("%Y-%m-%d"),
+                'FromDate': format_date(self._from_date),
+                'ToDate': format_date(self._to_date),
                 'AccountingMethod': self.accounting_method,
                 'AccountChartType': self.account_chart_type
             }
         }
 
     def create(self):
-        response = Request.post(self.item_url, self.to_dict())
+        response = self.request.post(self.absolute_item_url, self.to_dict())
         content = response.json()
-        logger.debug(content)
 
         self._update(FinancialYear(content['FinancialYear']))
+        self.request.update_cache(self.absolute_item_url, self.absolute_resource_url % self.id, content, self.cache_ttl)
+
+        return self
+
+    async def acreate(self):
+        response = await self.async_request.post(self.absolute_item_url, self.to_dict())
+        content = response.json()
+
+        self._update(FinancialYear(content['FinancialYear']))
+        await self.async_request.update_cache(self.absolute_item_url, self.absolute_resource_url % self.id, content,
+                                              self.cache_ttl)
 
         return self
 
     @classmethod
     def list(cls, params=None):
-        return_list = []
-        search_params = {}
-        done = False
-
-        if params:
-            for key in params.keys():
-                if key in cls.valid_search_params:
-                    search_params[key] = params[key]
-
-        while not done:
-            response = Request.get(cls.item_url, search_params)
-            content = response.json()
-            logger.debug(content)
-            for item in content['FinancialYears']:
-                return_list.append(FinancialYear(item))
-
-            if content['MetaInformation']['@TotalPages'] == content['MetaInformation']['@CurrentPage']:
-                done = True
-            else:
-                if 'page' in params.keys():
-                    done = True
-                elif 'limit' in params.keys() and int(params['limit']) == len(return_list):
-                    done = True
-                elif content['MetaInformation']['@TotalPages'] < content['MetaInformation']['@CurrentPage'] + 1:
-                    search_params['page'] = content['MetaInformation']['@CurrentPage'] + 1
-                else:
-                    done = True
-
-        return return_list
+        pager = Pager(cls.absolute_item_url, 'FinancialYears', cls._search_params(params), cache_ttl=cls.cache_ttl,
+                      request=cls.request)
+        return [cls(item) for item in pager.items()]
+
+    @classmethod
+    def iter(cls, params=None):
+        pager = Pager(cls.absolute_item_url, 'FinancialYears', cls._search_params(params), cache_ttl=cls.cache_ttl,
+                      request=cls.request)
+        for item in pager.iter_items():
+            yield cls(item)
+
+    @classmethod
+    async def alist(cls, params=None):
+        pager = AsyncPager(cls.absolute_item_url, 'FinancialYears', cls._search_params(params), cache_ttl=cls.cache_ttl,
+                           request=cls.async_request)
+        return [cls(item) for item in await pager.items()]
 
     @classmethod
     def get(cls, id):
         try:
-            response = Request.get("%s/%s" % (cls.item_url, id))
-            content = response.json()
-            logger.debug(content)
+            content = cls.request.cached_get(cls.absolute_resource_url % id, ttl=cls.cache_ttl)
 
-            return FinancialYear(content['FinancialYear'])
+            return cls(content['FinancialYear'])
 
         except ObjectNotFound as e:
             e.message = "Unable to find Financial year with id: %s" % id
             raise e
 
+    @classmethod
+    async def aget(cls, id):
+        try:
+            content = await cls.async_request.cached_get(cls.absolute_resource_url % id, ttl=cls.cache_ttl)
+
+            return cls(content['FinancialYear'])
+
+        except ObjectNotFound as e:
+            e.message = "Unable to find Financial year with id: %s" % id
+            raise e
@@ -1,18 +1,20 @@
 # coding=utf-8
-import datetime
-import logging
-
+from fortnox.cache import FOREVER
 from fortnox.exceptions import ObjectNotFound
+from fortnox.objects.columnar import VoucherRowColumns
+from fortnox.objects.dates import DateField, format_date
 from fortnox.objects.default_object import DefaultObject
-from fortnox.requests import Request
+from fortnox.requests import AsyncPager, Pager
 from .voucher_row import VoucherRow
 
-logger = logging.getLogger(__name__)
-
 
 class Voucher(DefaultObject):
     item_url = "/vouchers"
-    valid_search_params = DefaultObject.valid_search_params + ['financialyear', 'financialyeardate']
+    valid_search_params = DefaultObject.valid_search_params + ['financialyear', 'financialyeardate', 'lastmodified']
+    __slots__ = ('url', 'comments', 'cost_center', 'description', 'project', 'reference_number', 'reference_type',
+                 '_transaction_date', 'voucher_number', '_raw_rows', '_voucher_rows', 'voucher_series', 'year')
+
+    transaction_date = DateField('_transaction_date')
 
     def __init__(self, json_data = {}):
         self.url = json_data.get('@url')
@@ -22,18 +24,26 @@ class Voucher(DefaultObject):
         self.project = json_data.get('Project')
         self.reference_number = json_data.get("ReferenceNumber")
         self.reference_type = json_data.get("ReferenceType")
-        if json_data.get("TransactionDate"):
-            self.transaction_date = datetime.datetime.strptime(json_data.get("TransactionDate"), "%Y-%m-%d")
-        else:
-            self.transaction_date = None
+        self.transaction_date = self._date(json_data.get("TransactionDate"))
         self.voucher_number = json_data.get("VoucherNumber")
-        self.voucher_rows = []
-        if json_data.get("VoucherRows"):
-            for row in json_data.get("VoucherRows"):
-                self.voucher_rows.append(VoucherRow(row))
+        # Rows are kept as they came from the API and only turned into VoucherRow objects when first read.
+        self._raw_rows = json_data.get("VoucherRows")
+        self._voucher_rows = None
         self.voucher_series = json_data.get("VoucherSeries")
         self.year = json_data.get("Year")
 
+    @property
+    def voucher_rows(self):
+        if self._voucher_rows is None:
+            self._voucher_rows = [VoucherRow(row) for row in self._raw_rows] if self._raw_rows else []
+            self._raw_rows = None
+        return self._voucher_rows
+
+    @voucher_rows.setter
+    def voucher_rows(self, voucher_rows):
+        self._voucher_rows = voucher_rows
+        self._raw_rows = None
+
     def __str__(self):
         return "%s" % self.voucher_number if self.voucher_number else ""
 
@@ -42,44 +52,35 @@ class Voucher(DefaultObject):
             "Voucher": {
                 "Description": self.description,
                 "VoucherSeries": self.voucher_series,
-                "TransactionDate": self.transaction_date.strftime("%Y-%m-%d"),
+                "TransactionDate": format_date(self._transaction_date),
                 "VoucherRows": [row.to_dict() for row in self.voucher_rows]
             }
         }
 
     def _update(self, voucher):
-        self.url = voucher.url
-        self.comments = voucher.comments
-        self.cost_center = voucher.cost_center
-        self.description = voucher.description
-        self.project = voucher.project
-        self.reference_number = voucher.reference_number
-        self.reference_type = voucher.reference_type
-        self.transaction_date = voucher.transaction_date
-        self.voucher_number = voucher.voucher_number
-        self.voucher_rows = voucher.voucher_rows
-        self.voucher_series = voucher.voucher_series
-        self.year = voucher.year
+        # Copies the slots rather than the attributes, so rows that were never read stay unparsed.
+        for slot in Voucher.__slots__:
+            setattr(self, slot, getattr(voucher, slot))
 
     def create(self):
-        response = Request.post(self.item_url, self.to_dict())
+        response = self.request.post(self.absolute_item_url, self.to_dict())
         content = response.json()
-        logger.debug(content)
 
         self._update(Voucher(content['Voucher']))
 
         return self
 
-    @classmethod
-    def list(cls, financial_year=None, financial_year_date=None, params={}):
-        return_list = []
-        search_params = {}
-        done = False
+    async def acreate(self):
+        response = await self.async_request.post(self.absolute_item_url, self.to_dict())
+        content = response.json()
 
-        if params:
-            for key in params.keys():
-                if key in cls.valid_search_params:
-                    search_params[key] = params[key]
+        self._update(Voucher(content['Voucher']))
+
+        return self
+
+    @classmethod
+    def _list_params(cls, financial_year, financial_year_date, params):
+        search_params = cls._search_params(params)
 
         if financial_year:
             search_params['financialyear'] = financial_year
@@ -87,27 +88,53 @@ class Voucher(DefaultObject):
         if financial_year_date:
             search_params['financialyeardate'] = financial_year_date
 
-        while not done:
-            response = Request.get(cls.item_url, search_params)
-            content = response.json()
-            logger.debug(content)
-            for item in content['Vouchers']:
-                return_list.append(Voucher(item))
-
-            if content['MetaInformation']['@TotalPages'] == content['MetaInformation']['@CurrentPage'] or \
-                content['MetaInformation']['@TotalPages'] == 0:
-                done = True
-            else:
-                if 'page' in params.keys():
-                    done = True
-                elif 'limit' in params.keys() and int(params['limit']) == len(return_list):
-                    done = True
-                elif content['MetaInformation']['@TotalPages'] < content['MetaInformation']['@CurrentPage'] + 1:
-                    search_params['page'] = content['MetaInformation']['@CurrentPage'] + 1
-                else:
-                    done = True
-
-        return return_list
+        return search_params
+
+    @classmethod
+    def _list_url(cls, voucher_series):
+        if voucher_series:
+            return "%s/sublist/%s" % (cls.absolute_item_url, voucher_series)
+        return cls.absolute_item_url
+
+    @classmethod
+    def pager(cls, financial_year=None, financial_year_date=None, params={}, voucher_series=None):
+        """
+        Pager over the raw voucher list, limited to one voucher series when voucher_series is given.
+        """
+        search_params = cls._list_params(financial_year, financial_year_date, params)
+        return Pager(cls._list_url(voucher_series), 'Vouchers', search_params, request=cls.request)
+
+    @classmethod
+    def list(cls, financial_year=None, financial_year_date=None, params={}, voucher_series=None):
+        pager = cls.pager(financial_year, financial_year_date, params, voucher_series)
+        return [cls(item) for item in pager.items()]
+
+    @classmethod
+    def iter(cls, financial_year=None, financial_year_date=None, params={}, voucher_series=None, checkpoint=None):
+        """
+        Yields the vouchers page by page. With a fortnox.checkpoint.Checkpoint a page is recorded once all of its
+        vouchers have been handled, and a restarted job continues after the last recorded page.
+        """
+        for item in cls.pager(financial_year, financial_year_date, params, voucher_series).iter_items(checkpoint):
+            yield cls(item)
+
+    @classmethod
+    def list_columns(cls, financial_year=None, financial_year_date=None, params={}, columns=None,
+                     voucher_series=None):
+        """
+        Like list, but the voucher rows are parsed straight into a VoucherRowColumns instead of Voucher objects. Pages
+        are streamed, so only the columns and the page being parsed are held in memory.
+        """
+        columns = columns if columns is not None else VoucherRowColumns()
+        for page in cls.pager(financial_year, financial_year_date, params, voucher_series).iter_pages():
+            columns.extend(page['Vouchers'])
+        return columns
+
+    @classmethod
+    async def alist(cls, financial_year=None, financial_year_date=None, params={}, voucher_series=None):
+        search_params = cls._list_params(financial_year, financial_year_date, params)
+        pager = AsyncPager(cls._list_url(voucher_series), 'Vouchers', search_params, request=cls.async_request)
+        return [cls(item) for item in await pager.items()]
 
     @classmethod
     def get(cls, voucher_series_code, voucher_number, financial_year=None, financial_year_date=None):
@@ -120,12 +147,12 @@ class Voucher(DefaultObject):
             if financial_year_date:
                 params['financialyeardate'] = financial_year_date
 
-            response = Request.get("%s/%s/%s" % (cls.item_url, voucher_series_code, voucher_number), params=params)
+            response = cls.request.get("%s/%s/%s" % (cls.absolute_item_url, voucher_series_code, voucher_number),
+                                       params=params)
 
             content = response.json()
-            logger.debug(content)
 
-            return Voucher(content['Voucher'])
+            return cls(content['Voucher'])
 
         except ObjectNotFound as e:
             e.message = "Unable to find Voucher with voucher series code: %s, voucher number: %s" % \
@@ -135,11 +162,33 @@ class Voucher(DefaultObject):
     @classmethod
     def get(cls, url):
         try:
-            response = Request.get(url)
-            content = response.json()
-            logger.debug(content)
+            content = cls.request.cached_get(url, ttl=FOREVER)
+
+            return cls(content['Voucher'])
+
+        except ObjectNotFound as e:
+            e.message = "Unable to find Voucher with url: %s" % url
+            raise e
+
+    @classmethod
+    async def aget(cls, url):
+        try:
+            content = await cls.async_request.cached_get(url, ttl=FOREVER)
+
+            return cls(content['Voucher'])
+
+        except ObjectNotFound as e:
+            e.message = "Unable to find Voucher with url: %s" % url
+            raise e
+
+    @classmethod
+    def get_columns(cls, url, columns=None):
+        columns = columns if columns is not None else VoucherRowColumns()
+        try:
+            response = cls.request.get(url)
+            columns.append_voucher(response.json()['Voucher'])
 
-            return Voucher(content['Voucher'])
+            return columns
 
         except ObjectNotFound as e:
             e.message = "Unable to find Voucher with url: %s" % url
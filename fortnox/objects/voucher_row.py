@@ -2,6 +2,9 @@
 
 
 class VoucherRow():
+    __slots__ = ('account', 'cost_center', 'credit', 'description', 'debit', 'project', 'removed',
+                 'transaction_information')
+
     def __init__(self, json_data = {}):
         self.account = json_data.get("Account", 0)
         self.cost_center = json_data.get("CostCenter", "")
@@ -1,15 +1,12 @@
 # coding=utf-8
-import logging
-
 from fortnox.exceptions import ObjectNotFound
 from fortnox.objects.default_object import DefaultObject
-from fortnox.requests import Request
-
-logger = logging.getLogger(__name__)
 
 
 class VoucherSeries(DefaultObject):
     item_url = "/voucherseries"
+    __slots__ = ('url', 'code', 'description', 'manual', 'next_voucher_number', 'year')
+    cache_ttl = 3600
 
     def __init__(self, json_data = {}):
         self.url = json_data.get("@url")
@@ -40,21 +37,48 @@ class VoucherSeries(DefaultObject):
         self.year = voucher_series.year
 
     def create(self):
-        response = Request.post(self.item_url, self.to_dict())
+        response = self.request.post(self.absolute_item_url, self.to_dict())
+        content = response.json()
+
+        self._update(VoucherSeries(content['VoucherSeries']))
+        self.request.update_cache(self.absolute_item_url, self.absolute_resource_url % self.code, content,
+                                  self.cache_ttl)
+
+        return self
+
+    async def acreate(self):
+        response = await self.async_request.post(self.absolute_item_url, self.to_dict())
         content = response.json()
-        logger.debug(content)
 
         self._update(VoucherSeries(content['VoucherSeries']))
+        await self.async_request.update_cache(self.absolute_item_url, self.absolute_resource_url % self.code,
+                                              content, self.cache_ttl)
 
         return self
 
     def save(self):
         try:
-            response = Request.put("%s/%s" % (self.item_url, self.code), self.to_dict())
+            response = self.request.put(self.absolute_resource_url % self.code, self.to_dict())
+            content = response.json()
+
+            self._update(VoucherSeries(content['VoucherSeries']))
+            self.request.update_cache(self.absolute_item_url, self.absolute_resource_url % self.code, content,
+                                      self.cache_ttl)
+
+            return self
+
+        except ObjectNotFound as e:
+            e.message = "Unable to find Voucher series with code: %s" % self.code
+            raise e
+
+    async def asave(self):
+        try:
+            response = await self.async_request.put(self.absolute_resource_url % self.code, self.to_dict())
             content = response.json()
-            logger.debug(content)
 
             self._update(VoucherSeries(content['VoucherSeries']))
+            await self.async_request.update_cache(self.absolute_item_url, self.absolute_resource_url % self.code,
+                                                  content, self.cache_ttl)
 
             return self
 
@@ -62,28 +86,45 @@ class VoucherSeries(DefaultObject):
             e.message = "Unable to find Voucher series with code: %s" % self.code
             raise e
 
+    @staticmethod
+    def _list_params(financial_year):
+        return {'financialyear': financial_year} if financial_year else None
+
     @classmethod
-    def list(cls):
+    def list(cls, financial_year=None):
         return_list = []
 
-        response = Request.get(cls.item_url)
-        content = response.json()
-        logger.debug(content)
+        content = cls.request.cached_get(cls.absolute_item_url, cls._list_params(financial_year), ttl=cls.cache_ttl)
         for item in content['VoucherSeriesCollection']:
-            return_list.append(VoucherSeries(item))
+            return_list.append(cls(item))
 
         return return_list
 
+    @classmethod
+    async def alist(cls, financial_year=None):
+        content = await cls.async_request.cached_get(cls.absolute_item_url, cls._list_params(financial_year),
+                                                     ttl=cls.cache_ttl)
+
+        return [cls(item) for item in content['VoucherSeriesCollection']]
+
     @classmethod
     def get(cls, code):
         try:
-            response = Request.get("%s/%s" % (cls.item_url, code))
-            content = response.json()
-            logger.debug(content)
+            content = cls.request.cached_get(cls.absolute_resource_url % code, ttl=cls.cache_ttl)
 
-            return VoucherSeries(content['VoucherSeries'])
+            return cls(content['VoucherSeries'])
 
         except ObjectNotFound as e:
             e.message = "Unable to find Voucher series with code: %s" % code
             raise e
 
+    @classmethod
+    async def aget(cls, code):
+        try:
+            content = await cls.async_request.cached_get(cls.absolute_resource_url % code, ttl=cls.cache_ttl)
+
+            return cls(content['VoucherSeries'])
+
+        except ObjectNotFound as e:
+            e.message = "Unable to find Voucher series with code: %s" % code
+            raise e
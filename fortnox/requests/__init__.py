@@ -1 +1,12 @@
-from .request import Request
\ No newline at end of file
+from .request import Request
+from .async_request import AsyncRequest, AsyncTransport
+from .conditional import ValidatorStore
+from .events import Event
+from .metrics import Histogram, MetricsCollector
+from .pager import AsyncPager, Pager
+from .profiler import CallProfile, Profiler
+from .rate_limiter import RateLimiter, TokenBucket
+from .response import Response
+from .retry import RetryPolicy
+from .single_flight import SingleFlight
+from .transport import Transport
@@ -0,0 +1,243 @@
+# coding=utf-8
+import asyncio
+import datetime
+import logging
+import time
+
+from requests.exceptions import ConnectionError, ConnectTimeout, ReadTimeout
+
+from fortnox.exceptions import ObjectNotFound
+from .events import RETRY, START, THROTTLE, Event, endpoint_template
+from .request import Request
+from .response import Response
+from .retry import RetryPolicy
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTransport:
+    """
+    asyncio counterpart of Transport, backed by a pooled keep-alive aiohttp session. aiohttp is an optional
+    dependency, install it with the "async" extra.
+
+    Network errors are raised as the matching requests exceptions so retry policies and callers see the same
+    errors whichever transport is used.
+    """
+    def __init__(self, limit=100, limit_per_host=0, keepalive_timeout=15.0, connect_timeout=5.0,
+                 read_timeout=30.0):
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for async support, install Fortnox-Python[async]")
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._session = None
+        self._loop = None
+
+    def _create_session(self):
+        connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host,
+                                         keepalive_timeout=self.keepalive_timeout)
+        timeout = aiohttp.ClientTimeout(sock_connect=self.connect_timeout, sock_read=self.read_timeout)
+        return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+    @property
+    def session(self):
+        # A session is bound to the event loop it was created in, so a new loop gets a new session.
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._discard_session()
+            self._session = self._create_session()
+            self._loop = loop
+        return self._session
+
+    def _discard_session(self):
+        # Closes the session of the previous loop, e.g. the one of an earlier asyncio.run(), which can no longer be
+        # awaited from here. Its pooled connections are dropped without a graceful shutdown.
+        session, loop = self._session, self._loop
+        self._session = self._loop = None
+        if session is None or session.closed:
+            return
+        if loop is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+            return
+        connector = session.connector
+        session.detach()
+        if connector is not None:
+            connector._close()
+
+    async def request(self, method, url, **kwargs):
+        started = time.perf_counter()
+        try:
+            async with self.session.request(method, url, **kwargs) as response:
+                body = await response.read()
+                return Response(response.status, response.headers, body, str(response.url), response.reason,
+                                datetime.timedelta(seconds=time.perf_counter() - started))
+        # Timeouts are matched first, aiohttp.ServerTimeoutError is also a ClientConnectionError.
+        except aiohttp.ConnectionTimeoutError as e:
+            raise ConnectTimeout(e)
+        except (aiohttp.ServerTimeoutError, asyncio.TimeoutError) as e:
+            raise ReadTimeout(e)
+        except aiohttp.ClientConnectionError as e:
+            raise ConnectionError(e)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+            self._loop = None
+
+
+class AsyncRequest:
+    """
+    Async mirror of Request. Server url, headers, rate limiter and retry policies are taken from `request`, so the
+    sync and async APIs share one request budget per access token.
+    """
+    request = Request
+    _transport = None
+
+    @classmethod
+    def transport(cls):
+        if cls._transport is None:
+            cls._transport = AsyncTransport()
+        return cls._transport
+
+    @classmethod
+    def configure_transport(cls, **kwargs):
+        cls._transport = AsyncTransport(**kwargs)
+
+    @classmethod
+    async def cached_get(cls, url, params=None, ttl=None):
+        cache = cls.request.cache
+        url = cls.request._absolute_url(url)
+        if cache is None or ttl is None:
+            return (await cls.get(url, params)).json()
+
+        key = cls.request._cache_key(url, params)
+        content = await cls._call_cache(cache.get, key)
+        if content is None:
+            content = (await cls.get(url, params)).json()
+            await cls._call_cache(cache.set, key, content, ttl)
+        return content
+
+    @classmethod
+    async def update_cache(cls, prefix, url=None, content=None, ttl=None):
+        """
+        Async counterpart of Request.update_cache.
+        """
+        if cls.request.cache is not None:
+            await cls._call_cache(cls.request.update_cache, prefix, url, content, ttl)
+
+    @classmethod
+    async def _call_cache(cls, function, *args):
+        # Blocking caches, e.g. SqliteCache, are called from an executor to keep disk I/O off the event loop.
+        if not getattr(cls.request.cache, 'blocking', True):
+            return function(*args)
+        return await asyncio.get_running_loop().run_in_executor(None, function, *args)
+
+    @classmethod
+    async def _send(cls, method, url, headers=None, **kwargs):
+        started = time.perf_counter()
+        request = cls.request
+        headers = dict(request._headers(), **headers) if headers else request._headers()
+        policy = request.retry_policies.get(method) or RetryPolicy.never()
+        endpoint = endpoint_template(url) if request.hooks else None
+        if endpoint is not None:
+            request._emit(Event(START, method, url, endpoint))
+        network = waiting = 0.0
+        attempt = 0
+        response = None
+
+        try:
+            while True:
+                attempt += 1
+                wait = request.rate_limiter.reserve(request._rate_limit_key())
+                if wait:
+                    await asyncio.sleep(wait)
+                    waiting += wait
+                    if endpoint is not None:
+                        request._emit(Event(THROTTLE, method, url, endpoint, wait=wait, attempt=attempt))
+                sent = time.perf_counter()
+                try:
+                    response = await cls.transport().request(method, url, headers=headers, **kwargs)
+                    response.codec = request.codec
+                except Exception as e:
+                    network += time.perf_counter() - sent
+                    if not policy.should_retry_exception(e):
+                        raise
+                    delay = policy.delay(attempt, time.perf_counter() - started)
+                    if delay is None:
+                        raise
+                    logger.warning("%s %s failed with %r, retrying in %.2fs", method, url, e, delay)
+                    if endpoint is not None:
+                        request._emit(Event(RETRY, method, url, endpoint, wait=delay, attempt=attempt, error=e))
+                else:
+                    network += time.perf_counter() - sent
+                    logger.debug("%s %s returned %s: %s", method, url, response.status_code, response.body)
+                    if policy.should_retry_status(response.status_code):
+                        delay = policy.delay(attempt, time.perf_counter() - started, response)
+                    else:
+                        delay = None
+                    if delay is None:
+                        request._finish(method, url, endpoint, started, attempt, network, waiting, response, None)
+                        return response
+                    logger.warning("%s %s returned %s, retrying in %.2fs", method, url, response.status_code,
+                                   delay)
+                    if endpoint is not None:
+                        request._emit(Event(RETRY, method, url, endpoint, status_code=response.status_code,
+                                            bytes=len(response.body or b''), wait=delay, attempt=attempt))
+
+                await asyncio.sleep(delay)
+                waiting += delay
+        except Exception as e:
+            request._finish(method, url, endpoint, started, attempt, network, waiting, response, e)
+            raise
+
+    @classmethod
+    async def delete(cls, url):
+        logger.info("DELETE: %s", url)
+        response = await cls._send('DELETE', cls.request._absolute_url(url))
+        response.raise_for_status()
+        return response
+
+    @classmethod
+    async def get(cls, url, params=None):
+        logger.info("GET: url: %s, params: %s", url, params)
+        url = cls.request._absolute_url(url)
+        validators = cls.request.validators
+        if validators is None:
+            response = await cls._send('GET', url, params=params or {})
+        else:
+            key = cls.request._cache_key(url, params)
+            stored, headers = validators.prepare(key)
+            response = validators.complete(key, stored, await cls._send('GET', url, headers=headers,
+                                                                        params=params or {}))
+        if response.status_code == 404:
+            raise ObjectNotFound
+        else:
+            response.raise_for_status()
+        return response
+
+    @classmethod
+    async def post(cls, url, data):
+        logger.info("POST: url: %s, data: %s", url, data)
+        response = await cls._send('POST', cls.request._absolute_url(url), data=cls.request.codec.dumps(data))
+        if response.status_code == 400:
+            logger.error("POST: url: %s rejected: %s", url, response.body)
+        response.raise_for_status()
+        return response
+
+    @classmethod
+    async def put(cls, url, data):
+        logger.info("PUT: url: %s, data: %s", url, data)
+        response = await cls._send('PUT', cls.request._absolute_url(url), data=cls.request.codec.dumps(data))
+        if response.status_code == 404:
+            raise ObjectNotFound
+        else:
+            response.raise_for_status()
+        return response
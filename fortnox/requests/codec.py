@@ -0,0 +1,80 @@
+# coding=utf-8
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+class JsonCodec:
+    """
+    Encodes request bodies to and decodes response bodies from bytes. This one uses the standard library and is
+    always available; the others wrap faster libraries when they are installed. See default_codec.
+    """
+    name = 'json'
+
+    @staticmethod
+    def loads(body):
+        # json.loads detects the encoding of bytes itself, no need to decode to str first.
+        return json.loads(body)
+
+    @staticmethod
+    def dumps(content):
+        return json.dumps(content, separators=(',', ':')).encode('utf-8')
+
+
+class UjsonCodec(JsonCodec):
+    name = 'ujson'
+
+    @staticmethod
+    def loads(body):
+        return ujson.loads(body)
+
+    @staticmethod
+    def dumps(content):
+        return ujson.dumps(content, ensure_ascii=False).encode('utf-8')
+
+
+class OrjsonCodec(JsonCodec):
+    name = 'orjson'
+
+    @staticmethod
+    def loads(body):
+        return orjson.loads(body)
+
+    @staticmethod
+    def dumps(content):
+        return orjson.dumps(content)
+
+
+CODECS = {
+    'orjson': OrjsonCodec if orjson is not None else None,
+    'ujson': UjsonCodec if ujson is not None else None,
+    'json': JsonCodec
+}
+
+
+def get_codec(name):
+    """
+    Returns the codec called name, raising ImportError when the library behind it is not installed.
+    """
+    if name not in CODECS:
+        raise ValueError("Unknown JSON codec: %s" % name)
+    if CODECS[name] is None:
+        raise ImportError("%s is not installed" % name)
+    return CODECS[name]
+
+
+def default_codec():
+    """
+    The fastest codec available: orjson, then ujson, then the standard library.
+    """
+    for name in ('orjson', 'ujson', 'json'):
+        if CODECS[name] is not None:
+            return CODECS[name]
@@ -0,0 +1,66 @@
+# coding=utf-8
+import threading
+
+from fortnox.cache import MemoryCache
+
+
+class ValidatorStore:
+    """
+    Remembers the ETag and Last-Modified validators of GET responses, together with the response itself, keyed by
+    url and params. Later GETs for the same key are sent with If-None-Match/If-Modified-Since and a 304 Not Modified
+    is answered with the stored response, so an unchanged resource costs a round trip but no download or decode.
+
+    Counters: `misses` are GETs sent without validators, `revalidations` conditional GETs sent, and `hits` the
+    revalidations the server answered with 304.
+    """
+    def __init__(self, maxsize=256):
+        self._responses = MemoryCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+
+    def prepare(self, key):
+        """
+        Returns the stored response for key, if any, and the conditional headers to send with the request.
+        """
+        stored = self._responses.get(key)
+        headers = {}
+        if stored is not None:
+            if stored.headers.get('ETag'):
+                headers['If-None-Match'] = stored.headers['ETag']
+            if stored.headers.get('Last-Modified'):
+                headers['If-Modified-Since'] = stored.headers['Last-Modified']
+
+        with self._lock:
+            if headers:
+                self.revalidations += 1
+            else:
+                self.misses += 1
+        return stored, headers
+
+    def complete(self, key, stored, response):
+        """
+        Returns the response to hand to the caller: the stored one on 304, otherwise the new response, which is
+        remembered when it carries validators.
+        """
+        if response.status_code == 304 and stored is not None:
+            with self._lock:
+                self.hits += 1
+            return stored
+
+        if response.status_code == 200 and (response.headers.get('ETag') or response.headers.get('Last-Modified')):
+            self._responses.set(key, response)
+        elif stored is not None:
+            self._responses.delete(key)
+        return response
+
+    def clear(self):
+        self._responses.clear()
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'revalidations': self.revalidations,
+            'misses': self.misses
+        }
@@ -0,0 +1,66 @@
+# coding=utf-8
+import re
+from urllib.parse import urlsplit
+
+START = 'start'
+END = 'end'
+RETRY = 'retry'
+THROTTLE = 'throttle'
+DECODE = 'decode'
+
+# Path segments kept as they are when building an endpoint template, anything else is an id.
+_literal = re.compile(r'^[a-z]+$')
+_templates = {}
+
+
+def endpoint_template(url):
+    """
+    Returns the endpoint of url with ids replaced by placeholders, e.g. "/vouchers/{id}/{id}" for
+    "https://api.fortnox.se/3/vouchers/A/12?financialyear=1", so that calls can be grouped per endpoint.
+    """
+    path = urlsplit(url).path
+    template = _templates.get(path)
+    if template is None:
+        segments = path.split('/')
+        # Drop the api version, "/3" in "/3/vouchers".
+        if len(segments) > 2 and segments[1].isdigit():
+            segments = segments[:1] + segments[2:]
+        template = '/'.join(segment if index < 2 or _literal.match(segment) else '{id}'
+                            for index, segment in enumerate(segments))
+        if len(_templates) < 10000:
+            _templates[path] = template
+    return template
+
+
+class Event:
+    """
+    Passed to the hooks registered with Request.add_hook.
+
+    `kind` is one of:
+        start     before the first attempt of a call
+        retry     after a failed attempt, before backing off for `wait` seconds
+        throttle  after the rate limiter held the call back for `wait` seconds
+        end       after the call, successful or not; `latency` covers all attempts and `wait` all waiting
+        decode    when the response body is first decoded, which happens after the call ended
+
+    Fields that do not apply to an event are None.
+    """
+    __slots__ = ('kind', 'method', 'url', 'endpoint', 'status_code', 'bytes', 'latency', 'decode_time', 'wait',
+                 'attempt', 'error')
+
+    def __init__(self, kind, method, url, endpoint, status_code=None, bytes=None, latency=None, decode_time=None,
+                 wait=None, attempt=None, error=None):
+        self.kind = kind
+        self.method = method
+        self.url = url
+        self.endpoint = endpoint
+        self.status_code = status_code
+        self.bytes = bytes
+        self.latency = latency
+        self.decode_time = decode_time
+        self.wait = wait
+        self.attempt = attempt
+        self.error = error
+
+    def __repr__(self):
+        return "<Event: %s %s %s>" % (self.kind, self.method, self.endpoint)
@@ -0,0 +1,151 @@
+# coding=utf-8
+import bisect
+import threading
+
+from .events import DECODE, END, RETRY, THROTTLE
+
+# Upper bounds in seconds, roughly doubling from 1ms to 30s.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """
+    Fixed bucket histogram. Counts are kept per bucket, not cumulative; the last count is for values above the
+    highest bound.
+    """
+    __slots__ = ('bounds', 'counts', 'count', 'sum')
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """
+        Estimated as the upper bound of the bucket holding the q-th value, None when nothing was observed.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'buckets': dict(zip([str(bound) for bound in self.bounds] + ['+Inf'], self.counts)),
+            'p50': self.quantile(0.5),
+            'p99': self.quantile(0.99)
+        }
+
+
+class EndpointMetrics:
+    __slots__ = ('latency', 'decode', 'wait', 'statuses', 'bytes', 'errors', 'retries', 'throttles')
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.decode = Histogram()
+        self.wait = Histogram()
+        self.statuses = {}
+        self.bytes = 0
+        self.errors = 0
+        self.retries = 0
+        self.throttles = 0
+
+    def to_dict(self):
+        return {
+            'latency': self.latency.to_dict(),
+            'decode': self.decode.to_dict(),
+            'wait': self.wait.to_dict(),
+            'statuses': dict((str(status), count) for status, count in self.statuses.items()),
+            'bytes': self.bytes,
+            'errors': self.errors,
+            'retries': self.retries,
+            'throttles': self.throttles
+        }
+
+
+class MetricsCollector:
+    """
+    In-process metrics, registered as a hook with Request.add_hook(collector). Keeps latency, decode time and
+    rate limiter wait histograms per method and endpoint template, along with status counts, bytes received,
+    errors, retries and throttles. Recording an event is a dict lookup and a few additions under a lock.
+
+    snapshot() returns everything as plain dicts, e.g. to dump as JSON; to_prometheus() renders the Prometheus text
+    format for scraping.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def __call__(self, event):
+        key = (event.method, event.endpoint)
+        with self._lock:
+            metrics = self._endpoints.get(key)
+            if metrics is None:
+                metrics = self._endpoints[key] = EndpointMetrics()
+
+            if event.kind == END:
+                metrics.latency.observe(event.latency)
+                metrics.wait.observe(event.wait)
+                if event.error is not None:
+                    metrics.errors += 1
+                else:
+                    metrics.statuses[event.status_code] = metrics.statuses.get(event.status_code, 0) + 1
+                    metrics.bytes += event.bytes
+            elif event.kind == DECODE:
+                metrics.decode.observe(event.decode_time)
+            elif event.kind == RETRY:
+                metrics.retries += 1
+            elif event.kind == THROTTLE:
+                metrics.throttles += 1
+
+    def reset(self):
+        with self._lock:
+            self._endpoints = {}
+
+    def snapshot(self):
+        with self._lock:
+            return dict(("%s %s" % key, metrics.to_dict()) for key, metrics in sorted(self._endpoints.items()))
+
+    def to_prometheus(self, prefix='fortnox'):
+        lines = []
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+            for name, attribute in (('request_duration_seconds', 'latency'), ('decode_duration_seconds', 'decode'),
+                                    ('rate_limit_wait_seconds', 'wait')):
+                metric = "%s_%s" % (prefix, name)
+                lines.append("# TYPE %s histogram" % metric)
+                for (method, endpoint), metrics in endpoints:
+                    histogram = getattr(metrics, attribute)
+                    labels = 'method="%s",endpoint="%s"' % (method, endpoint)
+                    cumulative = 0
+                    for bound, count in zip(histogram.bounds + ('+Inf',), histogram.counts):
+                        cumulative += count
+                        lines.append('%s_bucket{%s,le="%s"} %s' % (metric, labels, bound, cumulative))
+                    lines.append("%s_sum{%s} %s" % (metric, labels, histogram.sum))
+                    lines.append("%s_count{%s} %s" % (metric, labels, histogram.count))
+
+            lines.append("# TYPE %s_responses_total counter" % prefix)
+            for (method, endpoint), metrics in endpoints:
+                for status, count in sorted(metrics.statuses.items()):
+                    lines.append('%s_responses_total{method="%s",endpoint="%s",status="%s"} %s' %
+                                 (prefix, method, endpoint, status, count))
+            for name, attribute in (('response_bytes_total', 'bytes'), ('errors_total', 'errors'),
+                                    ('retries_total', 'retries'), ('throttles_total', 'throttles')):
+                lines.append("# TYPE %s_%s counter" % (prefix, name))
+                for (method, endpoint), metrics in endpoints:
+                    lines.append('%s_%s{method="%s",endpoint="%s"} %s' %
+                                 (prefix, name, method, endpoint, getattr(metrics, attribute)))
+        return "\n".join(lines) + "\n"
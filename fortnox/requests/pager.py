@@ -0,0 +1,154 @@
+# coding=utf-8
+import asyncio
+import collections
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+from fortnox.cache import cache_key
+from .async_request import AsyncRequest
+from .request import Request
+
+
+class Pager:
+    """
+    Walks a paginated list endpoint. The first page is fetched on its own to learn @TotalPages, the remaining pages
+    are then fetched concurrently by a bounded pool of workers and returned in page order.
+
+    An explicit 'page' or 'limit' in params restricts the result to the first response, as the list methods always
+    have.
+    """
+    max_workers = 4
+
+    def __init__(self, url, collection_key, params=None, max_workers=None, request=Request, cache_ttl=None):
+        self.url = url
+        self.collection_key = collection_key
+        self.params = dict(params or {})
+        self.max_workers = max_workers or self.max_workers
+        self.request = request
+        self.cache_ttl = cache_ttl
+
+    @property
+    def single_page(self):
+        return 'page' in self.params or 'limit' in self.params
+
+    def fetch(self, page=None):
+        params = dict(self.params)
+        if page is not None:
+            params['page'] = page
+        return self.request.cached_get(self.url, params, self.cache_ttl)
+
+    @staticmethod
+    def page_range(content):
+        meta = content.get('MetaInformation')
+        if not meta:
+            return range(0)
+        return range(int(meta['@CurrentPage']) + 1, int(meta['@TotalPages']) + 1)
+
+    def pages(self):
+        first = self.fetch()
+        if self.single_page:
+            return [first]
+
+        remaining = self.page_range(first)
+        if len(remaining) == 0:
+            return [first]
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(remaining))) as executor:
+            return [first] + list(executor.map(self.fetch, remaining))
+
+    def items(self):
+        return [item for page in self.pages() for item in page[self.collection_key]]
+
+    @property
+    def checkpoint_key(self):
+        # Kept relative to the server_url, so checkpoints are the same whichever form of the url the pager got.
+        url = self.url
+        if url.startswith(self.request.server_url):
+            url = url[len(self.request.server_url):]
+        return "GET %s" % cache_key(url, self.params)
+
+    def iter_pages(self, prefetch=1, start=None, checkpoint=None):
+        """
+        Yields pages one at a time while the next `prefetch` pages are fetched in the background, so at most
+        prefetch + 1 pages are held in memory regardless of the size of the result. With start the walk begins at
+        that page instead of the first, e.g. to resume an interrupted export.
+
+        With a fortnox.checkpoint.Checkpoint a page is recorded as done once the caller asks for the page after it,
+        and the walk begins after the last page recorded by an earlier, interrupted walk over the same url and params.
+        The progress is discarded when the last page is done.
+        """
+        if checkpoint is None or self.single_page:
+            return self._iter_pages(prefetch, start)
+        return self._checkpointed_pages(prefetch, checkpoint)
+
+    def _iter_pages(self, prefetch, start):
+        content = self.fetch(start)
+        remaining = range(0) if self.single_page else self.page_range(content)
+        if len(remaining) == 0:
+            yield content
+            return
+
+        pages = iter(remaining)
+        with ThreadPoolExecutor(max_workers=prefetch) as executor:
+            pending = collections.deque(executor.submit(self.fetch, page) for page in itertools.islice(pages, prefetch))
+            while pending:
+                yield content
+                content = pending.popleft().result()
+                for page in itertools.islice(pages, 1):
+                    pending.append(executor.submit(self.fetch, page))
+            yield content
+
+    def _checkpointed_pages(self, prefetch, checkpoint):
+        key = self.checkpoint_key
+        last_page = checkpoint.last_page(key)
+        for content in self._iter_pages(prefetch, last_page + 1 if last_page else None):
+            yield content
+            meta = content.get('MetaInformation') or {}
+            checkpoint.complete_page(key, int(meta.get('@CurrentPage', 1)), int(meta.get('@TotalPages', 1)))
+        checkpoint.discard(key)
+
+    def iter_items(self, checkpoint=None):
+        for page in self.iter_pages(checkpoint=checkpoint):
+            for item in page[self.collection_key]:
+                yield item
+
+
+class AsyncPager:
+    """
+    asyncio version of Pager. Remaining pages are requested concurrently, at most max_workers at a time.
+    """
+    max_workers = Pager.max_workers
+
+    def __init__(self, url, collection_key, params=None, max_workers=None, request=AsyncRequest, cache_ttl=None):
+        self.url = url
+        self.collection_key = collection_key
+        self.params = dict(params or {})
+        self.max_workers = max_workers or self.max_workers
+        self.request = request
+        self.cache_ttl = cache_ttl
+
+    @property
+    def single_page(self):
+        return 'page' in self.params or 'limit' in self.params
+
+    async def fetch(self, page=None):
+        params = dict(self.params)
+        if page is not None:
+            params['page'] = page
+        return await self.request.cached_get(self.url, params, self.cache_ttl)
+
+    async def pages(self):
+        first = await self.fetch()
+        if self.single_page:
+            return [first]
+
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def fetch(page):
+            async with semaphore:
+                return await self.fetch(page)
+
+        return [first] + list(await asyncio.gather(*[fetch(page) for page in Pager.page_range(first)]))
+
+    async def items(self):
+        return [item for page in await self.pages() for item in page[self.collection_key]]
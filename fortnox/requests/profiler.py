@@ -0,0 +1,63 @@
+# coding=utf-8
+import threading
+
+
+class CallProfile:
+    """
+    Timings of one call made through Request, in seconds. `network` is the time spent inside the transport,
+    `waiting` the time spent waiting on the rate limiter and between retries, and `overhead` what is left: the work
+    done by this library around the call.
+    """
+    __slots__ = ('method', 'url', 'status_code', 'attempts', 'total', 'network', 'waiting')
+
+    def __init__(self, method, url, status_code, attempts, total, network, waiting):
+        self.method = method
+        self.url = url
+        self.status_code = status_code
+        self.attempts = attempts
+        self.total = total
+        self.network = network
+        self.waiting = waiting
+
+    @property
+    def overhead(self):
+        return self.total - self.network - self.waiting
+
+    def __repr__(self):
+        return "<CallProfile: %s %s overhead %.6fs network %.6fs>" % (self.method, self.url, self.overhead,
+                                                                      self.network)
+
+
+class Profiler:
+    """
+    Profiling hook for Request.configure_profiler. Sums the CallProfile of every call and passes each one on to
+    `callback`, if given.
+    """
+    def __init__(self, callback=None):
+        self.callback = callback
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.total = 0.0
+        self.network = 0.0
+        self.waiting = 0.0
+
+    def __call__(self, profile):
+        with self._lock:
+            self.calls += 1
+            self.total += profile.total
+            self.network += profile.network
+            self.waiting += profile.waiting
+        if self.callback is not None:
+            self.callback(profile)
+
+    def stats(self):
+        with self._lock:
+            overhead = self.total - self.network - self.waiting
+            return {
+                'calls': self.calls,
+                'total': self.total,
+                'network': self.network,
+                'waiting': self.waiting,
+                'overhead': overhead,
+                'overhead_per_call': overhead / self.calls if self.calls else 0.0
+            }
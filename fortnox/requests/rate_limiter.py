@@ -0,0 +1,87 @@
+# coding=utf-8
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread safe token bucket. Up to `burst` calls may be made at once, after which tokens are refilled at `rate`
+    per second. A caller that finds the bucket empty reserves its token and sleeps outside the lock until the
+    token is due, so waiting threads are released in the order they arrived.
+    """
+    def __init__(self, rate, burst, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.waits = 0
+        self.wait_time = 0.0
+
+    def reserve(self, tokens=1):
+        """
+        Takes tokens from the bucket and returns the number of seconds the caller has to wait before using them.
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.acquired += tokens
+            if wait:
+                self.waits += 1
+                self.wait_time += wait
+        return wait
+
+    def acquire(self, tokens=1):
+        wait = self.reserve(tokens)
+        if wait:
+            self._sleep(wait)
+        return wait
+
+    def metrics(self):
+        return {
+            'acquired': self.acquired,
+            'waits': self.waits,
+            'wait_time': self.wait_time
+        }
+
+
+class RateLimiter:
+    """
+    Keeps one TokenBucket per key, normally a digest of the access token (see fortnox.cache.token_digest), so that
+    every thread using the same token shares the same budget. The defaults follow the Fortnox limit of 25 requests
+    per 5 seconds per access token.
+    """
+    def __init__(self, rate=5.0, burst=25, enabled=True):
+        self.rate = rate
+        self.burst = burst
+        self.enabled = enabled
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, key):
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    bucket = self._buckets[key] = TokenBucket(self.rate, self.burst)
+        return bucket
+
+    def reserve(self, key):
+        if not self.enabled:
+            return 0.0
+        return self.bucket(key).reserve()
+
+    def acquire(self, key):
+        if not self.enabled:
+            return 0.0
+        return self.bucket(key).acquire()
+
+    def metrics(self):
+        return dict((key, bucket.metrics()) for key, bucket in self._buckets.items())
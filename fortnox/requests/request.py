@@ -1,34 +1,294 @@
 import logging
-import requests
+import time
+import weakref
 
+from fortnox.cache import scoped_cache_key, token_digest
 from fortnox.config import fortnox_config as cfg
 from fortnox.exceptions import ObjectNotFound
+from .codec import default_codec, get_codec
+from .conditional import ValidatorStore
+from .events import DECODE, END, RETRY, START, THROTTLE, Event, endpoint_template
+from .profiler import CallProfile
+from .rate_limiter import RateLimiter
+from .retry import RetryPolicy
+from .single_flight import SingleFlight
+from .transport import Transport
 
 logger = logging.getLogger(__name__)
 
 
-class Request:
+class RequestType(type):
+    """
+    Rebuilds the absolute urls of the object classes bound to Request classes (see DefaultObject) when a
+    server_url is changed, so objects never have to build them per call.
+    """
+    def __setattr__(cls, name, value):
+        super().__setattr__(name, value)
+        if name == 'server_url':
+            for object_class in list(Request.object_classes):
+                object_class.prepare_urls()
+
+
+class Request(metaclass=RequestType):
     server_url = "https://api.fortnox.se/3"
+    # Object classes with absolute urls prepared from the server_url of their request.
+    object_classes = weakref.WeakSet()
+    config = cfg
+    transport = Transport()
+    rate_limiter = RateLimiter()
+    retry_policies = {
+        'GET': RetryPolicy(),
+        'PUT': RetryPolicy(),
+        'DELETE': RetryPolicy(),
+        'POST': RetryPolicy.unsafe()
+    }
+    cache = None
+    validators = None
+    single_flight = SingleFlight()
+    profiler = None
+    hooks = ()
+    codec = default_codec()
 
     @classmethod
-    def delete(cls, url):
-        logging.info("DELETE: %s" % url)
+    def configure_transport(cls, **kwargs):
+        """
+        Replaces the transport with one built from the given options, e.g. pool_maxsize or read_timeout. Connections
+        held by the previous transport are closed.
+        """
+        cls.transport.close()
+        cls.transport = Transport(**kwargs)
+
+    @classmethod
+    def configure_rate_limit(cls, rate=5.0, burst=25, enabled=True):
+        cls.rate_limiter = RateLimiter(rate=rate, burst=burst, enabled=enabled)
+
+    @classmethod
+    def configure_retries(cls, method, policy):
+        """
+        Sets the RetryPolicy used for the given HTTP method, or disables retries for it when policy is None.
+        """
+        cls.retry_policies = dict(cls.retry_policies)
+        cls.retry_policies[method.upper()] = policy or RetryPolicy.never()
+
+    @classmethod
+    def configure_cache(cls, cache):
+        """
+        Sets the cache backend (e.g. fortnox.cache.MemoryCache or SqliteCache) used by cached_get, or disables caching
+        when cache is None.
+        """
+        cls.cache = cache
+
+    @classmethod
+    def configure_conditional_requests(cls, enabled=True, maxsize=256):
+        """
+        Enables ETag/Last-Modified revalidation of GETs, remembering up to maxsize responses. Counters are available
+        from Request.validators.stats().
+        """
+        cls.validators = ValidatorStore(maxsize=maxsize) if enabled else None
+
+    @classmethod
+    def configure_single_flight(cls, enabled=True):
+        """
+        When enabled, concurrent identical GETs (same url, params and access token) share one request and its
+        decoded response. Counters are available from Request.single_flight.stats().
+        """
+        cls.single_flight = SingleFlight() if enabled else None
+
+    @classmethod
+    def configure_profiler(cls, profiler):
+        """
+        Sets a callable, e.g. a fortnox.requests.Profiler, that receives a CallProfile after every call, separating
+        client side overhead from network time. None disables profiling.
+        """
+        cls.profiler = profiler
+
+    @classmethod
+    def configure_codec(cls, codec):
+        """
+        Sets the JSON codec used for request and response bodies, by name ("orjson", "ujson" or "json") or as a codec
+        class from fortnox.requests.codec. The fastest installed one is used by default.
+        """
+        cls.codec = get_codec(codec) if isinstance(codec, str) else codec
+
+    @classmethod
+    def add_hook(cls, hook):
+        """
+        Registers a callable that receives a fortnox.requests.events.Event when a call starts, is retried, is held back
+        by the rate limiter and ends, and when its response is decoded. Hooks run on the calling thread, so they
+        should be quick; exceptions raised by a hook are logged and otherwise ignored.
+        """
+        cls.hooks = cls.hooks + (hook,)
+
+    @classmethod
+    def remove_hook(cls, hook):
+        cls.hooks = tuple(registered for registered in cls.hooks if registered is not hook)
+
+    @classmethod
+    def _emit(cls, event):
+        for hook in cls.hooks:
+            try:
+                hook(event)
+            except Exception:
+                logger.exception("Hook %r failed on %r", hook, event)
+
+    @classmethod
+    def _finish(cls, method, url, endpoint, started, attempt, network, waiting, response, error):
+        total = time.perf_counter() - started
+        status_code = response.status_code if error is None else None
+        if cls.profiler is not None:
+            profile = CallProfile(method, url, status_code, attempt, total, network, waiting)
+            try:
+                cls.profiler(profile)
+            except Exception:
+                # Like hooks, a failing profiler must never fail a call that succeeded, e.g. a POST that was applied.
+                logger.exception("Profiler %r failed on %r", cls.profiler, profile)
+        if endpoint is not None:
+            size = len(response.body or b'') if error is None else None
+            cls._emit(Event(END, method, url, endpoint, status_code=status_code, bytes=size, latency=total,
+                            wait=waiting, attempt=attempt, error=error))
+            if error is None:
+                response.on_decode = lambda response, seconds: cls._emit(
+                    Event(DECODE, method, url, endpoint, status_code=response.status_code, bytes=size,
+                          decode_time=seconds))
+
+    @classmethod
+    def cached_get(cls, url, params=None, ttl=None):
+        """
+        Returns the decoded content of a GET. When a cache is configured and ttl is given the content is served from
+        and stored in the cache for ttl seconds.
+        """
+        url = cls._absolute_url(url)
+        if cls.cache is None or ttl is None:
+            return cls.get(url, params or {}).json()
+
+        key = cls._cache_key(url, params)
+        content = cls.cache.get(key)
+        if content is None:
+            content = cls.get(url, params or {}).json()
+            cls.cache.set(key, content, ttl)
+        return content
+
+    @classmethod
+    def update_cache(cls, prefix, url=None, content=None, ttl=None):
+        """
+        Drops the cached entries of the resource at prefix and everything below it, then stores content as the
+        cached value of url.
+        Called after writes so that cached lists never outlive a change to one of their items.
+        """
+        if cls.cache is None:
+            return
+        cls.cache.invalidate(cls._cache_key(cls._absolute_url(prefix)))
+        if url is not None and ttl is not None:
+            cls.cache.set(cls._cache_key(cls._absolute_url(url)), content, ttl)
+
+    @classmethod
+    def _absolute_url(cls, url):
+        # Urls relative to server_url are accepted by the public methods and made absolute once on the way in,
+        # everything below them only handles absolute urls. The object classes always pass absolute urls.
         if url.startswith("http"):
-            response = requests.delete(url, headers=cfg.to_dict())
-        else:
-            response = requests.delete("%s%s" % (cls.server_url, url), headers=cfg.to_dict())
-        logging.info(response.json())
+            return url
+        return cls.server_url + url
+
+    @classmethod
+    def _cache_key(cls, url, params=None):
+        # Scoped to the server and access token, so companies sharing a cache backend never see each other's data.
+        return scoped_cache_key(cls._access_token(), url, params)
+
+    @classmethod
+    def _headers(cls):
+        return cls.config.headers()
+
+    @classmethod
+    def _access_token(cls):
+        return cls.config.access_token
+
+    @classmethod
+    def _rate_limit_key(cls):
+        # One budget per access token, keyed by its digest so rate limiter metrics never expose the token.
+        return token_digest(cls.config.access_token)
+
+    @classmethod
+    def _send(cls, method, url, headers=None, **kwargs):
+        started = time.perf_counter()
+        headers = dict(cls._headers(), **headers) if headers else cls._headers()
+        policy = cls.retry_policies.get(method) or RetryPolicy.never()
+        # Events are only built when someone listens, keeping the hot path free of them otherwise.
+        endpoint = endpoint_template(url) if cls.hooks else None
+        if endpoint is not None:
+            cls._emit(Event(START, method, url, endpoint))
+        network = waiting = 0.0
+        attempt = 0
+        response = None
+
+        try:
+            while True:
+                attempt += 1
+                mark = time.perf_counter()
+                wait = cls.rate_limiter.acquire(cls._rate_limit_key())
+                sent = time.perf_counter()
+                waiting += sent - mark
+                if wait and endpoint is not None:
+                    cls._emit(Event(THROTTLE, method, url, endpoint, wait=wait, attempt=attempt))
+                try:
+                    response = cls.transport.request(method, url, headers=headers, **kwargs)
+                    response.codec = cls.codec
+                except Exception as e:
+                    network += time.perf_counter() - sent
+                    if not policy.should_retry_exception(e):
+                        raise
+                    delay = policy.delay(attempt, time.perf_counter() - started)
+                    if delay is None:
+                        raise
+                    logger.warning("%s %s failed with %r, retrying in %.2fs", method, url, e, delay)
+                    if endpoint is not None:
+                        cls._emit(Event(RETRY, method, url, endpoint, wait=delay, attempt=attempt, error=e))
+                else:
+                    network += time.perf_counter() - sent
+                    logger.debug("%s %s returned %s: %s", method, url, response.status_code, response.body)
+                    if policy.should_retry_status(response.status_code):
+                        delay = policy.delay(attempt, time.perf_counter() - started, response)
+                    else:
+                        delay = None
+                    if delay is None:
+                        cls._finish(method, url, endpoint, started, attempt, network, waiting, response, None)
+                        return response
+                    logger.warning("%s %s returned %s, retrying in %.2fs", method, url, response.status_code,
+                                   delay)
+                    if endpoint is not None:
+                        cls._emit(Event(RETRY, method, url, endpoint, status_code=response.status_code,
+                                        bytes=len(response.body or b''), wait=delay, attempt=attempt))
+
+                mark = time.perf_counter()
+                policy.sleep(delay)
+                waiting += time.perf_counter() - mark
+        except Exception as e:
+            cls._finish(method, url, endpoint, started, attempt, network, waiting, response, e)
+            raise
+
+    @classmethod
+    def delete(cls, url):
+        logger.info("DELETE: %s", url)
+        response = cls._send('DELETE', cls._absolute_url(url))
         response.raise_for_status()
         return response
 
     @classmethod
     def get(cls, url, params = {}):
-        logging.info("GET: url: %s, params: %s" % (url, params))
-        if url.startswith("http"):
-            response = requests.get(url, params, headers=cfg.to_dict())
+        logger.info("GET: url: %s, params: %s", url, params)
+        url = cls._absolute_url(url)
+        if cls.single_flight is None:
+            return cls._get(url, params)
+        key = cls._cache_key(url, params)
+        return cls.single_flight.do(key, lambda: cls._get(url, params))
+
+    @classmethod
+    def _get(cls, url, params):
+        if cls.validators is None:
+            response = cls._send('GET', url, params=params)
         else:
-            response = requests.get("%s%s" % (cls.server_url, url), params, headers=cfg.to_dict())
-        logging.info(response.json())
+            key = cls._cache_key(url, params)
+            stored, headers = cls.validators.prepare(key)
+            response = cls.validators.complete(key, stored, cls._send('GET', url, headers=headers, params=params))
         if response.status_code == 404:
             raise ObjectNotFound
         else:
@@ -37,25 +297,17 @@ class Request:
 
     @classmethod
     def post(cls, url, data):
-        logging.info("POST: url: %s, data: %s" % (url, data))
-        if url.startswith("http"):
-            response = requests.post(url, headers=cfg.to_dict(), json=data)
-        else:
-            response = requests.post("%s%s" % (cls.server_url, url), headers=cfg.to_dict(), json=data)
-        logging.info(response.json())
+        logger.info("POST: url: %s, data: %s", url, data)
+        response = cls._send('POST', cls._absolute_url(url), data=cls.codec.dumps(data))
         if response.status_code == 400:
-            print(response.json())
+            logger.error("POST: url: %s rejected: %s", url, response.body)
         response.raise_for_status()
         return response
 
     @classmethod
     def put(cls, url, data):
-        logging.info("PUT: url: %s, data: %s" % (url, data))
-        if url.startswith("http"):
-            response = requests.put(url, headers=cfg.to_dict(), json=data)
-        else:
-            response = requests.put("%s%s" % (cls.server_url, url), headers=cfg.to_dict(), json=data)
-            logging.info(response.json())
+        logger.info("PUT: url: %s, data: %s", url, data)
+        response = cls._send('PUT', cls._absolute_url(url), data=cls.codec.dumps(data))
         if response.status_code == 404:
             raise ObjectNotFound
         else:
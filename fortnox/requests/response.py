@@ -0,0 +1,92 @@
+# coding=utf-8
+import threading
+import time
+
+from requests.exceptions import HTTPError
+
+from .codec import default_codec
+
+
+class Response:
+    """
+    Transport independent response. The raw body is kept as bytes and decoded at most once, the first time json()
+    is called, so callers can share the parsed content without paying for it again.
+
+    It has the parts of the requests.Response interface callers use: status_code, headers, url, reason, ok, content,
+    text, encoding, elapsed, request, json() and raise_for_status(). request is None for responses of the async
+    transport, which has no requests.PreparedRequest.
+
+    Bodies are decoded by `codec`, which Request sets to its own codec. `on_decode`, when set, is called with the
+    response and the seconds spent once the body has been decoded.
+    """
+    _unset = object()
+    codec = default_codec()
+
+    def __init__(self, status_code, headers, body, url=None, reason=None, elapsed=None, request=None):
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body
+        self.url = url
+        self.reason = reason
+        self.elapsed = elapsed
+        self.request = request
+        self._encoding = None
+        self._json = self._unset
+        self._decode_lock = threading.Lock()
+        self.on_decode = None
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    def __bool__(self):
+        return self.ok
+
+    @property
+    def content(self):
+        return self.body
+
+    @property
+    def encoding(self):
+        """
+        The charset of the Content-Type header, or utf-8, the encoding of JSON, when there is none. May be set to
+        decode text differently, as with requests.
+        """
+        if self._encoding is None:
+            content_type = self.headers.get('Content-Type') or ''
+            for parameter in content_type.split(';')[1:]:
+                name, _, value = parameter.strip().partition('=')
+                if name.lower() == 'charset' and value:
+                    return value.strip('"\'')
+            return 'utf-8'
+        return self._encoding
+
+    @encoding.setter
+    def encoding(self, encoding):
+        self._encoding = encoding
+
+    @property
+    def text(self):
+        return self.body.decode(self.encoding, errors='replace') if self.body else ''
+
+    def json(self):
+        if self._json is self._unset:
+            # Single flight hands one response to several threads, the body is still decoded only once.
+            with self._decode_lock:
+                if self._json is self._unset:
+                    self._decode()
+        return self._json
+
+    def _decode(self):
+        if self.on_decode is None:
+            self._json = self.codec.loads(self.body) if self.body else None
+        else:
+            started = time.perf_counter()
+            self._json = self.codec.loads(self.body) if self.body else None
+            self.on_decode(self, time.perf_counter() - started)
+
+    def raise_for_status(self):
+        if 400 <= self.status_code < 600:
+            kind = "Client" if self.status_code < 500 else "Server"
+            raise HTTPError("%s %s Error: %s for url: %s" % (self.status_code, kind, self.reason, self.url),
+                            response=self)
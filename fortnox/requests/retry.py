@@ -0,0 +1,76 @@
+# coding=utf-8
+import email.utils
+import random
+import time
+
+from requests.exceptions import ConnectionError, ConnectTimeout, Timeout
+
+
+class RetryPolicy:
+    """
+    Decides whether a failed call should be tried again and how long to wait first. Waits grow exponentially with
+    full jitter, a Retry-After header from the server takes precedence, and no retry is scheduled once it would
+    exceed max_attempts or max_total_time seconds since the first attempt.
+    """
+    def __init__(self, max_attempts=5, backoff_factor=0.5, max_backoff=30.0, max_total_time=120.0,
+                 retry_statuses=(429, 500, 502, 503, 504), retry_exceptions=(ConnectionError, Timeout),
+                 respect_retry_after=True, sleep=time.sleep):
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_total_time = max_total_time
+        self.retry_statuses = tuple(retry_statuses)
+        self.retry_exceptions = tuple(retry_exceptions)
+        self.respect_retry_after = respect_retry_after
+        self.sleep = sleep
+
+    @classmethod
+    def never(cls):
+        return cls(max_attempts=1, retry_statuses=(), retry_exceptions=())
+
+    @classmethod
+    def unsafe(cls, **kwargs):
+        """
+        Policy for calls that are not idempotent, such as POST. It only retries when the server cannot have acted on
+        the request: a 429 rejection or a connection that was never established.
+        """
+        kwargs.setdefault('retry_statuses', (429,))
+        kwargs.setdefault('retry_exceptions', (ConnectTimeout,))
+        return cls(**kwargs)
+
+    def should_retry_status(self, status_code):
+        return status_code in self.retry_statuses
+
+    def should_retry_exception(self, exception):
+        return isinstance(exception, self.retry_exceptions)
+
+    def backoff(self, attempt):
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * (2 ** (attempt - 1))))
+
+    @staticmethod
+    def retry_after(response):
+        value = response.headers.get('Retry-After') if response is not None else None
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            parsed = email.utils.parsedate_tz(value)
+            if parsed is None:
+                return None
+            return max(0.0, email.utils.mktime_tz(parsed) - time.time())
+
+    def delay(self, attempt, elapsed, response=None):
+        """
+        Returns the number of seconds to wait before the next attempt, or None when the call should not be retried.
+        """
+        if attempt >= self.max_attempts:
+            return None
+
+        delay = self.retry_after(response) if self.respect_retry_after else None
+        if delay is None:
+            delay = self.backoff(attempt)
+
+        if elapsed + delay > self.max_total_time:
+            return None
+        return delay
@@ -0,0 +1,69 @@
+# coding=utf-8
+import copy
+import threading
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def _copy(error):
+    try:
+        return copy.copy(error)
+    except Exception:
+        return error
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one: the first caller runs the function while later callers
+    wait for it and receive the same result. When the call fails every caller gets its own copy of the exception,
+    so callers that annotate it (e.g. set its message) do not affect each other. Calls are only shared while in
+    flight, nothing is cached afterwards.
+
+    `executed` counts calls that ran the function, `coalesced` calls that were served from another caller's call.
+    """
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key, function):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise _copy(call.error) from call.error
+            return call.result
+
+        try:
+            call.result = function()
+            return call.result
+        except BaseException as e:
+            # Copied before the leader's callers get to change it, waiters copy this pristine one again.
+            call.error = _copy(e)
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self):
+        return {
+            'executed': self.executed,
+            'coalesced': self.coalesced
+        }
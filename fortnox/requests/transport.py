@@ -0,0 +1,56 @@
+# coding=utf-8
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .response import Response
+
+
+class Transport:
+    """
+    Owns the HTTP session used to talk to the Fortnox API. Connections are pooled and kept alive between calls so
+    that only the first request to a host pays for the TCP and TLS handshakes.
+    """
+    def __init__(self, pool_connections=10, pool_maxsize=10, keep_alive=True, connect_timeout=5.0,
+                 read_timeout=30.0):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive = keep_alive
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def timeout(self):
+        return self.connect_timeout, self.read_timeout
+
+    @property
+    def session(self):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        response = self.session.request(method, url, **kwargs)
+        return Response(response.status_code, response.headers, response.content, response.url, response.reason,
+                        response.elapsed, response.request)
+
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
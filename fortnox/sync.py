@@ -0,0 +1,103 @@
+# coding=utf-8
+import datetime
+import json
+import os
+
+from fortnox.files import atomic_write_json
+from fortnox.objects import Voucher
+
+
+class SyncCursor:
+    """
+    Sync state persisted as JSON at `path`. For every financial year it holds the time of the last successful sync
+    and the highest voucher number seen per voucher series.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.state = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.state = json.load(f)
+
+    def _year(self, financial_year):
+        return self.state.setdefault(str(financial_year), {'last_modified': None, 'series': {}})
+
+    def last_modified(self, financial_year):
+        return self._year(financial_year)['last_modified']
+
+    def high_water_marks(self, financial_year):
+        return self._year(financial_year)['series']
+
+    def advance(self, financial_year, last_modified, high_water_marks):
+        year = self._year(financial_year)
+        year['last_modified'] = last_modified
+        for series, number in high_water_marks.items():
+            year['series'][series] = max(number, year['series'].get(series, 0))
+
+    def save(self):
+        atomic_write_json(self.path, self.state)
+
+
+class SyncResult:
+    """
+    Vouchers returned by one sync run. `new` holds vouchers numbered above the series' high water mark, `changed`
+    vouchers that were seen before and have been modified since.
+    """
+    def __init__(self, financial_year, new, changed, last_modified):
+        self.financial_year = financial_year
+        self.new = new
+        self.changed = changed
+        self.last_modified = last_modified
+
+    def __len__(self):
+        return len(self.new) + len(self.changed)
+
+    def __repr__(self):
+        return "<SyncResult: %s new, %s changed>" % (len(self.new), len(self.changed))
+
+
+class VoucherSync:
+    """
+    Incremental voucher sync for one financial year. Each run asks the API only for vouchers modified since the
+    previous run (the "lastmodified" filter) and advances the cursor once they have all been received, so an
+    interrupted run is simply repeated.
+
+    Pass a client's Voucher class, e.g. client.Voucher, as voucher_class to sync another company.
+
+    The next run starts `overlap` before this run started to absorb clock differences with the API. Vouchers
+    modified inside that window can therefore be reported as changed twice.
+    """
+    timestamp_format = "%Y-%m-%d %H:%M"
+
+    def __init__(self, cursor, financial_year, overlap=datetime.timedelta(minutes=5), clock=datetime.datetime.now,
+                 voucher_class=Voucher):
+        self.cursor = cursor if isinstance(cursor, SyncCursor) else SyncCursor(cursor)
+        self.financial_year = financial_year
+        self.overlap = overlap
+        self.clock = clock
+        self.voucher_class = voucher_class
+
+    def vouchers(self, last_modified):
+        params = {'lastmodified': last_modified} if last_modified else {}
+        return self.voucher_class.iter(financial_year=self.financial_year, params=params)
+
+    def run(self):
+        started = self.clock()
+        high_water_marks = dict(self.cursor.high_water_marks(self.financial_year))
+        seen = {}
+        new = []
+        changed = []
+
+        for voucher in self.vouchers(self.cursor.last_modified(self.financial_year)):
+            series = voucher.voucher_series
+            number = voucher.voucher_number or 0
+            if number > high_water_marks.get(series, 0):
+                new.append(voucher)
+            else:
+                changed.append(voucher)
+            seen[series] = max(number, seen.get(series, 0))
+
+        last_modified = (started - self.overlap).strftime(self.timestamp_format)
+        self.cursor.advance(self.financial_year, last_modified, seen)
+        self.cursor.save()
+        return SyncResult(self.financial_year, new, changed, last_modified)
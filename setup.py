@@ -22,17 +22,23 @@ setup(
         'Intended Audience :: Developers',
         'Topic :: Software Development :: Integration',
         'License :: OSI Approved :: MIT License',
-        'Programming Language :: Python :: 2',
-        'Programming Language :: Python :: 2.6',
-        'Programming Language :: Python :: 2.7',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.3',
-        'Programming Language :: Python :: 3.4',
-        'Programming Language :: Python :: 3.5',
+        'Programming Language :: Python :: 3.8',
+        'Programming Language :: Python :: 3.9',
+        'Programming Language :: Python :: 3.10',
+        'Programming Language :: Python :: 3.11',
     ],
     keywords='fortnox integration api',
-    packages=find_packages(exclude=['contrib', 'docs', 'tests']),
+    packages=find_packages(exclude=['contrib', 'docs', 'tests', 'benchmarks']),
+    python_requires='>=3.8',
     install_requires=['requests'],
+    extras_require={
+        'async': ['aiohttp>=3.10'],
+        'fast': ['orjson'],
+    },
+    entry_points={
+        'console_scripts': ['fortnox = fortnox.cli:main'],
+    },
     test_suite="tests",
-    tests_require=['responses']
+    tests_require=['responses', 'aiohttp>=3.10']
 )
\ No newline at end of file
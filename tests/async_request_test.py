@@ -0,0 +1,203 @@
+# coding=utf-8
+import asyncio
+import datetime
+import os
+import tempfile
+import threading
+import unittest
+from fortnox.cache import MemoryCache, SqliteCache
+from fortnox.config import fortnox_config
+from fortnox.exceptions import ObjectNotFound
+from fortnox.objects import FinancialYear, Voucher, VoucherRow
+from fortnox.requests import AsyncRequest, AsyncTransport, Request, RetryPolicy
+from requests.exceptions import ReadTimeout
+
+try:
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+except ImportError:
+    web = None
+
+
+def financial_year(id):
+    return {
+        "@url": "https://api.fortnox.se/3/financialyears/%s" % id,
+        "Id": id,
+        "FromDate": "%s-01-01" % (2000 + id),
+        "ToDate": "%s-12-31" % (2000 + id),
+        "AccountingMethod": "ACCRUAL"
+    }
+
+
+@unittest.skipIf(web is None, "aiohttp is not installed")
+class AsyncRequestTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        fortnox_config.access_token = 'access-token'
+        fortnox_config.client_secret = 'client-secret'
+        self.requests = []
+        self.failures = 0
+
+        app = web.Application()
+        app.router.add_get('/3/financialyears', self.financial_years)
+        app.router.add_get('/3/financialyears/{id}', self.financial_year)
+        app.router.add_post('/3/vouchers', self.create_voucher)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+        self.server_url = Request.server_url
+        Request.server_url = str(self.server.make_url('/3'))
+        self.retry_policy = Request.retry_policies['GET']
+        Request.configure_retries('GET', RetryPolicy(backoff_factor=0.0))
+
+    async def asyncTearDown(self):
+        Request.server_url = self.server_url
+        Request.configure_retries('GET', self.retry_policy)
+        await AsyncRequest.transport().close()
+        await self.server.close()
+
+    async def financial_years(self, request):
+        self.requests.append(request)
+        page = int(request.query.get('page', 1))
+        return web.json_response({
+            "MetaInformation": {"@TotalResources": 3, "@TotalPages": 3, "@CurrentPage": page},
+            "FinancialYears": [financial_year(page)]
+        })
+
+    async def financial_year(self, request):
+        self.requests.append(request)
+        id = int(request.match_info['id'])
+        if id == 7 and self.failures < 2:
+            self.failures += 1
+            return web.json_response({}, status=503)
+        if id > 10:
+            return web.json_response({}, status=404)
+        return web.json_response({"FinancialYear": financial_year(id)})
+
+    async def create_voucher(self, request):
+        self.requests.append(request)
+        voucher = (await request.json())['Voucher']
+        voucher['VoucherNumber'] = 1
+        voucher['Year'] = 1
+        return web.json_response({"Voucher": voucher}, status=201)
+
+    async def test_aget(self):
+        financial_year = await FinancialYear.aget(1)
+        self.assertEqual(1, financial_year.id)
+        self.assertEqual("2001-01-01", financial_year.from_date.strftime("%Y-%m-%d"))
+        self.assertEqual("access-token", self.requests[0].headers['Access-Token'])
+        self.assertEqual("client-secret", self.requests[0].headers['Client-Secret'])
+
+    async def test_aget_not_found(self):
+        with self.assertRaises(ObjectNotFound):
+            await FinancialYear.aget(11)
+
+    async def test_aget_retries(self):
+        financial_year = await FinancialYear.aget(7)
+        self.assertEqual(7, financial_year.id)
+        self.assertEqual(3, len(self.requests))
+
+    async def test_alist(self):
+        financial_years = await FinancialYear.alist()
+        self.assertEqual([1, 2, 3], [financial_year.id for financial_year in financial_years])
+        self.assertEqual(3, len(self.requests))
+
+    async def test_acreate(self):
+        voucher = Voucher()
+        voucher.description = "Test"
+        voucher.voucher_series = "A"
+        voucher.transaction_date = datetime.datetime(2016, 1, 1)
+        row = VoucherRow()
+        row.account = 1930
+        row.debit = 100
+        voucher.voucher_rows = [row]
+
+        await voucher.acreate()
+        self.assertEqual(1, voucher.voucher_number)
+        self.assertEqual(1930, voucher.voucher_rows[0].account)
+        self.assertEqual(datetime.datetime(2016, 1, 1), voucher.transaction_date)
+
+    async def test_sqlite_cache_is_called_off_the_loop(self):
+        threads = []
+
+        class RecordingCache(SqliteCache):
+            def get(self, key):
+                threads.append(threading.current_thread())
+                return super().get(key)
+
+        directory = tempfile.mkdtemp()
+        cache = RecordingCache(os.path.join(directory, 'cache.sqlite'))
+        Request.configure_cache(cache)
+        try:
+            self.assertEqual(1, (await FinancialYear.aget(1)).id)
+            self.assertEqual(1, (await FinancialYear.aget(1)).id)
+        finally:
+            Request.configure_cache(None)
+            cache.close()
+        self.assertEqual(1, len(self.requests))
+        self.assertNotIn(threading.current_thread(), threads)
+
+    async def test_memory_cache_is_called_on_the_loop(self):
+        threads = []
+
+        class RecordingCache(MemoryCache):
+            def get(self, key):
+                threads.append(threading.current_thread())
+                return super().get(key)
+
+        Request.configure_cache(RecordingCache())
+        try:
+            await AsyncRequest.cached_get('/financialyears/1', ttl=60)
+        finally:
+            Request.configure_cache(None)
+        self.assertEqual([threading.current_thread()], threads)
+
+
+@unittest.skipIf(web is None, "aiohttp is not installed")
+class AsyncTransportTest(unittest.TestCase):
+    def test_session_of_previous_loop_is_closed(self):
+        transport = AsyncTransport()
+        sessions = []
+
+        async def get():
+            app = web.Application()
+            app.router.add_get('/', self.ok)
+            server = TestServer(app)
+            await server.start_server()
+            try:
+                response = await transport.request('GET', str(server.make_url('/')))
+            finally:
+                await server.close()
+            sessions.append(transport._session)
+            return response.status_code
+
+        self.assertEqual(200, asyncio.run(get()))
+        self.assertEqual(200, asyncio.run(get()))
+        self.assertIsNot(sessions[0], sessions[1])
+        self.assertTrue(sessions[0].closed)
+        asyncio.run(transport.close())
+        self.assertTrue(sessions[1].closed)
+
+    @staticmethod
+    async def ok(request):
+        return web.json_response({})
+
+    def test_read_timeout(self):
+        transport = AsyncTransport(read_timeout=0.05)
+
+        async def slow(request):
+            await asyncio.sleep(1)
+            return web.json_response({})
+
+        async def get():
+            app = web.Application()
+            app.router.add_get('/', slow)
+            server = TestServer(app)
+            await server.start_server()
+            try:
+                await transport.request('GET', str(server.make_url('/')))
+            finally:
+                await transport.close()
+                await server.close()
+
+        with self.assertRaises(ReadTimeout):
+            asyncio.run(get())
@@ -0,0 +1,102 @@
+# coding=utf-8
+import datetime
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import responses
+from fortnox.checkpoint import Checkpoint
+from fortnox.config import fortnox_config
+from fortnox.objects import Voucher, VoucherRow
+from fortnox.requests import Request
+
+
+def voucher(number):
+    voucher = Voucher()
+    voucher.description = "Voucher %s" % number
+    voucher.voucher_series = "A"
+    voucher.transaction_date = datetime.datetime(2016, 1, number % 28 + 1)
+    row = VoucherRow()
+    row.account = 1930
+    row.debit = number
+    voucher.voucher_rows = [row]
+    return voucher
+
+
+def create_callback(request):
+    content = json.loads(request.body)['Voucher']
+    if content['Description'] == "Voucher 3":
+        return 400, {}, json.dumps({"ErrorInformation": {"message": "Invalid"}})
+    content['VoucherNumber'] = int(content['Description'].split()[1])
+    return 201, {}, json.dumps({"Voucher": content})
+
+
+class BulkCreateTest(unittest.TestCase):
+    def setUp(self):
+        fortnox_config.access_token = 'access-token'
+        fortnox_config.client_secret = 'client-secret'
+        Request.configure_rate_limit(enabled=False)
+
+    def tearDown(self):
+        Request.configure_rate_limit()
+
+    def test_ordered(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(responses.POST, 'https://api.fortnox.se/3/vouchers', callback=create_callback,
+                              content_type='application/json')
+
+            results = list(Voucher.bulk_create((voucher(number) for number in range(20)), concurrency=4))
+
+            self.assertEqual(list(range(20)), [result.index for result in results])
+            self.assertEqual(20, len(rsps.calls))
+
+            failed = [result for result in results if not result.ok]
+            self.assertEqual([3], [result.index for result in failed])
+            self.assertEqual("Voucher 3", failed[0].item.description)
+
+            for result in results:
+                if result.ok:
+                    self.assertEqual(result.index, result.item.voucher_number)
+
+    def test_unordered(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(responses.POST, 'https://api.fortnox.se/3/vouchers', callback=create_callback,
+                              content_type='application/json')
+
+            results = list(Voucher.bulk_create((voucher(number) for number in range(20)), concurrency=4,
+                                               ordered=False))
+
+            self.assertEqual(list(range(20)), sorted(result.index for result in results))
+            self.assertEqual(19, len([result for result in results if result.ok]))
+
+    def test_checkpoint_skips_created_items(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'checkpoint.json')
+
+        def key(item):
+            return item.description
+
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(responses.POST, 'https://api.fortnox.se/3/vouchers', callback=create_callback,
+                              content_type='application/json')
+            results = list(Voucher.bulk_create((voucher(number) for number in range(6)), concurrency=2,
+                                               checkpoint=Checkpoint(path), idempotency_key=key))
+            self.assertEqual(6, len(rsps.calls))
+            self.assertEqual([3], [result.index for result in results if not result.ok])
+
+            results = list(Voucher.bulk_create((voucher(number) for number in range(6)), concurrency=2,
+                                               checkpoint=Checkpoint(path), idempotency_key=key))
+            # Only the voucher that failed is posted again.
+            self.assertEqual(7, len(rsps.calls))
+            self.assertEqual([0, 1, 2, 4, 5], [result.index for result in results if result.skipped])
+            self.assertEqual("Voucher 3", json.loads(rsps.calls[6].request.body)["Voucher"]["Description"])
+
+    def test_checkpoint_needs_idempotency_key(self):
+        with self.assertRaises(ValueError):
+            Voucher.bulk_create([voucher(1)], checkpoint=Checkpoint('unused.json'))
+
+    def test_concurrency_is_checked_on_call(self):
+        with self.assertRaises(ValueError):
+            Voucher.bulk_create([voucher(1)], concurrency=0)
@@ -0,0 +1,164 @@
+# coding=utf-8
+import os
+import shutil
+import tempfile
+import unittest
+import responses
+from fortnox import Client
+from fortnox.cache import FOREVER, MemoryCache, SqliteCache, cache_key
+from fortnox.config import fortnox_config
+from fortnox.objects import FinancialYear, Voucher, VoucherSeries
+from fortnox.requests import Request
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CacheBackendTests(object):
+    def test_get_and_set(self):
+        self.assertIsNone(self.cache.get('/financialyears/1'))
+        self.cache.set('/financialyears/1', {"FinancialYear": {"Id": 1}}, 60)
+        self.assertEqual({"FinancialYear": {"Id": 1}}, self.cache.get('/financialyears/1'))
+
+    def test_ttl(self):
+        self.cache.set('/financialyears/1', {"Id": 1}, 60)
+        self.cache.set('/vouchers/A/1', {"Id": 2}, FOREVER)
+        self.clock.now += 61
+        self.assertIsNone(self.cache.get('/financialyears/1'))
+        self.assertEqual({"Id": 2}, self.cache.get('/vouchers/A/1'))
+
+    def test_lru_eviction(self):
+        for key in ['a', 'b', 'c']:
+            self.clock.now += 1
+            self.cache.set(key, {"Key": key}, 60)
+        self.clock.now += 1
+        self.cache.get('a')
+        self.clock.now += 1
+        self.cache.set('d', {"Key": 'd'}, 60)
+
+        self.assertEqual(3, len(self.cache))
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual({"Key": 'a'}, self.cache.get('a'))
+
+    def test_invalidate(self):
+        for key in ['/voucherseries', '/voucherseries/A', '/voucherseries?page=2', '/vouchers/A/1']:
+            self.cache.set(key, {}, 60)
+        self.cache.invalidate('/voucherseries')
+        self.assertEqual(1, len(self.cache))
+
+        self.cache.invalidate('/vouchers')
+        self.assertEqual(0, len(self.cache))
+
+
+class MemoryCacheTest(CacheBackendTests, unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = MemoryCache(maxsize=3, clock=self.clock)
+
+
+class SqliteCacheTest(CacheBackendTests, unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.clock = FakeClock()
+        self.cache = SqliteCache(os.path.join(self.directory, 'cache.db'), maxsize=3, clock=self.clock)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.directory)
+
+
+class ObjectCacheTest(unittest.TestCase):
+    voucher_series = {"VoucherSeries": {"Code": "A", "Description": "Redovisning", "Manual": False}}
+
+    def setUp(self):
+        fortnox_config.access_token = 'access-token'
+        fortnox_config.client_secret = 'client-secret'
+        Request.configure_rate_limit(enabled=False)
+        Request.configure_cache(MemoryCache())
+
+    def tearDown(self):
+        Request.configure_rate_limit()
+        Request.configure_cache(None)
+
+    def test_cache_key(self):
+        self.assertEqual('/vouchers', cache_key('/vouchers', {}))
+        self.assertEqual('/vouchers?financialyear=1&page=2', cache_key('/vouchers', {'page': 2, 'financialyear': 1}))
+
+    def test_get_is_cached(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, 'https://api.fortnox.se/3/financialyears/1',
+                     json={"FinancialYear": {"Id": 1, "FromDate": "2016-01-01"}}, status=200)
+
+            self.assertEqual(1, FinancialYear.get(1).id)
+            self.assertEqual(1, FinancialYear.get(1).id)
+            self.assertEqual(1, len(rsps.calls))
+
+    def test_voucher_is_cached_forever(self):
+        url = 'https://api.fortnox.se/3/vouchers/A/1?financialyear=1'
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, url, json={"Voucher": {"VoucherNumber": 1, "VoucherRows": []}}, status=200)
+
+            Voucher.get(url)
+            Voucher.get(url)
+            self.assertEqual(1, len(rsps.calls))
+
+    def test_save_invalidates_list(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, 'https://api.fortnox.se/3/voucherseries',
+                     json={"VoucherSeriesCollection": [self.voucher_series["VoucherSeries"]]}, status=200)
+            rsps.add(responses.PUT, 'https://api.fortnox.se/3/voucherseries/A',
+                     json=self.voucher_series, status=200)
+
+            VoucherSeries.list()
+            VoucherSeries.list()
+            self.assertEqual(1, len(rsps.calls))
+
+            voucher_series = VoucherSeries(self.voucher_series["VoucherSeries"])
+            voucher_series.save()
+            self.assertEqual(2, len(rsps.calls))
+
+            VoucherSeries.get('A')
+            VoucherSeries.list()
+            self.assertEqual(3, len(rsps.calls))
+
+    def test_companies_do_not_share_entries(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, 'https://api.fortnox.se/3/financialyears/1',
+                     json={"FinancialYear": {"Id": 1, "FromDate": "2016-01-01"}}, status=200)
+            rsps.add(responses.GET, 'https://api.fortnox.se/3/financialyears/1',
+                     json={"FinancialYear": {"Id": 1, "FromDate": "2017-01-01"}}, status=200)
+
+            self.assertEqual(2016, FinancialYear.get(1).from_date.year)
+            fortnox_config.access_token = 'other-access-token'
+            self.assertEqual(2017, FinancialYear.get(1).from_date.year)
+            self.assertEqual(2, len(rsps.calls))
+
+    def test_clients_sharing_a_backend_do_not_share_entries(self):
+        cache = MemoryCache()
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, 'https://api.fortnox.se/3/financialyears/1',
+                     json={"FinancialYear": {"Id": 1}}, status=200)
+            rsps.add(responses.GET, 'https://other.example/3/financialyears/1',
+                     json={"FinancialYear": {"Id": 1}}, status=200)
+
+            Client('token-a', 'secret', cache=cache).FinancialYear.get(1)
+            Client('token-b', 'secret', cache=cache).FinancialYear.get(1)
+            Client('token-a', 'secret', server_url='https://other.example/3', cache=cache).FinancialYear.get(1)
+            Client('token-a', 'secret', cache=cache).FinancialYear.get(1)
+            self.assertEqual(3, len(rsps.calls))
+            self.assertFalse(any('token-a' in key for key in cache._entries))
+
+    def test_disabled_without_backend(self):
+        Request.configure_cache(None)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, 'https://api.fortnox.se/3/financialyears/1',
+                     json={"FinancialYear": {"Id": 1}}, status=200)
+
+            FinancialYear.get(1)
+            FinancialYear.get(1)
+            self.assertEqual(2, len(rsps.calls))
@@ -0,0 +1,71 @@
+# coding=utf-8
+import os
+import shutil
+import tempfile
+import unittest
+from fortnox.checkpoint import Checkpoint
+
+
+class CheckpointTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'checkpoint.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_pages_survive_a_restart(self):
+        checkpoint = Checkpoint(self.path)
+        self.assertIsNone(checkpoint.last_page('GET /vouchers'))
+        checkpoint.complete_page('GET /vouchers', 3, 10)
+
+        self.assertEqual(3, Checkpoint(self.path).last_page('GET /vouchers'))
+
+    def test_finished_read_starts_over(self):
+        checkpoint = Checkpoint(self.path)
+        checkpoint.complete_page('GET /vouchers', 10, 10)
+
+        self.assertIsNone(Checkpoint(self.path).last_page('GET /vouchers'))
+
+    def test_commits_are_journaled_until_saved(self):
+        checkpoint = Checkpoint(self.path)
+        checkpoint.commit('POST /vouchers', 'a')
+        checkpoint.commit('POST /vouchers', 'b')
+        self.assertFalse(os.path.exists(self.path))
+
+        restarted = Checkpoint(self.path)
+        self.assertTrue(restarted.is_committed('POST /vouchers', 'a'))
+        self.assertFalse(restarted.is_committed('POST /vouchers', 'c'))
+
+        checkpoint.save()
+        self.assertFalse(os.path.exists(checkpoint.journal))
+        self.assertEqual(frozenset(['a', 'b']), Checkpoint(self.path).committed('POST /vouchers'))
+
+    def test_torn_journal_line_is_ignored(self):
+        checkpoint = Checkpoint(self.path)
+        checkpoint.commit('POST /vouchers', 'a')
+        checkpoint.close()
+        with open(checkpoint.journal, 'a') as f:
+            f.write('["POST /vouch')
+
+        restarted = Checkpoint(self.path)
+        self.assertEqual(frozenset(['a']), restarted.committed('POST /vouchers'))
+        restarted.commit('POST /vouchers', 'c')
+        restarted.commit('POST /vouchers', 'd')
+        restarted.close()
+
+        self.assertEqual(frozenset(['a', 'c', 'd']), Checkpoint(self.path).committed('POST /vouchers'))
+
+    def test_discard_and_clear(self):
+        checkpoint = Checkpoint(self.path)
+        checkpoint.complete_page('GET /vouchers', 1, 2)
+        checkpoint.commit('POST /vouchers', 'a')
+        checkpoint.discard('GET /vouchers')
+
+        restarted = Checkpoint(self.path)
+        self.assertIsNone(restarted.last_page('GET /vouchers'))
+        self.assertTrue(restarted.is_committed('POST /vouchers', 'a'))
+
+        restarted.clear()
+        self.assertFalse(os.path.exists(self.path))
+        self.assertFalse(os.path.exists(restarted.journal))
@@ -0,0 +1,195 @@
+# coding=utf-8
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import unittest.mock
+import responses
+from responses import matchers
+from fortnox.checkpoint import Checkpoint
+from fortnox.cli import Summary, main
+from fortnox.formats import read_csv, vouchers_from_lines
+
+
+class CliTest(unittest.TestCase):
+    base = 'https://api.fortnox.se/3'
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.credentials = ['--access-token', 'token', '--client-secret', 'secret', '--rate', '1000']
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    @staticmethod
+    def page(key, items, page=1, pages=1):
+        return {"MetaInformation": {"@CurrentPage": page, "@TotalPages": pages, "@TotalResources": len(items)},
+                key: items}
+
+    @staticmethod
+    def voucher(number):
+        return {"VoucherSeries": "A", "VoucherNumber": number, "Year": 1, "TransactionDate": "2016-01-0%s" % number,
+                "Description": "Voucher %s" % number,
+                "VoucherRows": [{"Account": 1930, "Debit": 0, "Credit": 100.5, "Description": "Bank"},
+                                {"Account": 3001, "Debit": 100.5, "Credit": 0, "Description": "Sales"}]}
+
+    def add_voucher_pages(self, rsps, pages=(1, 2)):
+        for page in pages:
+            params = {'financialyear': '1', 'page': str(page)} if page > 1 else {'financialyear': '1'}
+            rsps.add(responses.GET, self.base + '/vouchers', json=self.page("Vouchers", [self.voucher(page)], page, 2),
+                     match=[matchers.query_param_matcher(params)])
+
+    def run_main(self, *argv):
+        with unittest.mock.patch('sys.stderr', io.StringIO()):
+            return main(self.credentials + list(argv))
+
+    def test_export_vouchers_ndjson(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, self.base + '/vouchers?financialyear=1',
+                     json=self.page("Vouchers", [self.voucher(1), self.voucher(2)]))
+            code = self.run_main('export', 'vouchers', '--financial-year', '1', '--output', self.path('out.ndjson'))
+
+        self.assertEqual(0, code)
+        with open(self.path('out.ndjson')) as f:
+            self.assertEqual([1, 2], [json.loads(line)["VoucherNumber"] for line in f])
+
+    def test_export_vouchers_csv_round_trips(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, self.base + '/vouchers?financialyear=1',
+                     json=self.page("Vouchers", [self.voucher(1), self.voucher(2)]))
+            self.run_main('export', 'vouchers', '--financial-year', '1', '--format', 'csv',
+                          '--output', self.path('out.csv'))
+
+        with open(self.path('out.csv'), newline='') as f:
+            vouchers = list(vouchers_from_lines(read_csv(f)))
+        self.assertEqual(2, len(vouchers))
+        self.assertEqual({"VoucherSeries": "A", "TransactionDate": "2016-01-01", "Description": "Voucher 1",
+                          "VoucherRows": [{"Account": 1930, "Debit": 0, "Credit": 100.5, "Description": "Bank"},
+                                          {"Account": 3001, "Debit": 100.5, "Credit": 0, "Description": "Sales"}]},
+                         vouchers[0])
+
+    def test_vouchers_of_different_years_are_not_merged(self):
+        lines = [{'Year': year, 'VoucherSeries': 'A', 'VoucherNumber': '1', 'TransactionDate': '2016-12-31',
+                  'Account': '1930', 'Debit': '100', 'Credit': ''} for year in ('1', '2')]
+
+        vouchers = list(vouchers_from_lines(lines))
+        self.assertEqual(2, len(vouchers))
+        self.assertEqual([1, 1], [len(voucher['VoucherRows']) for voucher in vouchers])
+
+    def test_export_vouchers_resumes_from_checkpoint(self):
+        checkpoint = self.path('checkpoint.json')
+        with responses.RequestsMock() as rsps:
+            self.add_voucher_pages(rsps)
+            self.run_main('export', 'vouchers', '--financial-year', '1', '--format', 'csv', '--concurrency', '1',
+                          '--output', self.path('out.csv'), '--checkpoint', checkpoint)
+        with open(self.path('out.csv'), 'rb') as f:
+            complete = f.read()
+
+        # Pretend the first run stopped after page 1, with a partly written page 2 in the file.
+        with open(self.path('out.csv'), 'rb') as f:
+            offset = len(b"".join(f.readlines()[:3]))
+        with open(self.path('out.csv'), 'r+b') as f:
+            f.truncate(offset + 10)
+        state = Checkpoint(checkpoint)
+        state.set('export vouchers', {'pages': {'1': 1}, 'offset': offset})
+        state.save()
+
+        with responses.RequestsMock() as rsps:
+            self.add_voucher_pages(rsps, pages=(2,))
+            self.run_main('export', 'vouchers', '--financial-year', '1', '--format', 'csv', '--concurrency', '1',
+                          '--output', self.path('out.csv'), '--checkpoint', checkpoint)
+            self.assertEqual(1, len(rsps.calls))
+
+        with open(self.path('out.csv'), 'rb') as f:
+            self.assertEqual(complete, f.read())
+        self.assertFalse(os.path.exists(checkpoint))
+
+    def test_export_financial_years_csv(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, self.base + '/financialyears',
+                     json=self.page("FinancialYears", [{"Id": 1, "FromDate": "2016-01-01", "ToDate": "2016-12-31",
+                                                        "AccountingMethod": "ACCRUAL",
+                                                        "AccountChartType": "Bas 2016"}]))
+            self.run_main('export', 'financial-years', '--format', 'csv', '--output', self.path('years.csv'))
+
+        with open(self.path('years.csv')) as f:
+            self.assertEqual(["Id,FromDate,ToDate,AccountingMethod,AccountChartType",
+                              "1,2016-01-01,2016-12-31,ACCRUAL,Bas 2016"], f.read().splitlines())
+
+    def test_import_vouchers_writes_rejects(self):
+        with open(self.path('in.ndjson'), 'w') as f:
+            for number in (1, 2, 3):
+                f.write(json.dumps(self.voucher(number)) + "\n")
+
+        def create(request):
+            voucher = json.loads(request.body)["Voucher"]
+            if voucher["Description"] == "Voucher 2":
+                return 400, {}, json.dumps({"ErrorInformation": {"message": "Unbalanced", "code": 2000}})
+            return 201, {}, json.dumps({"Voucher": dict(voucher, VoucherNumber=1)})
+
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(responses.POST, self.base + '/vouchers', callback=create)
+            code = self.run_main('import', 'vouchers', '--input', self.path('in.ndjson'), '--concurrency', '1',
+                                 '--rejects', self.path('rejects.ndjson'))
+
+        self.assertEqual(1, code)
+        with open(self.path('rejects.ndjson')) as f:
+            rejects = [json.loads(line) for line in f]
+        self.assertEqual(["Voucher 2"], [reject["Description"] for reject in rejects])
+        self.assertIn("Error", rejects[0])
+
+    def test_import_vouchers_resumes_from_checkpoint(self):
+        with open(self.path('in.ndjson'), 'w') as f:
+            for number in (1, 2, 3, 1):
+                f.write(json.dumps(self.voucher(number)) + "\n")
+        posted = []
+        failing = set(["Voucher 2"])
+
+        def create(request):
+            voucher = json.loads(request.body)["Voucher"]
+            posted.append(voucher["Description"])
+            if voucher["Description"] in failing:
+                failing.discard(voucher["Description"])
+                return 400, {}, json.dumps({"ErrorInformation": {"message": "Locked period", "code": 2000}})
+            return 201, {}, json.dumps({"Voucher": dict(voucher, VoucherNumber=len(posted))})
+
+        arguments = ('import', 'vouchers', '--input', self.path('in.ndjson'), '--concurrency', '1',
+                     '--checkpoint', self.path('checkpoint.json'))
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(responses.POST, self.base + '/vouchers', callback=create)
+            self.assertEqual(1, self.run_main(*arguments))
+            self.assertTrue(os.path.exists(self.path('checkpoint.json')))
+            del posted[:]
+
+            self.assertEqual(0, self.run_main(*arguments))
+
+        # Only the failed voucher is posted again, the identical first and last vouchers are both kept.
+        self.assertEqual(["Voucher 2"], posted)
+        self.assertFalse(os.path.exists(self.path('checkpoint.json')))
+
+    def test_credentials_are_required(self):
+        with unittest.mock.patch.dict(os.environ, clear=True), unittest.mock.patch('sys.stderr', io.StringIO()):
+            with self.assertRaises(SystemExit):
+                main(['export', 'financial-years'])
+
+    def test_concurrency_must_be_positive(self):
+        stderr = io.StringIO()
+        with unittest.mock.patch('sys.stderr', stderr):
+            with self.assertRaises(SystemExit) as raised:
+                main(self.credentials + ['import', 'vouchers', '--concurrency', '0'])
+        self.assertEqual(2, raised.exception.code)
+        self.assertIn("argument --concurrency: expected a whole number of at least 1, got '0'", stderr.getvalue())
+
+    def test_skipped_financial_years_are_reported_apart(self):
+        summary = Summary('exported', 'vouchers')
+        summary.count = 3
+        summary.skipped_years = 2
+        stream = io.StringIO()
+        summary.report(stream)
+
+        self.assertIn("exported 3 vouchers, 2 financial years skipped from checkpoint", stream.getvalue())
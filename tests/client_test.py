@@ -0,0 +1,98 @@
+# coding=utf-8
+import threading
+import unittest
+import responses
+from fortnox import Client
+from fortnox.config import fortnox_config
+from fortnox.objects import Voucher, VoucherSeries
+from fortnox.requests import Request
+
+
+class ClientTest(unittest.TestCase):
+    url = 'https://api.fortnox.se/3/voucherseries/A'
+
+    def setUp(self):
+        fortnox_config.access_token = 'global-token'
+        fortnox_config.client_secret = 'global-secret'
+
+    @staticmethod
+    def series(request):
+        return 200, {}, '{"VoucherSeries": {"Code": "A", "Description": "%s"}}' % request.headers['Access-Token']
+
+    def test_clients_send_their_own_credentials(self):
+        first = Client('first-token', 'first-secret')
+        second = Client('second-token', 'second-secret')
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(responses.GET, self.url, callback=self.series)
+
+            self.assertEqual('first-token', first.VoucherSeries.get('A').description)
+            self.assertEqual('second-token', second.VoucherSeries.get('A').description)
+            self.assertEqual('global-token', VoucherSeries.get('A').description)
+            self.assertEqual('second-secret', rsps.calls[1].request.headers['Client-Secret'])
+
+    def test_objects_are_bound_to_the_client(self):
+        client = Client('client-token', 'client-secret')
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(responses.GET, self.url, callback=self.series)
+            rsps.add(responses.PUT, self.url, json={"VoucherSeries": {"Code": "A", "Description": "Saved"}})
+
+            voucher_series = client.VoucherSeries.get('A')
+            self.assertIsInstance(voucher_series, VoucherSeries)
+            self.assertIs(client.request, voucher_series.request)
+            voucher_series.save()
+            self.assertEqual('client-token', rsps.calls[1].request.headers['Access-Token'])
+
+    def test_list_pages_through_the_client(self):
+        client = Client('client-token', 'client-secret', server_url='https://example.test/3')
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, 'https://example.test/3/vouchers',
+                     json={"MetaInformation": {"@CurrentPage": 1, "@TotalPages": 1}, "Vouchers": [{"VoucherNumber": 1}]})
+
+            vouchers = client.Voucher.list(financial_year=1)
+            self.assertEqual([1], [voucher.voucher_number for voucher in vouchers])
+            self.assertIsInstance(vouchers[0], client.Voucher)
+            self.assertEqual('client-token', rsps.calls[0].request.headers['Access-Token'])
+
+    def test_absolute_urls_follow_the_server_url(self):
+        client = Client('client-token', 'client-secret', server_url='https://example.test/3')
+        self.assertEqual('https://example.test/3/vouchers', client.Voucher.absolute_item_url)
+        self.assertEqual('https://api.fortnox.se/3/vouchers', Voucher.absolute_item_url)
+
+        client.request.server_url = 'https://moved.example.test/3'
+        try:
+            self.assertEqual('https://moved.example.test/3/voucherseries/%s',
+                             client.VoucherSeries.absolute_resource_url)
+            self.assertEqual('https://api.fortnox.se/3/voucherseries/%s', VoucherSeries.absolute_resource_url)
+        finally:
+            client.request.server_url = 'https://example.test/3'
+
+    def test_state_is_not_shared(self):
+        first = Client('first-token', 'first-secret')
+        second = Client('second-token', 'second-secret')
+        first.request.configure_rate_limit(rate=1.0)
+        first.request.configure_conditional_requests()
+
+        self.assertIsNot(first.request.transport, second.request.transport)
+        self.assertIsNot(first.request.transport, Request.transport)
+        self.assertIsNot(first.request.rate_limiter, second.request.rate_limiter)
+        self.assertIsNone(second.request.validators)
+        self.assertIsNone(Request.validators)
+        self.assertIs(Request, Voucher.request)
+
+    def test_concurrent_tenants(self):
+        clients = [Client('token-%s' % i, 'secret-%s' % i) for i in range(8)]
+        results = {}
+
+        def fetch(client):
+            results[client.config.access_token] = client.VoucherSeries.get('A').description
+
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(responses.GET, self.url, callback=self.series)
+            threads = [threading.Thread(target=fetch, args=(client,)) for client in clients]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(5)
+
+        self.assertEqual(dict((token, token) for token in results), results)
+        self.assertEqual(8, len(results))
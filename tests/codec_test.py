@@ -0,0 +1,60 @@
+# coding=utf-8
+import json
+import unittest
+import responses
+from fortnox.config import fortnox_config
+from fortnox.requests import Request, Response
+from fortnox.requests.codec import CODECS, JsonCodec, default_codec, get_codec
+
+
+class CodecTest(unittest.TestCase):
+    content = {"Voucher": {"Description": "Hyra åäö", "VoucherRows": [{"Account": 1930, "Debit": 125.5}]}}
+
+    def test_available_codecs_round_trip_bytes(self):
+        for codec in [codec for codec in CODECS.values() if codec is not None]:
+            body = codec.dumps(self.content)
+            self.assertIsInstance(body, bytes)
+            self.assertEqual(self.content, json.loads(body))
+            self.assertEqual(self.content, codec.loads(json.dumps(self.content).encode('utf-8')))
+
+    def test_default_prefers_fastest_installed(self):
+        installed = [name for name in ('orjson', 'ujson', 'json') if CODECS[name] is not None]
+        self.assertEqual(installed[0], default_codec().name)
+
+    def test_get_codec(self):
+        self.assertIs(JsonCodec, get_codec('json'))
+        self.assertRaises(ValueError, get_codec, 'yaml')
+
+    def test_response_uses_its_codec(self):
+        class CountingCodec(JsonCodec):
+            calls = 0
+
+            @classmethod
+            def loads(cls, body):
+                cls.calls += 1
+                return JsonCodec.loads(body)
+
+        response = Response(200, {}, b'{"Id": 1}')
+        response.codec = CountingCodec
+        self.assertEqual({"Id": 1}, response.json())
+        self.assertEqual(1, CountingCodec.calls)
+
+
+class RequestCodecTest(unittest.TestCase):
+    def setUp(self):
+        fortnox_config.access_token = 'access-token'
+        fortnox_config.client_secret = 'client-secret'
+
+    def tearDown(self):
+        Request.configure_codec(default_codec())
+
+    def test_configured_codec_encodes_bodies(self):
+        Request.configure_codec('json')
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.POST, 'https://api.fortnox.se/3/instance', json={"Id": 1}, status=201)
+            response = Request.post('/instance', {"Id": 1, "Name": "Test"})
+
+            self.assertEqual(b'{"Id":1,"Name":"Test"}', rsps.calls[0].request.body)
+            self.assertEqual("application/json", rsps.calls[0].request.headers['Content-Type'])
+            self.assertIs(JsonCodec, response.codec)
+            self.assertEqual({"Id": 1}, response.json())
@@ -0,0 +1,64 @@
+# coding=utf-8
+import datetime
+import unittest
+import responses
+from fortnox.config import fortnox_config
+from fortnox.objects import Voucher, VoucherRowColumns
+from fortnox.requests import Request
+
+
+def voucher(number, rows):
+    return {
+        "@url": "https://api.fortnox.se/3/vouchers/A/%s?financialyear=1" % number,
+        "TransactionDate": "2016-03-%02d" % number,
+        "VoucherNumber": number,
+        "VoucherRows": [
+            {"Account": account, "Debit": debit, "Credit": credit, "CostCenter": "", "Removed": removed}
+            for account, debit, credit, removed in rows
+        ],
+        "VoucherSeries": "A",
+        "Year": 1
+    }
+
+
+class VoucherRowColumnsTest(unittest.TestCase):
+    vouchers = [
+        voucher(1, [(1930, 100.0, 0, False), (3001, 0, 100.0, False)]),
+        voucher(2, [(1930, 50.0, 0, False), (3001, 0, 50.0, False), (1930, 10.0, 0, True)]),
+        voucher(3, [])
+    ]
+
+    def setUp(self):
+        fortnox_config.access_token = 'access-token'
+        fortnox_config.client_secret = 'client-secret'
+        Request.configure_rate_limit(enabled=False)
+
+    def tearDown(self):
+        Request.configure_rate_limit()
+
+    def test_extend(self):
+        columns = VoucherRowColumns().extend(self.vouchers)
+        self.assertEqual(5, len(columns))
+        self.assertEqual([1930, 3001, 1930, 3001, 1930], list(columns.account))
+        self.assertEqual([1, 1, 2, 2, 2], list(columns.voucher_number))
+        self.assertEqual(['A'] * 5, columns.voucher_series)
+        self.assertEqual([0, 0, 0, 0, 1], list(columns.removed))
+        self.assertEqual(datetime.datetime(2016, 3, 2), columns.date(2))
+        self.assertIs(columns.voucher_series[0], columns.voucher_series[4])
+
+    def test_balances_by_account(self):
+        columns = VoucherRowColumns().extend(self.vouchers)
+        self.assertEqual({1930: 150.0, 3001: -150.0}, columns.balances_by_account())
+        self.assertEqual({1930: 160.0, 3001: -150.0}, columns.balances_by_account(include_removed=True))
+
+    def test_list_columns(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, 'https://api.fortnox.se/3/vouchers',
+                     json={
+                         "MetaInformation": {"@TotalResources": 3, "@TotalPages": 1, "@CurrentPage": 1},
+                         "Vouchers": self.vouchers
+                     }, status=200)
+
+            columns = Voucher.list_columns(financial_year=1)
+            self.assertEqual(5, len(columns))
+            self.assertEqual("https://api.fortnox.se/3/vouchers?financialyear=1", rsps.calls[0].request.url)
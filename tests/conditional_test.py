@@ -0,0 +1,59 @@
+# coding=utf-8
+import unittest
+import responses
+from fortnox.config import fortnox_config
+from fortnox.objects import FinancialYear
+from fortnox.requests import Request
+
+
+class ConditionalRequestTest(unittest.TestCase):
+    url = 'https://api.fortnox.se/3/financialyears/1'
+    financial_year = {"FinancialYear": {"Id": 1, "FromDate": "2016-01-01", "ToDate": "2016-12-31"}}
+
+    def setUp(self):
+        fortnox_config.access_token = 'access-token'
+        fortnox_config.client_secret = 'client-secret'
+        Request.configure_rate_limit(enabled=False)
+        Request.configure_conditional_requests()
+
+    def tearDown(self):
+        Request.configure_rate_limit()
+        Request.configure_conditional_requests(enabled=False)
+
+    def test_not_modified_serves_stored_body(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, self.url, json=self.financial_year, status=200,
+                     headers={'ETag': '"v1"', 'Last-Modified': 'Fri, 01 Jan 2016 00:00:00 GMT'})
+            rsps.add(responses.GET, self.url, body=b'', status=304)
+
+            self.assertEqual(1, FinancialYear.get(1).id)
+            financial_year = FinancialYear.get(1)
+            self.assertEqual(1, financial_year.id)
+            self.assertEqual("2016-12-31", financial_year.to_date.strftime("%Y-%m-%d"))
+
+            self.assertNotIn('If-None-Match', rsps.calls[0].request.headers)
+            self.assertEqual('"v1"', rsps.calls[1].request.headers['If-None-Match'])
+            self.assertEqual('Fri, 01 Jan 2016 00:00:00 GMT', rsps.calls[1].request.headers['If-Modified-Since'])
+            self.assertEqual({'hits': 1, 'revalidations': 1, 'misses': 1}, Request.validators.stats())
+
+    def test_modified_replaces_stored_body(self):
+        changed = {"FinancialYear": {"Id": 1, "FromDate": "2016-01-01", "ToDate": "2017-06-30"}}
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, self.url, json=self.financial_year, status=200, headers={'ETag': '"v1"'})
+            rsps.add(responses.GET, self.url, json=changed, status=200, headers={'ETag': '"v2"'})
+            rsps.add(responses.GET, self.url, body=b'', status=304)
+
+            FinancialYear.get(1)
+            self.assertEqual("2017-06-30", FinancialYear.get(1).to_date.strftime("%Y-%m-%d"))
+            self.assertEqual("2017-06-30", FinancialYear.get(1).to_date.strftime("%Y-%m-%d"))
+            self.assertEqual('"v2"', rsps.calls[2].request.headers['If-None-Match'])
+            self.assertEqual({'hits': 1, 'revalidations': 2, 'misses': 1}, Request.validators.stats())
+
+    def test_params_are_part_of_the_key(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, 'https://api.fortnox.se/3/vouchers', json={}, status=200,
+                     headers={'ETag': '"v1"'})
+
+            Request.get('/vouchers', {'financialyear': 1})
+            Request.get('/vouchers', {'financialyear': 2})
+            self.assertNotIn('If-None-Match', rsps.calls[1].request.headers)
@@ -0,0 +1,40 @@
+# coding=utf-8
+import datetime
+import unittest
+from fortnox.objects import FinancialYear, Voucher
+from fortnox.objects.dates import format_date, parse_date
+from fortnox.objects.default_object import DefaultObject
+
+
+class DatesTest(unittest.TestCase):
+    def tearDown(self):
+        DefaultObject.lazy_dates = False
+
+    def test_parse_date(self):
+        self.assertEqual(datetime.datetime.strptime("2016-02-29", "%Y-%m-%d"), parse_date("2016-02-29"))
+        self.assertIsNone(parse_date(None))
+        self.assertIsNone(parse_date(""))
+
+    def test_format_date(self):
+        self.assertEqual("2016-02-09", format_date(datetime.datetime(2016, 2, 9, 12, 30)))
+        self.assertEqual("2016-02-09", format_date(datetime.date(2016, 2, 9)))
+        self.assertEqual("2016-02-09", format_date("2016-02-09"))
+        self.assertIsNone(format_date(None))
+
+    def test_eager_dates(self):
+        financial_year = FinancialYear({"FromDate": "2016-01-01", "ToDate": "2016-12-31"})
+        self.assertEqual(datetime.datetime(2016, 1, 1), financial_year._from_date)
+        self.assertEqual(datetime.datetime(2016, 12, 31), financial_year.to_date)
+
+    def test_lazy_dates(self):
+        DefaultObject.lazy_dates = True
+        voucher = Voucher({"TransactionDate": "2016-03-01", "VoucherRows": []})
+        self.assertEqual("2016-03-01", voucher._transaction_date)
+        self.assertEqual("2016-03-01", voucher.to_dict()['Voucher']['TransactionDate'])
+
+        self.assertEqual(datetime.datetime(2016, 3, 1), voucher.transaction_date)
+        self.assertEqual(datetime.datetime(2016, 3, 1), voucher._transaction_date)
+
+    def test_missing_dates(self):
+        self.assertIsNone(Voucher().transaction_date)
+        self.assertIsNone(FinancialYear({"FromDate": ""}).from_date)
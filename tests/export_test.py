@@ -0,0 +1,79 @@
+# coding=utf-8
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import responses
+from fortnox.export import Partition, RateLimitManager, SharedRateLimiter, export_vouchers
+
+
+class ExportTest(unittest.TestCase):
+    base = 'https://api.fortnox.se/3'
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    @staticmethod
+    def page(key, items):
+        return {"MetaInformation": {"@CurrentPage": 1, "@TotalPages": 1, "@TotalResources": len(items)}, key: items}
+
+    def test_export_per_year_and_series(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, self.base + '/financialyears',
+                     json=self.page("FinancialYears", [{"Id": 1}, {"Id": 2}]))
+            # Series B only exists in the second financial year.
+            rsps.add(responses.GET, self.base + '/voucherseries?financialyear=1',
+                     json={"VoucherSeriesCollection": [{"Code": "A"}]})
+            rsps.add(responses.GET, self.base + '/voucherseries?financialyear=2',
+                     json={"VoucherSeriesCollection": [{"Code": "A"}, {"Code": "B"}]})
+            for year, codes in ((1, ("A",)), (2, ("A", "B"))):
+                for code in codes:
+                    vouchers = [{"VoucherSeries": code, "VoucherNumber": number, "Year": year} for number in (1, 2)]
+                    rsps.add(responses.GET, self.base + '/vouchers/sublist/%s?financialyear=%s' % (code, year),
+                             json=self.page("Vouchers", vouchers))
+
+            results = export_vouchers(self.directory, access_token='token', client_secret='secret', processes=0)
+
+        self.assertEqual(['vouchers-1-A', 'vouchers-2-A', 'vouchers-2-B'],
+                         [result.partition.name for result in results])
+        self.assertTrue(all(result.ok and result.count == 2 for result in results))
+        self.assertEqual(['vouchers-1-A.ndjson', 'vouchers-2-A.ndjson', 'vouchers-2-B.ndjson'],
+                         sorted(os.listdir(self.directory)))
+        with open(os.path.join(self.directory, 'vouchers-2-B.ndjson')) as f:
+            self.assertEqual([{"VoucherSeries": "B", "VoucherNumber": 1, "Year": 2},
+                              {"VoucherSeries": "B", "VoucherNumber": 2, "Year": 2}],
+                             [json.loads(line) for line in f])
+
+    def test_failed_partition_is_reported(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, self.base + '/vouchers?financialyear=1',
+                     json=self.page("Vouchers", [{"VoucherNumber": 1}]))
+            rsps.add(responses.GET, self.base + '/vouchers?financialyear=2', status=404)
+
+            results = export_vouchers(self.directory, financial_years=[1, 2], access_token='token',
+                                      client_secret='secret', processes=0, by_series=False)
+
+        self.assertEqual([True, False], [result.ok for result in results])
+        self.assertEqual(['vouchers-1.ndjson'], os.listdir(self.directory))
+
+
+class SharedRateLimiterTest(unittest.TestCase):
+    def test_limiters_share_one_budget(self):
+        with RateLimitManager() as manager:
+            proxy = manager.RateLimiter(rate=1.0, burst=2)
+            first = SharedRateLimiter(proxy)
+            second = SharedRateLimiter(proxy)
+
+            self.assertEqual(0, first.reserve('token'))
+            self.assertEqual(0, second.reserve('token'))
+            self.assertGreater(first.reserve('token'), 0.5)
+            self.assertEqual(0, second.reserve('other-token'))
+
+    def test_partition_pickles(self):
+        import pickle
+        partition = pickle.loads(pickle.dumps(Partition(1, 'A')))
+        self.assertEqual('vouchers-1-A', partition.name)
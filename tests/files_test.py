@@ -0,0 +1,41 @@
+# coding=utf-8
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from fortnox.files import atomic_write_json
+
+
+class AtomicWriteJsonTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'state.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_replaces_the_file(self):
+        atomic_write_json(self.path, {'page': 1})
+        atomic_write_json(self.path, {'page': 2})
+
+        with open(self.path) as f:
+            self.assertEqual({'page': 2}, json.load(f))
+        self.assertEqual(['state.json'], os.listdir(self.directory))
+
+    def test_synced_before_it_is_moved(self):
+        calls = []
+        with mock.patch('os.fsync', side_effect=lambda fd: calls.append('fsync')), \
+                mock.patch('os.replace', side_effect=lambda source, target: calls.append('replace')):
+            atomic_write_json(self.path, {})
+
+        self.assertEqual(['fsync', 'replace'], calls)
+
+    def test_failed_write_keeps_the_old_file(self):
+        atomic_write_json(self.path, {'page': 1})
+        with self.assertRaises(TypeError):
+            atomic_write_json(self.path, {'page': object()})
+
+        with open(self.path) as f:
+            self.assertEqual({'page': 1}, json.load(f))
@@ -6,6 +6,7 @@ import responses
 from fortnox.config import fortnox_config
 from fortnox.exceptions import ObjectNotFound
 from fortnox.objects import FinancialYear
+from fortnox.requests import Request
 
 
 class FinancialYearTest(unittest.TestCase):
@@ -68,6 +69,10 @@ class FinancialYearTest(unittest.TestCase):
     def setUp(self):
         fortnox_config.access_token = 'access-token'
         fortnox_config.client_secret = 'client-secret'
+        Request.configure_rate_limit(enabled=False)
+
+    def tearDown(self):
+        Request.configure_rate_limit()
 
     def test_to_dict(self):
         financial_year = FinancialYear()
@@ -105,7 +110,7 @@ class FinancialYearTest(unittest.TestCase):
 
             self.assertEqual(1, len(rsps.calls))
             self.assertEqual("https://api.fortnox.se/3/financialyears", rsps.calls[0].request.url)
-            self.assertEqual(json.dumps(financial_year.to_dict()), rsps.calls[0].request.body)
+            self.assertEqual(financial_year.to_dict(), json.loads(rsps.calls[0].request.body))
 
     def test_list(self):
         with responses.RequestsMock() as rsps:
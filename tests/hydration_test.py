@@ -0,0 +1,38 @@
+# coding=utf-8
+import unittest
+from fortnox.objects import Voucher, VoucherRow
+
+
+class LazyVoucherRowsTest(unittest.TestCase):
+    voucher = {
+        "VoucherNumber": 1,
+        "VoucherSeries": "A",
+        "TransactionDate": "2016-01-01",
+        "VoucherRows": [{"Account": 1930, "Debit": 100}, {"Account": 3000, "Credit": 100}]
+    }
+
+    def test_rows_are_parsed_on_first_read(self):
+        voucher = Voucher(self.voucher)
+        self.assertIsNone(voucher._voucher_rows)
+        self.assertEqual([1930, 3000], [row.account for row in voucher.voucher_rows])
+        self.assertIsInstance(voucher.voucher_rows[0], VoucherRow)
+        self.assertIs(voucher.voucher_rows, voucher.voucher_rows)
+        self.assertIsNone(voucher._raw_rows)
+
+    def test_new_voucher_has_empty_rows(self):
+        voucher = Voucher()
+        voucher.voucher_rows.append(VoucherRow({"Account": 1930, "Debit": 100}))
+        self.assertEqual([{"Debit": 100, "Account": 1930, "Credit": 0}],
+                         voucher.to_dict()["Voucher"]["VoucherRows"])
+
+    def test_assigned_rows_replace_raw_rows(self):
+        voucher = Voucher(self.voucher)
+        voucher.voucher_rows = [VoucherRow({"Account": 2440})]
+        self.assertEqual([2440], [row.account for row in voucher.voucher_rows])
+
+    def test_update_keeps_rows_unparsed(self):
+        voucher = Voucher()
+        voucher._update(Voucher(self.voucher))
+        self.assertEqual(1, voucher.voucher_number)
+        self.assertIsNone(voucher._voucher_rows)
+        self.assertEqual(2, len(voucher.voucher_rows))
@@ -0,0 +1,95 @@
+# coding=utf-8
+import json
+import unittest
+import responses
+from fortnox.config import fortnox_config
+from fortnox.objects import FinancialYear
+from fortnox.requests import MetricsCollector, Request, RetryPolicy
+from fortnox.requests.events import endpoint_template
+
+
+class EndpointTemplateTest(unittest.TestCase):
+    def test_ids_are_replaced(self):
+        self.assertEqual('/vouchers/{id}/{id}',
+                         endpoint_template('https://api.fortnox.se/3/vouchers/A/12?financialyear=1'))
+        self.assertEqual('/financialyears', endpoint_template('https://api.fortnox.se/3/financialyears'))
+        self.assertEqual('/vouchers/sublist/{id}', endpoint_template('https://api.fortnox.se/3/vouchers/sublist/A'))
+
+
+class HookTest(unittest.TestCase):
+    url = 'https://api.fortnox.se/3/financialyears/1'
+    financial_year = {"FinancialYear": {"Id": 1, "FromDate": "2016-01-01", "ToDate": "2016-12-31"}}
+
+    def setUp(self):
+        fortnox_config.access_token = 'access-token'
+        fortnox_config.client_secret = 'client-secret'
+        self.events = []
+        Request.add_hook(self.events.append)
+
+    def tearDown(self):
+        Request.remove_hook(self.events.append)
+        Request.configure_retries('GET', RetryPolicy())
+
+    def test_events_of_a_call(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, self.url, json=self.financial_year, status=200)
+            FinancialYear.get(1)
+
+        self.assertEqual(['start', 'end', 'decode'], [event.kind for event in self.events])
+        end = self.events[1]
+        self.assertEqual(('GET', '/financialyears/{id}', 200), (end.method, end.endpoint, end.status_code))
+        self.assertEqual(len(json.dumps(self.financial_year)), end.bytes)
+        self.assertGreater(end.latency, 0)
+        self.assertIsNotNone(self.events[2].decode_time)
+
+    def test_retry_events(self):
+        Request.configure_retries('GET', RetryPolicy(sleep=lambda delay: None))
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, self.url, status=503)
+            rsps.add(responses.GET, self.url, json=self.financial_year, status=200)
+            Request.get('/financialyears/1')
+
+        self.assertEqual(['start', 'retry', 'end'], [event.kind for event in self.events])
+        self.assertEqual((503, 1), (self.events[1].status_code, self.events[1].attempt))
+        self.assertEqual(2, self.events[2].attempt)
+
+    def test_failing_hook_is_ignored(self):
+        def hook(event):
+            raise ValueError("broken hook")
+
+        Request.add_hook(hook)
+        try:
+            with responses.RequestsMock() as rsps:
+                rsps.add(responses.GET, self.url, json=self.financial_year, status=200)
+                self.assertEqual(1, FinancialYear.get(1).id)
+        finally:
+            Request.remove_hook(hook)
+        self.assertEqual(3, len(self.events))
+
+
+class MetricsCollectorTest(unittest.TestCase):
+    def setUp(self):
+        fortnox_config.access_token = 'access-token'
+        fortnox_config.client_secret = 'client-secret'
+        self.collector = MetricsCollector()
+        Request.add_hook(self.collector)
+
+    def tearDown(self):
+        Request.remove_hook(self.collector)
+
+    def test_metrics_per_endpoint(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, 'https://api.fortnox.se/3/financialyears/1', json={"FinancialYear": {"Id": 1}})
+            rsps.add(responses.GET, 'https://api.fortnox.se/3/financialyears/2', status=404)
+            FinancialYear.get(1)
+            self.assertRaises(Exception, FinancialYear.get, 2)
+
+        snapshot = self.collector.snapshot()
+        metrics = snapshot['GET /financialyears/{id}']
+        self.assertEqual(2, metrics['latency']['count'])
+        self.assertEqual(1, metrics['decode']['count'])
+        self.assertEqual({'200': 1, '404': 1}, metrics['statuses'])
+
+        text = self.collector.to_prometheus()
+        self.assertIn('fortnox_request_duration_seconds_count{method="GET",endpoint="/financialyears/{id}"} 2', text)
+        self.assertIn('fortnox_responses_total{method="GET",endpoint="/financialyears/{id}",status="404"} 1', text)
@@ -0,0 +1,77 @@
+# coding=utf-8
+import datetime
+import os
+import shutil
+import tempfile
+import unittest
+from fortnox.mirror import VoucherMirror
+from fortnox.objects import Voucher
+
+
+def voucher(series, number, date, rows, reference_number=None, cost_center=None):
+    return Voucher({
+        "@url": "https://api.fortnox.se/3/vouchers/%s/%s?financialyear=1" % (series, number),
+        "CostCenter": cost_center,
+        "Description": "Voucher %s%s" % (series, number),
+        "ReferenceNumber": reference_number,
+        "ReferenceType": "INVOICE" if reference_number else None,
+        "TransactionDate": date,
+        "VoucherNumber": number,
+        "VoucherRows": [
+            {"Account": account, "Debit": debit, "Credit": credit, "CostCenter": row_cost_center or ""}
+            for account, debit, credit, row_cost_center in rows
+        ],
+        "VoucherSeries": series,
+        "Year": 1
+    })
+
+
+class VoucherMirrorTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.mirror = VoucherMirror(os.path.join(self.directory, 'mirror.db'))
+        self.mirror.ingest([
+            voucher("A", 1, "2016-02-28", [(1930, 100, 0, None), (3001, 0, 100, None)], reference_number="1001"),
+            voucher("A", 2, "2016-03-15", [(1930, 50, 0, "CC1"), (3001, 0, 50, None)]),
+            voucher("B", 1, "2016-03-31", [(2440, 0, 80, None), (4010, 80, 0, None)], cost_center="CC2"),
+            voucher("A", 3, "2016-04-01", [(1930, 20, 0, None), (3001, 0, 20, None)], reference_number="1001"),
+        ])
+
+    def tearDown(self):
+        self.mirror.close()
+        shutil.rmtree(self.directory)
+
+    def keys(self, vouchers):
+        return [(voucher.voucher_series, voucher.voucher_number) for voucher in vouchers]
+
+    def test_by_account(self):
+        march = self.mirror.by_account(1930, datetime.date(2016, 3, 1), "2016-03-31")
+        self.assertEqual([("A", 2)], self.keys(march))
+        self.assertEqual([("A", 1), ("A", 2), ("A", 3)], self.keys(self.mirror.by_account(1930)))
+
+    def test_by_reference(self):
+        self.assertEqual([("A", 1), ("A", 3)], self.keys(self.mirror.by_reference("1001")))
+        self.assertEqual([], self.mirror.by_reference("1001", reference_type="ORDER"))
+
+    def test_by_series(self):
+        self.assertEqual([("B", 1)], self.keys(self.mirror.by_series("B", year=1)))
+
+    def test_by_cost_center(self):
+        self.assertEqual([("A", 2)], self.keys(self.mirror.by_cost_center("CC1")))
+        self.assertEqual([("B", 1)], self.keys(self.mirror.by_cost_center("CC2", to_date="2016-03-31")))
+
+    def test_by_date(self):
+        self.assertEqual([("A", 2), ("B", 1)], self.keys(self.mirror.by_date("2016-03-01", "2016-03-31")))
+
+    def test_round_trip(self):
+        stored = self.mirror.get("A", 2, 1)
+        self.assertEqual(datetime.datetime(2016, 3, 15), stored.transaction_date)
+        self.assertEqual([1930, 3001], [row.account for row in stored.voucher_rows])
+        self.assertEqual("CC1", stored.voucher_rows[0].cost_center)
+        self.assertIsNone(self.mirror.get("A", 9, 1))
+
+    def test_ingest_replaces(self):
+        self.mirror.ingest([voucher("A", 2, "2016-03-15", [(1910, 50, 0, None), (3001, 0, 50, None)])])
+        self.assertEqual(4, len(self.mirror))
+        self.assertEqual([("A", 1), ("A", 3)], self.keys(self.mirror.by_account(1930)))
+        self.assertEqual([("A", 2)], self.keys(self.mirror.by_account(1910)))
@@ -0,0 +1,133 @@
+# coding=utf-8
+import os
+import shutil
+import tempfile
+import unittest
+import responses
+from responses import matchers
+from fortnox.checkpoint import Checkpoint
+from fortnox.config import fortnox_config
+from fortnox.objects import FinancialYear
+from fortnox.requests import Pager, Request
+
+
+def financial_year_page(page, total_pages):
+    return {
+        "MetaInformation": {
+            "@TotalResources": total_pages,
+            "@TotalPages": total_pages,
+            "@CurrentPage": page
+        },
+        "FinancialYears": [
+            {
+                "@url": "https://api.fortnox.se/3/financialyears/%s" % page,
+                "Id": page,
+                "FromDate": "%s-01-01" % (2000 + page),
+                "ToDate": "%s-12-31" % (2000 + page),
+                "AccountingMethod": "ACCRUAL"
+            }
+        ]
+    }
+
+
+class PagerTest(unittest.TestCase):
+    def setUp(self):
+        fortnox_config.access_token = 'access-token'
+        fortnox_config.client_secret = 'client-secret'
+        Request.configure_rate_limit(enabled=False)
+
+    def tearDown(self):
+        Request.configure_rate_limit()
+
+    def add_pages(self, rsps, total_pages):
+        rsps.add(responses.GET, 'https://api.fortnox.se/3/financialyears',
+                 json=financial_year_page(1, total_pages), status=200,
+                 match=[matchers.query_param_matcher({})])
+        for page in range(2, total_pages + 1):
+            rsps.add(responses.GET, 'https://api.fortnox.se/3/financialyears',
+                     json=financial_year_page(page, total_pages), status=200,
+                     match=[matchers.query_param_matcher({"page": str(page)})])
+
+    def test_all_pages_in_order(self):
+        with responses.RequestsMock() as rsps:
+            self.add_pages(rsps, 7)
+
+            pages = Pager('/financialyears', 'FinancialYears', max_workers=3).pages()
+            self.assertEqual(list(range(1, 8)), [page['MetaInformation']['@CurrentPage'] for page in pages])
+            self.assertEqual(7, len(rsps.calls))
+
+    def test_list_fetches_all_pages(self):
+        with responses.RequestsMock() as rsps:
+            self.add_pages(rsps, 4)
+
+            financial_years = FinancialYear.list()
+            self.assertEqual([1, 2, 3, 4], [financial_year.id for financial_year in financial_years])
+
+    def test_iter_items_resumes_from_checkpoint(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        checkpoint = Checkpoint(os.path.join(directory, 'checkpoint.json'))
+
+        with responses.RequestsMock() as rsps:
+            self.add_pages(rsps, 4)
+            items = Pager('/financialyears', 'FinancialYears').iter_items(checkpoint)
+            # The job dies while handling the third page, after the first two were handled.
+            self.assertEqual([1, 2, 3], [next(items)["Id"] for _ in range(3)])
+            items.close()
+
+        restarted = Checkpoint(checkpoint.path)
+        self.assertEqual(2, restarted.last_page('GET /financialyears'))
+        with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+            self.add_pages(rsps, 4)
+            items = Pager('/financialyears', 'FinancialYears').iter_items(restarted)
+            self.assertEqual([3, 4], [item["Id"] for item in items])
+            self.assertEqual(2, len(rsps.calls))
+
+        self.assertIsNone(Checkpoint(checkpoint.path).last_page('GET /financialyears'))
+
+    def test_single_page_when_page_given(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, 'https://api.fortnox.se/3/financialyears',
+                     json=financial_year_page(2, 4), status=200,
+                     match=[matchers.query_param_matcher({"page": "2"})])
+
+            financial_years = FinancialYear.list({'page': 2})
+            self.assertEqual([2], [financial_year.id for financial_year in financial_years])
+            self.assertEqual(1, len(rsps.calls))
+
+    def test_missing_meta_information(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, 'https://api.fortnox.se/3/voucherseries',
+                     json={"VoucherSeriesCollection": [{"Code": "A"}]}, status=200)
+
+            items = Pager('/voucherseries', 'VoucherSeriesCollection').items()
+            self.assertEqual([{"Code": "A"}], items)
+
+    def test_iter_pages_in_order(self):
+        with responses.RequestsMock() as rsps:
+            self.add_pages(rsps, 5)
+
+            financial_years = FinancialYear.iter()
+            first = next(financial_years)
+            self.assertEqual(1, first.id)
+            self.assertEqual([2, 3, 4, 5], [financial_year.id for financial_year in financial_years])
+            self.assertEqual(5, len(rsps.calls))
+
+    def test_iter_pages_with_prefetch(self):
+        with responses.RequestsMock() as rsps:
+            self.add_pages(rsps, 6)
+
+            pager = Pager('/financialyears', 'FinancialYears')
+            pages = [page['MetaInformation']['@CurrentPage'] for page in pager.iter_pages(prefetch=3)]
+            self.assertEqual([1, 2, 3, 4, 5, 6], pages)
+            self.assertEqual(6, len(rsps.calls))
+
+    def test_iter_pages_from_start(self):
+        with responses.RequestsMock() as rsps:
+            for page in range(3, 5):
+                rsps.add(responses.GET, 'https://api.fortnox.se/3/financialyears',
+                         json=financial_year_page(page, 4), status=200,
+                         match=[matchers.query_param_matcher({'page': str(page)})])
+
+            pager = Pager('/financialyears', 'FinancialYears')
+            self.assertEqual([3, 4], [page['FinancialYears'][0]['Id'] for page in pager.iter_pages(start=3)])
@@ -0,0 +1,74 @@
+# coding=utf-8
+import unittest
+import responses
+from fortnox.config import Config, fortnox_config
+from fortnox.requests import Profiler, Request
+
+
+class ConfigHeadersTest(unittest.TestCase):
+    def test_headers_are_reused_until_config_changes(self):
+        config = Config()
+        config.access_token = 'first-token'
+        headers = config.headers()
+        self.assertIs(headers, config.headers())
+        self.assertEqual(config.to_dict(), headers)
+
+        config.access_token = 'second-token'
+        self.assertIsNot(headers, config.headers())
+        self.assertEqual('second-token', config.headers()['Access-Token'])
+
+
+class ProfilerTest(unittest.TestCase):
+    url = 'https://api.fortnox.se/3/financialyears/1'
+
+    def setUp(self):
+        fortnox_config.access_token = 'access-token'
+        fortnox_config.client_secret = 'client-secret'
+        Request.configure_rate_limit(enabled=False)
+
+    def tearDown(self):
+        Request.configure_rate_limit()
+        Request.configure_profiler(None)
+
+    def test_failing_profiler_does_not_fail_the_call(self):
+        def profiler(profile):
+            raise RuntimeError("broken profiler")
+
+        Request.configure_profiler(profiler)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.POST, 'https://api.fortnox.se/3/vouchers', json={"Voucher": {}}, status=201)
+            with self.assertLogs('fortnox.requests.request', 'ERROR'):
+                response = Request.post('/vouchers', {"Voucher": {}})
+            self.assertEqual(1, len(rsps.calls))
+
+        self.assertEqual(201, response.status_code)
+
+    def test_calls_are_profiled(self):
+        profiles = []
+        profiler = Profiler(callback=profiles.append)
+        Request.configure_profiler(profiler)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, self.url, json={}, status=200)
+            Request.get('/financialyears/1')
+            Request.get('/financialyears/1')
+
+        self.assertEqual(2, len(profiles))
+        profile = profiles[0]
+        self.assertEqual(('GET', self.url, 200, 1), (profile.method, profile.url, profile.status_code,
+                                                     profile.attempts))
+        self.assertGreater(profile.network, 0)
+        self.assertGreaterEqual(profile.overhead, 0)
+        self.assertAlmostEqual(profile.total, profile.network + profile.waiting + profile.overhead)
+
+        stats = profiler.stats()
+        self.assertEqual(2, stats['calls'])
+        self.assertAlmostEqual(stats['overhead'] / 2, stats['overhead_per_call'])
+
+    def test_headers_follow_config_changes(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, self.url, json={}, status=200)
+            Request.get('/financialyears/1')
+            fortnox_config.access_token = 'changed-token'
+            Request.get('/financialyears/1')
+            self.assertEqual('access-token', rsps.calls[0].request.headers['Access-Token'])
+            self.assertEqual('changed-token', rsps.calls[1].request.headers['Access-Token'])
@@ -0,0 +1,83 @@
+# coding=utf-8
+import unittest
+import responses
+from fortnox.cache import token_digest
+from fortnox.config import fortnox_config
+from fortnox.requests import RateLimiter, Request, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TokenBucketTest(unittest.TestCase):
+    def test_burst_without_waiting(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=5, burst=25, clock=clock, sleep=clock.sleep)
+
+        for _ in range(25):
+            self.assertEqual(0.0, bucket.acquire())
+        self.assertEqual([], clock.sleeps)
+
+    def test_waits_for_refill(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=5, burst=2, clock=clock, sleep=clock.sleep)
+
+        bucket.acquire()
+        bucket.acquire()
+        self.assertAlmostEqual(0.2, bucket.acquire())
+        self.assertAlmostEqual(0.2, bucket.acquire())
+
+        self.assertEqual({'acquired': 4, 'waits': 2, 'wait_time': bucket.wait_time}, bucket.metrics())
+        self.assertAlmostEqual(0.4, bucket.wait_time)
+
+    def test_refill_is_capped_at_burst(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=5, burst=2, clock=clock, sleep=clock.sleep)
+
+        clock.now = 100.0
+        bucket.acquire()
+        bucket.acquire()
+        self.assertAlmostEqual(0.2, bucket.acquire())
+
+
+class RateLimiterTest(unittest.TestCase):
+    def setUp(self):
+        fortnox_config.access_token = 'access-token'
+        fortnox_config.client_secret = 'client-secret'
+
+    def tearDown(self):
+        Request.configure_rate_limit()
+
+    def test_one_bucket_per_key(self):
+        limiter = RateLimiter()
+        self.assertIs(limiter.bucket('a'), limiter.bucket('a'))
+        self.assertIsNot(limiter.bucket('a'), limiter.bucket('b'))
+
+    def test_disabled(self):
+        limiter = RateLimiter(enabled=False)
+        self.assertEqual(0.0, limiter.acquire('a'))
+        self.assertEqual({}, limiter.metrics())
+
+    def test_request_acquires_per_access_token(self):
+        Request.configure_rate_limit(rate=10, burst=10)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, 'https://api.fortnox.se/3/instance/1',
+                     json={"Instance": {"Id": 1}}, status=200,
+                     content_type='application/json')
+
+            Request.get('/instance/1')
+            Request.get('/instance/1')
+
+        metrics = Request.rate_limiter.metrics()
+        self.assertEqual(2, metrics[token_digest('access-token')]['acquired'])
+        self.assertNotIn('access-token', repr(metrics))
@@ -11,6 +11,10 @@ class RequestTest(unittest.TestCase):
     def setUp(self):
         fortnox_config.access_token = 'access-token'
         fortnox_config.client_secret = 'client-secret'
+        Request.configure_rate_limit(enabled=False)
+
+    def tearDown(self):
+        Request.configure_rate_limit()
 
     def test_get_with_relative_url(self):
         with responses.RequestsMock() as rsps:
@@ -89,7 +93,7 @@ class RequestTest(unittest.TestCase):
 
             self.assertEqual(1, len(rsps.calls))
             self.assertEqual("https://api.fortnox.se/3/instance", rsps.calls[0].request.url)
-            self.assertEqual(json.dumps({"Id": 1}), rsps.calls[0].request.body)
+            self.assertEqual({"Id": 1}, json.loads(rsps.calls[0].request.body))
             self.assertEqual("application/json", rsps.calls[0].request.headers['Accept'])
             self.assertEqual("application/json", rsps.calls[0].request.headers['Content-Type'])
             self.assertEqual("access-token", rsps.calls[0].request.headers['Access-Token'])
@@ -130,7 +134,7 @@ class RequestTest(unittest.TestCase):
 
             self.assertEqual(1, len(rsps.calls))
             self.assertEqual("https://api.fortnox.se/3/instance/1", rsps.calls[0].request.url)
-            self.assertEqual(json.dumps({"Id": 1, "Name": "Test name"}), rsps.calls[0].request.body)
+            self.assertEqual({"Id": 1, "Name": "Test name"}, json.loads(rsps.calls[0].request.body))
             self.assertEqual("application/json", rsps.calls[0].request.headers['Accept'])
             self.assertEqual("application/json", rsps.calls[0].request.headers['Content-Type'])
             self.assertEqual("access-token", rsps.calls[0].request.headers['Access-Token'])
@@ -152,8 +156,25 @@ class RequestTest(unittest.TestCase):
 
             self.assertEqual(1, len(rsps.calls))
             self.assertEqual("https://api.fortnox.se/3/instance/1", rsps.calls[0].request.url)
-            self.assertEqual(json.dumps({"Id": 1, "Name": "Test name"}), rsps.calls[0].request.body)
+            self.assertEqual({"Id": 1, "Name": "Test name"}, json.loads(rsps.calls[0].request.body))
             self.assertEqual("application/json", rsps.calls[0].request.headers['Accept'])
             self.assertEqual("application/json", rsps.calls[0].request.headers['Content-Type'])
             self.assertEqual("access-token", rsps.calls[0].request.headers['Access-Token'])
             self.assertEqual("client-secret", rsps.calls[0].request.headers['Client-Secret'])
+
+    def test_json_is_decoded_once(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, 'https://api.fortnox.se/3/instance/1',
+                     json={"Instance": {"Id": 1}}, status=200,
+                     content_type='application/json')
+
+            response = Request.get('/instance/1')
+            self.assertIs(response.json(), response.json())
+
+    def test_delete_without_body(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.DELETE, 'https://api.fortnox.se/3/instance/1', status=204)
+
+            response = Request.delete('/instance/1')
+            self.assertEqual(204, response.status_code)
+            self.assertIsNone(response.json())
@@ -0,0 +1,100 @@
+# coding=utf-8
+import unittest
+import requests
+import responses
+from fortnox.config import fortnox_config
+from fortnox.requests import Request, RetryPolicy
+
+
+class RetryTest(unittest.TestCase):
+    url = 'https://api.fortnox.se/3/instance/1'
+
+    def setUp(self):
+        fortnox_config.access_token = 'access-token'
+        fortnox_config.client_secret = 'client-secret'
+        Request.configure_rate_limit(enabled=False)
+        self.sleeps = []
+        self.original_policies = Request.retry_policies
+        for method in ['GET', 'PUT', 'DELETE']:
+            Request.configure_retries(method, RetryPolicy(max_attempts=3, sleep=self.sleeps.append))
+        Request.configure_retries('POST', RetryPolicy.unsafe(max_attempts=3, sleep=self.sleeps.append))
+
+    def tearDown(self):
+        Request.configure_rate_limit()
+        Request.retry_policies = self.original_policies
+
+    def test_retries_server_errors(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, self.url, json={}, status=503)
+            rsps.add(responses.GET, self.url, json={}, status=502)
+            rsps.add(responses.GET, self.url, json={"Instance": {"Id": 1}}, status=200)
+
+            response = Request.get(self.url)
+            self.assertEqual(1, response.json()['Instance']['Id'])
+            self.assertEqual(3, len(rsps.calls))
+            self.assertEqual(2, len(self.sleeps))
+
+    def test_retries_connection_errors(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, self.url, body=requests.exceptions.ConnectionError("reset"))
+            rsps.add(responses.GET, self.url, json={"Instance": {"Id": 1}}, status=200)
+
+            response = Request.get(self.url)
+            self.assertEqual(200, response.status_code)
+            self.assertEqual(2, len(rsps.calls))
+
+    def test_honours_retry_after(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, self.url, json={}, status=429, headers={'Retry-After': '3'})
+            rsps.add(responses.GET, self.url, json={"Instance": {"Id": 1}}, status=200)
+
+            Request.get(self.url)
+            self.assertEqual([3.0], self.sleeps)
+
+    def test_gives_up_after_max_attempts(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, self.url, json={}, status=500)
+
+            with self.assertRaises(requests.exceptions.HTTPError):
+                Request.get(self.url)
+            self.assertEqual(3, len(rsps.calls))
+
+    def test_gives_up_after_max_total_time(self):
+        Request.configure_retries('GET', RetryPolicy(max_total_time=1.0, sleep=self.sleeps.append))
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, self.url, json={}, status=429, headers={'Retry-After': '5'})
+
+            with self.assertRaises(requests.exceptions.HTTPError):
+                Request.get(self.url)
+            self.assertEqual(1, len(rsps.calls))
+            self.assertEqual([], self.sleeps)
+
+    def test_post_retries_rate_limit(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.POST, self.url, json={}, status=429)
+            rsps.add(responses.POST, self.url, json={"Instance": {"Id": 1}}, status=201)
+
+            response = Request.post(self.url, {"Id": 1})
+            self.assertEqual(201, response.status_code)
+            self.assertEqual(2, len(rsps.calls))
+
+    def test_post_does_not_retry_server_errors(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.POST, self.url, json={}, status=500)
+
+            with self.assertRaises(requests.exceptions.HTTPError):
+                Request.post(self.url, {"Id": 1})
+            self.assertEqual(1, len(rsps.calls))
+
+    def test_post_does_not_retry_connection_reset(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.POST, self.url, body=requests.exceptions.ConnectionError("reset"))
+
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                Request.post(self.url, {"Id": 1})
+            self.assertEqual(1, len(rsps.calls))
+
+    def test_backoff_is_bounded(self):
+        policy = RetryPolicy(backoff_factor=1.0, max_backoff=4.0)
+        for attempt in range(1, 10):
+            self.assertTrue(0 <= policy.backoff(attempt) <= min(4.0, 2 ** (attempt - 1)))
@@ -0,0 +1,146 @@
+# coding=utf-8
+import threading
+import unittest
+import responses
+from fortnox.config import fortnox_config
+from fortnox.exceptions import ObjectNotFound
+from fortnox.objects import FinancialYear
+from fortnox.requests import Request, Response, SingleFlight
+
+
+class SingleFlightTest(unittest.TestCase):
+    def test_concurrent_calls_share_one_result(self):
+        single_flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def function():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return object()
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(single_flight.do('key', function)))
+        leader.start()
+        started.wait(5)
+        followers = [threading.Thread(target=lambda: results.append(single_flight.do('key', function)))
+                     for _ in range(4)]
+        for thread in followers:
+            thread.start()
+        while single_flight.coalesced < 4:
+            threading.Event().wait(0.001)
+        release.set()
+        for thread in [leader] + followers:
+            thread.join(5)
+
+        self.assertEqual(1, len(calls))
+        self.assertEqual(5, len(results))
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual({'executed': 1, 'coalesced': 4}, single_flight.stats())
+
+    def test_each_caller_gets_its_own_error(self):
+        single_flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def function():
+            started.set()
+            release.wait(5)
+            raise ObjectNotFound("not found")
+
+        errors = []
+
+        def call(message):
+            try:
+                single_flight.do('key', function)
+            except ObjectNotFound as e:
+                e.message = message
+                errors.append(e)
+
+        leader = threading.Thread(target=call, args=("leader",))
+        leader.start()
+        started.wait(5)
+        follower = threading.Thread(target=call, args=("follower",))
+        follower.start()
+        while single_flight.coalesced < 1:
+            threading.Event().wait(0.001)
+        release.set()
+        for thread in (leader, follower):
+            thread.join(5)
+
+        self.assertEqual(2, len(errors))
+        self.assertIsNot(errors[0], errors[1])
+        self.assertEqual(["follower", "leader"], sorted(error.message for error in errors))
+        self.assertEqual(("not found",), errors[0].args)
+
+    def test_shared_response_is_decoded_once(self):
+        decodes = []
+        response = Response(200, {}, b'{"Id": 1}')
+        response.on_decode = lambda response, seconds: decodes.append(seconds)
+        threads = [threading.Thread(target=response.json) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(1, len(decodes))
+
+    def test_error_is_raised_and_key_released(self):
+        single_flight = SingleFlight()
+
+        def function():
+            raise ValueError("boom")
+
+        self.assertRaises(ValueError, single_flight.do, 'key', function)
+        self.assertEqual('ok', single_flight.do('key', lambda: 'ok'))
+        self.assertEqual({'executed': 2, 'coalesced': 0}, single_flight.stats())
+
+
+class RequestSingleFlightTest(unittest.TestCase):
+    url = 'https://api.fortnox.se/3/financialyears/1'
+    financial_year = {"FinancialYear": {"Id": 1, "FromDate": "2016-01-01", "ToDate": "2016-12-31"}}
+
+    def setUp(self):
+        fortnox_config.access_token = 'access-token'
+        fortnox_config.client_secret = 'client-secret'
+        Request.configure_rate_limit(enabled=False)
+        Request.configure_single_flight()
+
+    def tearDown(self):
+        Request.configure_rate_limit()
+
+    def test_identical_gets_are_coalesced(self):
+        entered = threading.Event()
+        release = threading.Event()
+
+        def callback(request):
+            entered.set()
+            release.wait(5)
+            return 200, {}, '{"FinancialYear": {"Id": 1, "FromDate": "2016-01-01", "ToDate": "2016-12-31"}}'
+
+        results = []
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(responses.GET, self.url, callback=callback)
+            threads = [threading.Thread(target=lambda: results.append(FinancialYear.get(1))) for _ in range(5)]
+            threads[0].start()
+            entered.wait(5)
+            for thread in threads[1:]:
+                thread.start()
+            while Request.single_flight.coalesced < 4:
+                threading.Event().wait(0.001)
+            release.set()
+            for thread in threads:
+                thread.join(5)
+
+            self.assertEqual(1, len(rsps.calls))
+        self.assertEqual([1] * 5, [financial_year.id for financial_year in results])
+        self.assertEqual({'executed': 1, 'coalesced': 4}, Request.single_flight.stats())
+
+    def test_sequential_gets_are_not_coalesced(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, self.url, json=self.financial_year, status=200)
+            FinancialYear.get(1)
+            FinancialYear.get(1)
+            self.assertEqual(2, len(rsps.calls))
+        self.assertEqual({'executed': 2, 'coalesced': 0}, Request.single_flight.stats())
@@ -0,0 +1,76 @@
+# coding=utf-8
+import datetime
+import os
+import shutil
+import tempfile
+import unittest
+import responses
+from responses import matchers
+from fortnox.config import fortnox_config
+from fortnox.requests import Request
+from fortnox.sync import SyncCursor, VoucherSync
+
+
+def voucher_list(vouchers):
+    return {
+        "MetaInformation": {"@TotalResources": len(vouchers), "@TotalPages": 1, "@CurrentPage": 1},
+        "Vouchers": [
+            {"VoucherSeries": series, "VoucherNumber": number, "Year": 1, "TransactionDate": "2016-01-01"}
+            for series, number in vouchers
+        ]
+    }
+
+
+class VoucherSyncTest(unittest.TestCase):
+    def setUp(self):
+        fortnox_config.access_token = 'access-token'
+        fortnox_config.client_secret = 'client-secret'
+        Request.configure_rate_limit(enabled=False)
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'cursor.json')
+        self.now = datetime.datetime(2016, 2, 1, 12, 0)
+
+    def tearDown(self):
+        Request.configure_rate_limit()
+        shutil.rmtree(self.directory)
+
+    def sync(self):
+        return VoucherSync(self.path, 1, clock=lambda: self.now)
+
+    def test_incremental_runs(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, 'https://api.fortnox.se/3/vouchers',
+                     json=voucher_list([("A", 1), ("A", 2), ("B", 1)]), status=200,
+                     match=[matchers.query_param_matcher({"financialyear": "1"})])
+
+            result = self.sync().run()
+            self.assertEqual(3, len(result.new))
+            self.assertEqual(0, len(result.changed))
+
+        cursor = SyncCursor(self.path)
+        self.assertEqual("2016-02-01 11:55", cursor.last_modified(1))
+        self.assertEqual({"A": 2, "B": 1}, cursor.high_water_marks(1))
+
+        self.now = datetime.datetime(2016, 2, 2, 12, 0)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, 'https://api.fortnox.se/3/vouchers',
+                     json=voucher_list([("A", 2), ("A", 3)]), status=200,
+                     match=[matchers.query_param_matcher({"financialyear": "1",
+                                                          "lastmodified": "2016-02-01 11:55"})])
+
+            result = self.sync().run()
+            self.assertEqual([("A", 3)], [(v.voucher_series, v.voucher_number) for v in result.new])
+            self.assertEqual([("A", 2)], [(v.voucher_series, v.voucher_number) for v in result.changed])
+
+        cursor = SyncCursor(self.path)
+        self.assertEqual("2016-02-02 11:55", cursor.last_modified(1))
+        self.assertEqual({"A": 3, "B": 1}, cursor.high_water_marks(1))
+
+    def test_failed_run_keeps_cursor(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, 'https://api.fortnox.se/3/vouchers', json={}, status=403)
+
+            with self.assertRaises(Exception):
+                self.sync().run()
+
+        self.assertFalse(os.path.exists(self.path))
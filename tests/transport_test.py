@@ -0,0 +1,73 @@
+# coding=utf-8
+import datetime
+import unittest
+import requests
+import responses
+from fortnox.config import fortnox_config
+from fortnox.requests import Request, Transport
+
+
+class TransportTest(unittest.TestCase):
+    def setUp(self):
+        fortnox_config.access_token = 'access-token'
+        fortnox_config.client_secret = 'client-secret'
+        Request.configure_rate_limit(enabled=False)
+
+    def tearDown(self):
+        Request.configure_rate_limit()
+        Request.configure_transport()
+
+    def test_session_is_reused(self):
+        transport = Transport()
+        self.assertIs(transport.session, transport.session)
+
+        adapter = transport.session.get_adapter("https://api.fortnox.se/3")
+        self.assertEqual(10, adapter._pool_maxsize)
+
+    def test_close(self):
+        transport = Transport()
+        session = transport.session
+        transport.close()
+        self.assertIsNot(session, transport.session)
+
+    def test_configure_transport(self):
+        Request.configure_transport(pool_maxsize=32, connect_timeout=1.0, read_timeout=2.0)
+        self.assertEqual(32, Request.transport.pool_maxsize)
+        self.assertEqual((1.0, 2.0), Request.transport.timeout)
+
+        adapter = Request.transport.session.get_adapter("https://api.fortnox.se/3")
+        self.assertEqual(32, adapter._pool_maxsize)
+
+    def test_requests_share_session(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, 'https://api.fortnox.se/3/instance/1',
+                     json={"Instance": {"Id": 1}}, status=200,
+                     content_type='application/json')
+
+            session = Request.transport.session
+            Request.get('/instance/1')
+            Request.get('/instance/1')
+
+            self.assertEqual(2, len(rsps.calls))
+            self.assertIs(session, Request.transport.session)
+            self.assertEqual("access-token", rsps.calls[1].request.headers['Access-Token'])
+
+    def test_response_keeps_the_requests_interface(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, 'https://api.fortnox.se/3/instance/1', body='{"Instance": {"Name": "Bolaget Å"}}',
+                     status=200, content_type='application/json; charset=utf-8')
+            rsps.add(responses.GET, 'https://api.fortnox.se/3/instance/2', body='{"message": "Locked"}', status=400)
+
+            response = Request.get('/instance/1')
+            self.assertTrue(response)
+            self.assertEqual('{"Instance": {"Name": "Bolaget Å"}}'.encode('utf-8'), response.content)
+            self.assertEqual('{"Instance": {"Name": "Bolaget Å"}}', response.text)
+            self.assertEqual('utf-8', response.encoding)
+            self.assertIsInstance(response.elapsed, datetime.timedelta)
+            self.assertEqual('GET', response.request.method)
+            self.assertEqual({"Instance": {"Name": "Bolaget Å"}}, response.json())
+
+            with self.assertRaises(requests.HTTPError) as raised:
+                Request.get('/instance/2')
+            self.assertEqual(400, raised.exception.response.status_code)
+            self.assertEqual('{"message": "Locked"}', raised.exception.response.text)